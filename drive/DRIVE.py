@@ -84,7 +84,10 @@ def run(args: list, **kwargs: dict):
                 args.output,
                 plink_file_path,
                 var_file=args.var_file,
-                maf_filter=MAF_FILTER)
+                maf_filter=MAF_FILTER,
+                threads=THREADS,
+                plink_memory=args.plink_memory,
+                extract_once=args.extract_once)
 
             analysis_type_checker.check_analysis(
                 readme_txt=utility_scripts.plink_readme_body_text,
@@ -99,7 +102,10 @@ def run(args: list, **kwargs: dict):
                 args.binary_file,
                 args.output,
                 plink_file_path,
-                maf_filter=MAF_FILTER)
+                maf_filter=MAF_FILTER,
+                threads=THREADS,
+                plink_memory=args.plink_memory,
+                extract_once=args.extract_once)
 
             analysis_type_checker.check_analysis(
                 range=args.range,
@@ -139,15 +145,8 @@ def run(args: list, **kwargs: dict):
         )
 
         # The above function outputs files to a subdirectory called
-        # "carrier_analysis_output"
-
-        print(
-            "determining the minor allele frequency within the provided binary file..."
-        )
-        carrier_analysis_scripts.determine_maf(
-            "".join([args.output, "carrier_analysis_output/"]),
-            "".join([args.output, "plink_output_files/"]), args.pop_info,
-            args.pop_code, args.output)
+        # "carrier_analysis_output". It also writes the minor allele 
+        # frequencies from the same raw files to the allele_frequencies.txt file
 
         THRESHOLD: float = 0.10
 
@@ -192,6 +191,9 @@ def run(args: list, **kwargs: dict):
     IBD_search_output_files: str = utility_scripts.check_dir(args.output, "formatted_ibd_output/")
 
 
+    # file used to build the global iid dictionary for the segment cache
+    IID_FILE: str = "".join([args.binary_file, ".fam"]) if args.binary_file else args.pop_info
+
     for program in args.ibd_programs:
 
         suffix_dict: dict = {
@@ -208,7 +210,7 @@ def run(args: list, **kwargs: dict):
 
         if ANALYSIS_TYPE == "phenotype":
 
-            pre_shared_segments_analysis_scripts.shared_segment_detection.gather_shared_segments(ibd_file, pheno_df, pheno_carriers_df, IBD_search_output_files, program, MIN_CM, file_suffix, THREADS)
+            pre_shared_segments_analysis_scripts.shared_segment_detection.gather_shared_segments(ibd_file, pheno_df, pheno_carriers_df, IBD_search_output_files, program, MIN_CM, file_suffix, THREADS, cache_dir=args.cache_dir, iid_file=IID_FILE)
 
         else:
             convert_ibd_func_param: dict = {
@@ -229,7 +231,7 @@ def run(args: list, **kwargs: dict):
 
             # iterating over this dictionary so that we can get the 
             # variants for each chromosome
-            pre_shared_segments_analysis_scripts.shared_segment_detection.iterate_file_dict(file_dict, IBD_search_output_files, THREADS, program, MIN_CM)
+            pre_shared_segments_analysis_scripts.shared_segment_detection.iterate_file_dict(file_dict, IBD_search_output_files, THREADS, program, MIN_CM, single_pass=args.single_pass, cache_dir=args.cache_dir, iid_file=IID_FILE)
 
     print("Identifying networks of pairs...")
 
@@ -252,8 +254,8 @@ def run(args: list, **kwargs: dict):
     
     if ANALYSIS_TYPE == "phenotype":
         pre_shared_segments_analysis_scripts.shared_segment_detection.combine_output(
-            gathered_file_dict, ibd_file_dict, IBD_search_output_files, ANALYSIS_TYPE,
-            pheno_carrier_df=pheno_carriers_df, pheno_gmap_df=pheno_df)
+            gathered_file_dict, ibd_file_dict, IBD_search_output_files, ANALYSIS_TYPE, THREADS,
+            {"pheno_carrier_df": pheno_carriers_df, "pheno_gmap_df": pheno_df}, cache_dir=args.cache_dir, memory_budget=args.combine_memory, compress_allpair=args.compress_allpair)
         
         reformatter =  pre_shared_segments_analysis_scripts.shared_segment_detection.Pheno_Reformatter(
             IBD_search_output_files, 
@@ -265,8 +267,8 @@ def run(args: list, **kwargs: dict):
         reformatter.reformat()
     else:
         pre_shared_segments_analysis_scripts.shared_segment_detection.combine_output(
-            gathered_file_dict, ibd_file_dict, IBD_search_output_files, ANALYSIS_TYPE,
-            car_file_dir=os.path.join(args.output, "carrier_analysis_output/"))
+            gathered_file_dict, ibd_file_dict, IBD_search_output_files, ANALYSIS_TYPE, THREADS,
+            {"carrier_dir": os.path.join(args.output, "carrier_analysis_output/")}, cache_dir=args.cache_dir, memory_budget=args.combine_memory, compress_allpair=args.compress_allpair)
         
         reformatter = pre_shared_segments_analysis_scripts.shared_segment_detection.Gene_Reformatter(
             os.path.join(args.output, "carrier_analysis_output/"),
@@ -294,7 +296,7 @@ def run(args: list, **kwargs: dict):
 
 
     create_network_scripts.create_networks(
-        os.path.join(IBD_search_output_files, "pairs/"), network_dir, ANALYSIS_TYPE, os.path.join(IBD_search_output_files, "confirmed_carriers.txt"))
+        os.path.join(IBD_search_output_files, "pairs/"), network_dir, ANALYSIS_TYPE, os.path.join(IBD_search_output_files, "confirmed_carriers.txt"), THREADS)
 
     logger.info(
         f"Writing the results of the network analysis to: {''.join([args.output, 'networks/'])}"
@@ -2,6 +2,7 @@
 
 ###################################################################################
 # importing modules
+import numpy as np
 import pandas as pd
 import logging
 import glob
@@ -14,14 +15,151 @@ import sys
 
 import population_filter_scripts
 import utility_scripts
+from run_plink import load_recode_file
 
 ###########################################################################################
 # This function determines all the individuals who have a specific variant
 
 
+def get_carrier_df(raw_df: pd.DataFrame) -> pd.DataFrame:
+    """Function to find the carriers of every variant in the raw file at once
+    Parameters
+    __________
+    raw_df : pd.DataFrame
+        dataframe of the .raw file where the first six columns are from the 
+        .fam file and the other columns have the number of minor alleles of 
+        each variant
+
+    Returns
+    _______
+    pd.DataFrame
+        returns a dataframe with the columns IID and Variant ID. The rows are 
+        in the order of the variant columns and then the order of the raw 
+        file. Variants with no carriers have one row where the IID is N/A
+    """
+    column_array: np.ndarray = raw_df.columns[6:].to_numpy(dtype=object)
+
+    # individuals with one or two copies of the allele are carriers
+    carrier_array: np.ndarray = np.isin(raw_df.iloc[:, 6:].to_numpy(), [1.0, 2.0])
+
+    variant_index, sample_index = np.nonzero(carrier_array.T)
+
+    # adding a row with no sample for the variants that have no carriers
+    no_carrier_index: np.ndarray = np.flatnonzero(~carrier_array.any(axis=0))
+
+    variant_index = np.concatenate([variant_index, no_carrier_index])
+
+    sample_index = np.concatenate([sample_index, np.full(len(no_carrier_index), -1)])
+
+    row_order: np.ndarray = np.lexsort((sample_index, variant_index))
+
+    variant_index = variant_index[row_order]
+
+    sample_index = sample_index[row_order]
+
+    # the sample index of -1 picks the N/A that is added to the end
+    iid_array: np.ndarray = np.append(raw_df.IID.to_numpy(dtype=object), "N/A")
+
+    return pd.DataFrame({
+        "IID": iid_array[sample_index],
+        "Variant ID": column_array[variant_index]
+    }, columns=["IID", "Variant ID"])
+
+
+def get_allele_frequency_df(raw_df: pd.DataFrame) -> pd.DataFrame:
+    """Function to find the allele frequency of every variant in the raw file 
+    at once
+    Parameters
+    __________
+    raw_df : pd.DataFrame
+        dataframe of the .raw file where the first six columns are from the 
+        .fam file and the other columns have the number of minor alleles of 
+        each variant
+
+    Returns
+    _______
+    pd.DataFrame
+        returns a dataframe with the columns variant_id and allele_freq. The 
+        frequency is the number of carriers divided by the number of alleles 
+        in the raw file
+    """
+    # counting each individual with one or two copies of the allele once
+    carrier_count_array: np.ndarray = np.isin(raw_df.iloc[:, 6:].to_numpy(), [1.0, 2.0]).sum(axis=0)
+
+    total_allele_count: int = len(raw_df) * 2
+
+    return pd.DataFrame({
+        "variant_id": raw_df.columns[6:].tolist(),
+        "allele_freq": [carrier_count / total_allele_count if total_allele_count else np.nan for carrier_count in carrier_count_array.tolist()]
+    })
+
+
+def load_raw_files(recode_dir: str, pop_info: str = None, pop_code: str = None):
+    """Generator that loads each .raw file, or each .bed file if there are no
+    .raw files, once and filters it to the population
+    Parameters
+    __________
+    recode_dir : str
+        string that list the directory that has the plink output files
+
+    pop_info : str
+        file that contains information about what ancestry each grid is from
+
+    pop_code : str
+        specified population code of interest from 1000 genomes. If this 
+        value is None then the raw files are not filtered
+
+    Yields
+    ______
+    Tuple[str, pd.DataFrame]
+        yields a tuple of the chromosome number in the format chrXX and the 
+        filtered raw file
+    """
+    recode_file_list: list = utility_scripts.get_file_list(recode_dir, "*raw")
+
+    # if plink only extracted the variants into .bed files then the
+    # genotypes are read from those files
+    if not recode_file_list:
+        recode_file_list = utility_scripts.get_file_list(recode_dir, "*.bed")
+
+    # the population file is only read once for all the raw files
+    if pop_code:
+
+        pop_filter: population_filter_scripts.Pop_Filter = population_filter_scripts.Pop_Filter(pop_info, None)
+
+        pop_info_subset_df: pd.DataFrame = pop_filter.get_pop_info_subset(pd.read_csv(pop_info, sep="\t"), pop_code)
+
+    for recodefile in recode_file_list:
+
+        # load the raw_file or the .bed file into a dataframe
+        raw_file: pd.DataFrame = load_recode_file(recodefile)
+
+        if pop_code:
+            raw_file = pop_filter.filter_recode_df(pop_info_subset_df, raw_file)
+
+        yield utility_scripts.get_chr_num(recodefile, r".chr\d\d_"), raw_file
+
+
+def write_allele_frequencies(allele_frequency_df: pd.DataFrame, output: str):
+    """Function to write the allele frequencies to the allele_frequencies.txt 
+    file in the carrier_analysis_output directory
+    Parameters
+    __________
+    allele_frequency_df : pd.DataFrame
+        dataframe with the columns chr, variant_id, and allele_freq
+
+    output : str
+        string that list the directory that has the carrier_analysis_output 
+        directory
+    """
+    allele_frequency_df[["chr", "variant_id", "allele_freq"]].to_csv(os.path.join(output, "carrier_analysis_output/allele_frequencies.txt"), sep="\t", index=False)
+
+
 # @utility_scripts.func_readme_generator
 def single_variant_analysis(parameter_dict: dict):
-    """Function that identifies grids that carry at least one variant
+    """Function that identifies grids that carry at least one variant. The 
+    allele frequencies are found from the same raw files and written to the 
+    allele_frequencies.txt file
     Parameters
     __________
     **kwargs : dict
@@ -43,55 +181,22 @@ def single_variant_analysis(parameter_dict: dict):
     # checking if the output path exists and making it if it doesn't
     full_output_dir: str =utility_scripts.check_dir(write_path, "carrier_analysis_output/")
 
-    recode_file_list: list = utility_scripts.get_file_list(recodeFile, "*raw")
+    allele_frequency_df_list: list = []
 
     # iterating through each file in the recode file list
-    for recodefile in recode_file_list:   
+    for chr_num, raw_file in load_raw_files(recodeFile, pop_info, pop_code):
 
-        # getting the chromosome number to use as a file prefix
-        # with the function get_chr_num and forming the output
-        # file name
+        # forming the output file name with the chromosome number as a 
+        # file prefix
         output_file_name = "".join(
-            [utility_scripts.get_chr_num(recodefile, r".chr\d\d_"), ".", "single_variant_carrier.csv"])
+            [chr_num, ".", "single_variant_carrier.csv"])
 
         # forming the full path of the output file
         full_output_file: str = os.path.join(full_output_dir, output_file_name)
 
-        # TODO: refactor these next two lines
-        # load the raw_file into a dataframe
-        raw_file: pd.DataFrame = pd.read_csv(recodefile, sep=" ")
-
-        if pop_code:
-            raw_file: pd.DataFrame = population_filter_scripts.run_pop_filter(pop_info, raw_file,
-                                                    pop_code)
-
-        column_list = raw_file.columns[6:].values.tolist()
-
-    
-        carrier_df: pd.DataFrame = pd.DataFrame()
-
-
-        for column in column_list:
-
-            IID_series: pd.Series = raw_file[raw_file[column].isin([1.0,
-                                                                    2.0])].IID
-
-            # If the IID_series has a length of 0 then there are
-            # no carriers of the variant. The program will then make
-            # a pandas series and insert N/A into it and then this
-            # will be added to the dataframe
-            if len(IID_series) == 0:
-                IID_series = pd.Series("N/A")
+        allele_frequency_df_list.append(get_allele_frequency_df(raw_file).assign(chr=chr_num))
 
-                iid_dataframe: pd.DataFrame = IID_series.to_frame()
-            else:
-                iid_dataframe: pd.DataFrame = IID_series.to_frame()
-
-            iid_dataframe["Variant ID"] = column
-
-            iid_dataframe.columns = ["IID", "Variant ID"]
-            
-            carrier_df = pd.concat([carrier_df, iid_dataframe])
+        carrier_df: pd.DataFrame = get_carrier_df(raw_file)
 
 
         # counting how many total unique carriers
@@ -109,3 +214,6 @@ def single_variant_analysis(parameter_dict: dict):
         # totalVariantIDList(iid_list, output_path, file_prefix)
 
         carrier_df.to_csv(full_output_file, index=False)
+
+    if allele_frequency_df_list:
+        write_allele_frequencies(pd.concat(allele_frequency_df_list, ignore_index=True), write_path)
@@ -2,11 +2,15 @@ from create_network_scripts.network_creator_class import Network_Prep, Network_M
 import logging
 import re
 import os
+import multiprocessing as mp
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 import utility_scripts
 
+# columns of the percent_confirmed_carriers.csv file
+IND_IN_NETWORKS_KEYS: List[str] = ["variant_id", "gene_name", "percent_in_network", "genotyped_carriers_count", "confirmed_carrier_count"]
+
 def create_readme(output_path: str):
     '''This function will create a readme file for the specified directory'''
     readme = utility_scripts.Readme("_README.md", output_path)
@@ -18,7 +22,7 @@ def create_readme(output_path: str):
 
 def add_nopair_variants(ind_in_networks_dict: dict, iid_list: list,
                         variant: str) -> dict:
-    '''This function will add the variants that have no pairs of confirmed 
+    '''This function will add the variants that have no pairs of confirmed
     carriers to the list'''
 
     ind_in_networks_dict["variant_id"].append(variant)
@@ -29,8 +33,86 @@ def add_nopair_variants(ind_in_networks_dict: dict, iid_list: list,
     return ind_in_networks_dict
 
 
-def create_networks(allpair_file_dir: str, networks_dir: str, analysis_type: str, confirmed_carriers_file: str):
-    """main function that will be used to create networks of files"""
+def build_networks(chromo_num: str, identifier: str, iid_list: List[str], allpair_file: str, analysis_type: str) -> Tuple[pd.DataFrame, Dict[str, List]]:
+    """Function to find the networks for one variant/gene. This function is
+    run by the workers in create_networks
+    Parameters
+    __________
+    chromo_num : str
+        string that has the chromosome number in the format chrX or chrXX
+
+    identifier : str
+        string that has the variant id or the gene name
+
+    iid_list : List[str]
+        list of the carriers for the variant or gene
+
+    allpair_file : str
+        filepath to the allpair file for the variant or gene
+
+    analysis_type : str
+        string of the analysis type. This will be either gene or phenotype
+
+    Returns
+    _______
+    Tuple[pd.DataFrame, Dict[str, List]]
+        returns a tuple where the first value is the network_carriers
+        dataframe for the network_groups.txt file and the second value is a
+        dictionary with the rows for the percent_confirmed_carriers.csv file
+    """
+    ind_in_networks_dict: Dict[str, List] = {key: [] for key in IND_IN_NETWORKS_KEYS}
+
+    # creating an object that will determine who is in a network
+    network_maker: Network_Maker = Network_Maker(chromo_num, identifier, iid_list, analysis_type)
+
+    # Loading the dataframe
+    allpair_df: pd.DataFrame = network_maker.load_allpair_file(allpair_file)
+
+    # filtering the allpair_df for only rows were both individuals are carriers
+    filtered_allpair_df: pd.DataFrame = network_maker.filter_for_carriers(allpair_df)
+
+    # if the dataframe is empty then the carriers are written without a network
+    if filtered_allpair_df.empty:
+        print(
+            f"There were no pairs found where both individuals were carriers for the variant {network_maker.identifier}"
+        )
+
+        # adding the variants/gene that has no pairs to the ind_in_networks_dict
+        ind_in_networks_dict = network_maker.has_no_pairs(ind_in_networks_dict)
+
+        return network_maker.network_carriers, ind_in_networks_dict
+
+    filtered_allpair_df = network_maker.drop_empty_rows(filtered_allpair_df)
+
+    # This class method will determine the percentage of carriers in each network for each variant
+    ind_in_networks_dict = network_maker.carriers_in_network(filtered_allpair_df, ind_in_networks_dict)
+
+    return network_maker.draw_networks(filtered_allpair_df), ind_in_networks_dict
+
+
+def create_networks(allpair_file_dir: str, networks_dir: str, analysis_type: str, confirmed_carriers_file: str, threads: int = 1):
+    """main function that will be used to create networks of files. Each
+    variant/gene is run as a separate task and the results are written to
+    the network_groups.txt and the percent_confirmed_carriers.csv files at
+    the end
+    Parameters
+    __________
+    allpair_file_dir : str
+        string that list the path to the directory that has the allpair.txt files
+
+    networks_dir : str
+        string that list the path to the directory to write the output files to
+
+    analysis_type : str
+        string of the analysis type. This will be either gene or phenotype
+
+    confirmed_carriers_file : str
+        string that list the filepath to the confirmed_carriers.txt file
+
+    threads : int
+        number of cpu cores to be used during the computation. This value
+        is 1 by default
+    """
     create_readme(networks_dir)
 
     # checking to see if the next three files exist from a previous run and if they do then the progam removes them
@@ -40,91 +122,77 @@ def create_networks(allpair_file_dir: str, networks_dir: str, analysis_type: str
 
     utility_scripts.check_file(os.path.join(networks_dir, "missing_allpairs.txt"))
 
-    # Creating an empty dataframe that the pairs will be written to at the end in the
-    # draw networks function
-    pairs_df: pd.DataFrame = pd.DataFrame()
-
-    # Getting all of the allpair files into a list
-    allpair_file_list: list = utility_scripts.get_file_list(
-        allpair_file_dir, "*.allpair.txt")
+    # Getting all of the allpair files into a dictionary keyed by the
+    # chromosome number and the variant/gene
+    allpair_file_dict: Dict[Tuple[str, str], str] = utility_scripts.get_allpair_file_dict(allpair_file_dir)
 
     # Need to refactor so that this doesn't rel on the variant_file_dir
     network_drawer: Network_Prep = Network_Prep(
         allpair_file_dir, networks_dir, analysis_type)
-    
+
     network_drawer.determine_carriers(confirmed_carriers_file)
-    
-    
-    # Getting a list of all the carrier files
 
-    # Creating a dictionary that will be used to record useful information
-    ind_in_networks_dict = {
-        "variant_id": [],
-        "gene_name": [],
-        "percent_in_network": [],
-        "genotyped_carriers_count": [],
-        "confirmed_carrier_count": []
-    }
+    # creating a list of the arguments for each variant/gene that has an
+    # allpair file
+    task_list: List[Tuple[str, str, List[str], str, str]] = []
 
-    # creating a list that will be used to keep track of which variants have no pairs
-    no_pair_carry_var_list: list = []
+    for chromo_num, inner_dict in network_drawer.iid_dict.items():
 
+        for identifier, iid_list in inner_dict.items():
 
-        # TODO: At this point the network_drawer has an attribute iid_dict that has the carriers for each variant/gene in for the chromosome 
-        # iterating through each variant and getting the list of carriers
-    for chromo_num in network_drawer.iid_dict.keys():
-        
-        inner_dict: Dict[str, List[str]] = network_drawer.iid_dict[chromo_num]
-        # creating an object that has the chromosome number, the variant id/gene 
-        # name, and the iid list as attributes
+            allpair_file: str = allpair_file_dict.get((utility_scripts.fix_chr(chromo_num), identifier))
 
-        for identifier in inner_dict: 
-            # pulling out the list of iids that are associated with the different 
-            # genes/variant ids
-            iid_list: List[str] = inner_dict[identifier]
+            if allpair_file is None:
 
-            # creating an object that will determine who is in a network
-            network_maker: Network_Maker = Network_Maker(chromo_num, identifier, iid_list, analysis_type)
+                print(
+                    f"There was no allpair.txt file found for the variant, {identifier}"
+                )
 
-            allpair_file: str = network_maker.find_allpair_file(allpair_file_list)
+                continue
 
-            if allpair_file == "None":
+            task_list.append((chromo_num, identifier, iid_list, allpair_file, analysis_type))
 
-                # TODO: add a function to write these variants to a file so that you can identify them
+    if task_list:
 
-                continue
-            
-            # Loading the dataframe
-            allpair_df: pd.DataFrame = network_maker.load_allpair_file(
-                allpair_file)
+        with mp.Pool(min(int(threads), len(task_list))) as pool:
 
-            # filtering the allpair_df for only rows were both individuals are carriers
-            filtered_allpair_df: pd.DataFrame = network_maker.filter_for_carriers(
-                allpair_df)
+            # starmap keeps the results in the order of the tasks so the
+            # output files are the same for every run
+            result_list: List[Tuple[pd.DataFrame, Dict[str, List]]] = pool.starmap(build_networks, task_list)
 
-            # if the dataframe is empty then the loop needs to skip that variant
-            if filtered_allpair_df.empty:
-                print(
-                    f"There were no pairs found where both individuals were carriers for the variant {network_maker.identifier}"
-                )
+    else:
+        result_list = []
 
-                # appending the variant/gene that has no pairs to the 
-                # no_pair_carry_var_list
-                no_pair_carry_var_list.append(network_maker.identifier)
+    write_network_files(result_list, networks_dir)
 
-                # adding the variants/gene that has no pairs to the ind_in_networks_dict
-                ind_in_networks_dict = network_maker.has_no_pairs(ind_in_networks_dict, networks_dir)
-                # prints the message and then moves onto the next iteration
-                continue
 
-            filtered_allpair_df = network_maker.drop_empty_rows(filtered_allpair_df)
-            # This class method will determine the percentage of carriers in each network for each variant
-            ind_in_networks_dict = network_maker.carriers_in_network(
-                filtered_allpair_df, ind_in_networks_dict
-                )
+def write_network_files(result_list: List[Tuple[pd.DataFrame, Dict[str, List]]], networks_dir: str):
+    """Function to write the results of every variant/gene to the
+    network_groups.txt and the percent_confirmed_carriers.csv files
+    Parameters
+    __________
+    result_list : List[Tuple[pd.DataFrame, Dict[str, List]]]
+        list of the tuples from build_networks with the network_carriers
+        dataframe and the dictionary of rows for the
+        percent_confirmed_carriers.csv file
+
+    networks_dir : str
+        string that list the path to the directory to write the output files to
+    """
+    # Creating a dictionary that will be used to record useful information
+    ind_in_networks_dict: Dict[str, List] = {key: [] for key in IND_IN_NETWORKS_KEYS}
+
+    for _, result_dict in result_list:
+
+        for key in IND_IN_NETWORKS_KEYS:
+            ind_in_networks_dict[key].extend(result_dict[key])
+
+    if result_list:
 
-            groups_output_path, pairs_df = network_maker.draw_networks(
-                filtered_allpair_df, pairs_df, networks_dir)
+        pd.concat([network_carriers for network_carriers, _ in result_list], ignore_index=True).to_csv(
+            os.path.join(networks_dir, "network_groups.txt"),
+            sep="\t",
+            index=False)
 
     ind_in_network_df: pd.DataFrame = pd.DataFrame.from_dict(
         ind_in_networks_dict)
@@ -1,5 +1,5 @@
 import numpy as np
-from numpy.core.numeric import NaN
+from numpy import nan as NaN
 import pandas as pd
 import re
 import os.path
@@ -9,10 +9,12 @@ import gzip
 from typing import List, Dict
 
 import utility_scripts
+from create_network_scripts.union_find import assign_network_ids
+
 class Network_Prep:
     
     def __init__(self, allpair_file_dir: str, network_dir: str, analysis_type: str) -> None:
-        self.allpair_file_list: list = utility_scripts.get_file_list(allpair_file_dir, "*allpair.txt")
+        self.allpair_file_list: list = utility_scripts.get_file_list(allpair_file_dir, "*allpair.txt*")
         self.output: str = network_dir
         self.analysis_type: str = analysis_type
 
@@ -54,8 +56,9 @@ class Network_Prep:
                 # getting the list of iids associated with that variant and ch    romosome
                 iid_list: List[str] = carriers_df[carriers_df["gene_name"] == gene].IID.values.tolist()
 
-                # writing this list ot a dictionary
-                iid_dict["".join(["chr",chr_num])] = {gene: iid_list}
+                # writing this list ot a dictionary. Genes on the same 
+                # chromosome share the inner dictionary
+                iid_dict.setdefault("".join(["chr",chr_num]), {})[gene] = iid_list
 
         else:   
             # getting a list of all the variants from the carriers_df
@@ -70,8 +73,9 @@ class Network_Prep:
                 # getting the list of iids associated with that variant and chromosome
                 iid_list: List[str] = carriers_df[carriers_df["variant_id"] == variant].IID.values.tolist()
 
-                # writing this list ot a dictionary
-                iid_dict["".join(["chr",str(chr_num)])] = {variant: iid_list}
+                # writing this list ot a dictionary. Variants on the same 
+                # chromosome share the inner dictionary
+                iid_dict.setdefault("".join(["chr",str(chr_num)]), {})[variant] = iid_list
 
         # creating an attribute that keeps track of these values
         self.iid_dict : Dict[str, Dict[str, List[str]]] = iid_dict
@@ -108,36 +112,6 @@ class Network_Maker:
         else:
             return chr_number
 
-    def find_allpair_file(self, allpair_list: List[str]) -> str:
-        """Function to find the specific allpair file that lines up with the chr number and the variant/gene name
-        Parameters
-        __________
-        allpair_list : List[str]
-            list of all the allpair files
-        
-        Returns
-        _______
-        str
-            specific filepath to the allpair file that matches the 
-            chr_num and variant_id
-        """
-        
-        try:
-            allpair_file_path: str = [
-                        file for file in allpair_list
-                        if self.fix_chr(self.chr_num.strip(".")) in file and self.identifier in file
-                    ][0]
-
-        except IndexError:
-
-            print(
-                    f"There was no allpair.txt file found for the variant, {self.identifier}"
-                )
-            # need to catch an error here
-            return "None"
-
-        return allpair_file_path
-    
     @staticmethod
     def load_allpair_file(allpair_file_path: str) -> pd.DataFrame:
         """This function will load the allpair files into a dataframe
@@ -180,8 +154,9 @@ class Network_Maker:
 
         return filtered_df
 
-    def has_no_pairs(self, ind_in_networks_dict: Dict[str, List], output: str) -> Dict[str, List]:
-        """Function to add the individuals who have no pairs to the output dictionary
+    def has_no_pairs(self, ind_in_networks_dict: Dict[str, List]) -> Dict[str, List]:
+        """Function to add the individuals who have no pairs to the output dictionary. 
+        The carriers are kept in the network_carriers attribute
         Parameters
         __________
         ind_in_networks_dict : Dict[str, List]
@@ -189,10 +164,6 @@ class Network_Maker:
             percentage of individuals are in the network, what number of carriers 
             are genotyped, and how many carriers are confirmed carriers.
         
-        output : str
-            string that list the filepath to the write the output 
-            files to
-        
         Returns 
         Dict[str, List]
             returns a dictionary containing information about the 
@@ -237,29 +208,6 @@ class Network_Maker:
         self.network_carriers = pd.DataFrame.from_dict(
             carriers_in_network_dict)
 
-        # need to write these variants to a dataframe
-        # if the file already exist then need to append the new 
-        # information without adding a header
-        if os.path.exists(os.path.join(
-            output, "network_groups.txt")) and os.stat(os.path.join(
-                output, "network_groups.txt")) != 0:
-
-            self.network_carriers.to_csv(os.path.join(
-                output, "network_groups.txt"), 
-                                        sep="\t",
-                                        index=False,
-                                        mode="a",
-                                        header=None)
-        
-        # if the file doesn't exist already then you have to append
-        # the new information with a header
-        else:
-            self.network_carriers.to_csv(os.path.join(
-                output, "network_groups.txt"),
-                                        sep="\t",
-                                        index=False,
-                                        mode="a")
-
         return ind_in_networks_dict
     
     @staticmethod
@@ -344,120 +292,31 @@ class Network_Maker:
         
         return ind_in_networks_dict
 
-    def draw_networks(self, reformated_df: pd.DataFrame, pairs_df: pd.DataFrame, output_path: str) -> tuple:
-        """This function actually draws the networks. It takes the reformated dataframe from the isolate_ids functions. It will return the path to the output file and a dataframe of pairs"""
-
-        ##########################################################
-
-        # getting a list of all unique IDs in the Pair_id1 column to iterate through
-        id_list = reformated_df['pair_1'].unique().tolist()
-
-        # keeping a set of nodes that have already been visited
-        nodes_visited_set = set()
-        # Starting the network number at 1
-        network_number = 1
-        # Creating the nodes
-        # iterating through each id1
-        for id1 in id_list:
-
-            # Limit the passed dataframe to only those that have a relationship with id1. Only need to Pair_id1 and
-            # Pair_id2 columns to make nodes
-            nodes_constructed = set()
-
-            if id1 not in nodes_visited_set:
-
-                segments_file_subset = reformated_df[
-                    (reformated_df['pair_1'] == id1) |
-                    (reformated_df['pair_2'] == id1)][["pair_1", "pair_2"]]
-
-                ids1_set = set(segments_file_subset.pair_1.values.tolist())
-
-                ids2_set = set(segments_file_subset.pair_2.values.tolist())
-
-                ids_list = ids1_set | ids2_set
-
-                # insert recursive function here
-                self.generate_pair_list(ids_list, reformated_df, id1)
-
-                # Subsetting the original dataframe for this full list
-                full_subset_df = reformated_df[
-                    (reformated_df.pair_1.isin(self.iid_list)) |
-                    (reformated_df.pair_2.isin(self.iid_list))][[
-                        "pair_1", "pair_2"
-                    ]]
-
-                # iterating through each row
-                for row in full_subset_df.itertuples():
-
-                    # breaking up the tuple into each pair
-                    Pair_id1 = row[1]
-                    Pair_id2 = row[2]
-                    # This if statements only makes Pair_id1 a node if it is not already constructed
-                    if Pair_id1 not in nodes_constructed:
-
-                        # Keeping track of what nodes have been made
-                        nodes_visited_set.add(Pair_id1)
-
-                        nodes_constructed.add(Pair_id1)
-
-                    # This if statement only makes the second node of Pair_id2 if it has not been made yet
-                    if Pair_id2 not in nodes_visited_set:
-
-
-                        # Keeps track of what nodes have been made
-                        nodes_visited_set.add(Pair_id2)
-
-                        nodes_constructed.add(Pair_id2)
-
-
-                ###########################################################################
-                # Next section is responsible for updating which IID is in which network
-                # Updating the self.network_carriers dataframe so that the Network id gets set to a number
-
-                    idx = self.network_carriers.index[
-                        self.network_carriers["IID"] == Pair_id1]
-
-                    self.network_carriers.loc[idx, ["Network ID"]] = str(
-                        network_number)
-
-                    idx = self.network_carriers.index[
-                        self.network_carriers["IID"] == Pair_id2]
-
-                    self.network_carriers.loc[idx, ["Network ID"]] = str(
-                        network_number)
-
-                ###########################################################################
+    def draw_networks(self, reformated_df: pd.DataFrame) -> pd.DataFrame:
+        """This function finds the network of each carrier from the reformated dataframe of carrier pairs
+        Parameters
+        __________
+        reformated_df : pd.DataFrame
+            dataframe of the pairs where both individuals are carriers
 
-                # This updates which network is being created
-                network_number += 1
-                # Adding values to the pair dictionary
+        Returns
+        _______
+        pd.DataFrame
+            returns the network_carriers dataframe with the network id of each 
+            carrier and the gene name, variant id, and chromosome number
+        """
+        # finding the network of each iid in the pairs. The networks are
+        # numbered in the order that they are first found in the pair_1 column
+        network_id_dict: Dict[str, int] = assign_network_ids(reformated_df["pair_1"].tolist(), reformated_df["pair_2"].tolist())
 
+        # Updating the self.network_carriers dataframe so that the Network id
+        # gets set to a number. Carriers that are not in a network stay NaN
+        self.network_carriers["Network ID"] = self.network_carriers["IID"].map({iid: str(network_number) for iid, network_number in network_id_dict.items()})
 
         # Adding a column for the variant number and the chr number so that we can output just one file
         self.network_carriers = self.add_columns(self.network_carriers)
 
-        # allpairs_df = self.add_columns(allpairs_df, variant, chr_num)
-
-        # Writing the dataframe to a csv file
-        if os.path.exists(os.path.join(
-            output_path, "network_groups.txt")) and os.stat(os.path.join(
-                output_path, "network_groups.txt")) != 0:
-
-            self.network_carriers.to_csv(os.path.join(
-                output_path, "network_groups.txt"),
-                                        sep="\t",
-                                        index=False,
-                                        mode="a",
-                                        header=None)
-        else:
-
-            self.network_carriers.to_csv(os.path.join(
-                output_path, "network_groups.txt"),
-                                        sep="\t",
-                                        index=False,
-                                        mode="a")
-        # the function returns the full path for the network_carriers dataframe and it also returnst eh allpairs_df
-        return os.path.join(output_path, "network_groups.txt"), pairs_df
+        return self.network_carriers
 
     def add_columns(self, dataframe: pd.DataFrame,
                     ) -> pd.DataFrame:
@@ -477,31 +336,3 @@ class Network_Maker:
         dataframe["chr_num"] = self.fix_chr(self.chr_num)[-2:]
 
         return dataframe
-    
-    def generate_pair_list(self, current_id_set: set, segment_df: pd.DataFrame,
-                           current_id1: str):
-        '''This function identifies all the potential pair ids for '''
-
-        # First subset the dataframe for all the current ids
-        new_df_subset = segment_df[
-            (segment_df['pair_1'].isin(current_id_set)) |
-            (segment_df['pair_2'].isin(current_id_set))][["pair_1", "pair_2"]]
-
-        # These next three lines use sets to avoid duplicate values
-        # This gets all ids from the pair one column
-        id1_set = set(new_df_subset.pair_1.values.tolist())
-        # This gets all ids from the Pair two column
-        id2_set = set(new_df_subset.pair_2.values.tolist())
-        # this line takes teh union of each set to get all unique values
-        total_id_set = id1_set | id2_set
-
-        # If the total_id_set equals the current_id_set then the function stops
-        if total_id_set == current_id_set:
-           
-            # returns the set of ids
-            self.iid_list = total_id_set
-            return
-        # If the two sets are not equal then it recursively calls the function again
-        else:
-
-            self.generate_pair_list(total_id_set, segment_df, current_id1)
@@ -0,0 +1,121 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+class Union_Find:
+    """class that keeps track of which nodes are connected. The nodes are
+    integer codes and each set of connected nodes has one root node"""
+
+    def __init__(self, node_count: int) -> None:
+        """
+        Parameters
+        __________
+        node_count : int
+            number of nodes. The nodes are the integers from 0 to
+            node_count - 1
+        """
+        self.parent: List[int] = list(range(node_count))
+        self.size: List[int] = [1] * node_count
+
+    def find(self, node: int) -> int:
+        """Method to find the root node of the set that the node is in. The
+        path to the root is shortened as it is walked
+        Parameters
+        __________
+        node : int
+            integer code of the node
+
+        Returns
+        _______
+        int
+            returns the integer code of the root node
+        """
+        parent: List[int] = self.parent
+
+        while parent[node] != node:
+
+            # pointing the node at its grandparent so the next search is
+            # shorter
+            parent[node] = parent[parent[node]]
+
+            node = parent[node]
+
+        return node
+
+    def union(self, node_1: int, node_2: int):
+        """Method to join the sets of the two nodes. The smaller set is
+        joined to the larger set
+        Parameters
+        __________
+        node_1 : int
+            integer code of the first node
+
+        node_2 : int
+            integer code of the second node
+        """
+        root_1: int = self.find(node_1)
+        root_2: int = self.find(node_2)
+
+        if root_1 == root_2:
+            return
+
+        if self.size[root_1] < self.size[root_2]:
+            root_1, root_2 = root_2, root_1
+
+        self.parent[root_2] = root_1
+
+        self.size[root_1] += self.size[root_2]
+
+    def get_roots(self) -> np.ndarray:
+        """Method to get the root node of every node
+
+        Returns
+        _______
+        np.ndarray
+            returns an array of the root node for each node
+        """
+        return np.array([self.find(node) for node in range(len(self.parent))], dtype=np.int64)
+
+
+def assign_network_ids(pair_1_list: List[str], pair_2_list: List[str]) -> Dict[str, int]:
+    """Function to find the network of every iid from the pairs. Two iids are
+    in the same network if there is a path of pairs between them. The
+    networks are numbered from 1 in the order that the first iid of the
+    network appears in the pair_1 column
+    Parameters
+    __________
+    pair_1_list : List[str]
+        list of the first iid in each pair
+
+    pair_2_list : List[str]
+        list of the second iid in each pair
+
+    Returns
+    _______
+    Dict[str, int]
+        returns a dictionary where the keys are the iids and the values are
+        the network number
+    """
+    pair_count: int = len(pair_1_list)
+
+    # encoding the iids as integers so that the union find can use lists
+    iid_codes, iid_array = pd.factorize(pd.Series(list(pair_1_list) + list(pair_2_list), dtype=object))
+
+    union_find: Union_Find = Union_Find(len(iid_array))
+
+    for code_1, code_2 in zip(iid_codes[:pair_count].tolist(), iid_codes[pair_count:].tolist()):
+        union_find.union(code_1, code_2)
+
+    roots: np.ndarray = union_find.get_roots()
+
+    network_number_dict: Dict[int, int] = {}
+
+    # numbering each network when the first of its iids is found in the
+    # pair_1 column
+    for code in pd.unique(iid_codes[:pair_count]).tolist():
+
+        network_number_dict.setdefault(int(roots[code]), len(network_number_dict) + 1)
+
+    return {iid: network_number_dict[int(roots[code])] for code, iid in enumerate(iid_array.tolist())}
@@ -400,41 +400,34 @@ def parallel_map(workers: int, allpair_file_list: list, variant_list: list,
                  network_file_path: str, confirmed_carrier_file: str):
     print("attempting to run in parallel...")
 
-    # creating a manager que that can be used to line up how it write to the file
-    manager = mp.Manager()
-
-    # creating the que object for the haplotypes
-    que = manager.Queue()
+    header: str = f"pair_1\tpair_2\tchr\tvariant_id\tnetwork_id\thapibd_start\thapibd_end\thapibd_len\tilash_start\tilash_end\tilash_len\n"
 
-    # create a que object for the failed variants
-    variant_que = manager.Queue()
+    # creating the result channels for the haplotypes and the failed 
+    # variants. These are written by threads in this process so every 
+    # worker in the pool is used for the variants
+    que = utility_scripts.Result_Channel("".join([output, "haplotype_lengths.txt"]), header).start()
 
-    pool = mp.Pool(workers)
+    variant_header: str = f"variant\tchr\n"
 
-    header: str = f"pair_1\tpair_2\tchr\tvariant_id\tnetwork_id\thapibd_start\thapibd_end\thapibd_len\tilash_start\tilash_end\tilash_len\n"
-    # activate the listener function so that it can write from the que as it is going
-    watcher = pool.apply_async(
-        utility_scripts.listener,
-        (que, "".join([output, "haplotype_lengths.txt"]), header))
+    variant_que = utility_scripts.Result_Channel("".join([output, "nopairs_haplotype_analysis.txt"]), variant_header).start()
 
-    variant_header: str = f"variant\tchr\n"
-    var_watcher = pool.apply_async(
-        utility_scripts.listener, (variant_que, "".join(
-            [output, "nopairs_haplotype_analysis.txt"]), variant_header))
+    # the queues can only be given to the workers when the pool starts
+    pool = mp.Pool(workers, initializer=utility_scripts.set_worker_tables, initargs=({"haplotype_queue": que.queue, "variant_queue": variant_que.queue},))
 
     # creating a partial function so that we can pass the necessary parameters to the get_haplotype function
-    func = partial(get_haplotype, allpair_file_list, carrier_file_list,
-                   map_file_list, ilash_file_list, hapibd_file_list, que,
-                   variant_que, network_file_path, confirmed_carrier_file)
+    func = partial(utility_scripts.call_with_worker_tables, get_haplotype, allpair_file_list, carrier_file_list,
+                   map_file_list, ilash_file_list, hapibd_file_list, utility_scripts.Worker_Table("haplotype_queue"),
+                   utility_scripts.Worker_Table("variant_queue"), network_file_path, confirmed_carrier_file)
 
     pool.map(func, variant_list)
 
-    que.put("kill")
-    variant_que.put("kill")
     pool.close()
 
     pool.join()
 
+    que.close()
+    variant_que.close()
+
 
 def remove_previous_file(file_path: str):
     '''This function will remove previous output files from previous runs'''
@@ -485,7 +478,7 @@ def get_segment_lengths(confirmed_carrier_file: str, output_path: str,
     map_file_list: list = get_file_list(map_file_dir, "*.map")
 
     # getting the list of allpair files
-    allpair_file_list: list = get_file_list(allpair_files, "*.allpair.txt")
+    allpair_file_list: list = get_file_list(allpair_files, "*.allpair.txt*")
 
     # getting a list of the ilash and hapibd files
     ilash_file_list: list = get_file_list(ilash_dir, "*.match.gz")
@@ -117,6 +117,57 @@ def create_args(run_func: object) -> argparse.ArgumentParser:
         required=False
     )
 
+    parser.add_argument(
+        "--single_pass",
+        help="This flag will make the program read each ibd file once per chromosome and test every variant on that chromosome at the same time instead of reading the file once per variant",
+        dest="single_pass",
+        action="store_true",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--cache_dir",
+        help="This argument will list a directory where the parsed hapibd and ilash files are cached as typed columns so that the text files are only parsed once. If it is not provided then the text files are read directly and, when the pairs are combined, each worker parses the whole hapibd and ilash file of its chromosome to index the pairs in memory. Providing this directory is recommended for large cohorts",
+        dest="cache_dir",
+        type=str,
+        required=False,
+        default=None
+    )
+
+    parser.add_argument(
+        "--combine_memory",
+        help="This argument will list the number of gigabytes that can be used when the pairs are combined into the allpair.txt files. It limits how many chromosomes are combined at the same time. If it is not provided then the number of chromosomes is only limited by the threads",
+        dest="combine_memory",
+        type=float,
+        required=False,
+        default=None
+    )
+
+    parser.add_argument(
+        "--compress_allpair",
+        help="This flag will make the program write the allpair files with gzip compression as .allpair.txt.gz files",
+        dest="compress_allpair",
+        action="store_true",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--plink_memory",
+        help="This argument will list the number of megabytes that can be used by all of the PLINK jobs that run at the same time. The memory is split between the jobs. If it is not provided then each PLINK job uses its default",
+        dest="plink_memory",
+        type=int,
+        required=False,
+        default=None
+    )
+
+    parser.add_argument(
+        "--extract_once",
+        help="This flag will make PLINK extract the variants from the binary file into a small .bed file once for each chromosome and then create every recode option from that file instead of reading the full binary file for each recode option. For the gene analysis the recode option is always run so that the .ped files are made",
+        dest="extract_once",
+        action="store_true",
+        default=False,
+    )
+
     # setting the default run function
     parser.set_defaults(func=run_func)
 
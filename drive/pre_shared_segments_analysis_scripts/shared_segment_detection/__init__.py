@@ -1,7 +1,9 @@
-from .gathering_pairs.collect_shared_segments import  generate_parameters, build_unique_id_dict, create_ibd_arrays, gather_pairs
+from .gathering_pairs.collect_shared_segments import  generate_parameters, build_unique_id_dict, create_ibd_arrays, gather_pairs, gather_pairs_all_variants
 from .gathering_pairs.gather_ibd_info import collect_files, iterate_file_dict
 from .gathering_pairs.filtering_functions import filter_for_correct_base_pair, filter_to_greater_than_3_cm, filter_to_individual_in_uniqID
 from .gathering_pairs.find_IBD_phenotype import gather_shared_segments
 from .combine_output.combine_ibd_pairs import combine_output, gather_files
 from .combine_output.building_file_dict import build_file_dict
 from .combine_output.reformat import Gene_Reformatter, Pheno_Reformatter
+from .segment_cache.segment_cache import Segment_Cache, convert_segment_files
+from .segment_cache.iid_encoder import IID_Encoder
@@ -1,62 +1,24 @@
 import sys
 import gzip
+import heapq
 import pandas as pd
-import itertools
 import glob
 import os
 import re
+import multiprocessing as mp
 from typing import List, Dict
 
 
 
 # Getting all the ibd files that end in .small.txt.gz
 import pre_shared_segments_analysis_scripts
-from .pair_functions import is_max_pairs_found, after_max_pair_found, Pair_Info_Class
+from .pair_functions import is_max_pairs_found, after_max_pair_found, Pair_Info_Class, ALLPAIR_COLUMNS
 from .build_analysis_dict import get_analysis_files
+from ..segment_cache.segment_cache import load_pair_index, estimate_pair_index_memory
+from ..segment_cache.pair_index import Pair_Index
 import utility_scripts
 
 
-def findkey(i, mydict):
-    result = []
-    offset = -1
-    while True:
-        try:
-            offset = list(mydict.values()).index(i, offset + 1)
-        except ValueError:
-            return list(map(lambda i: list(mydict.keys())[i], result))
-        result.append(offset)
-
-
-def allinter(mylist,
-             curr_pair) -> int:  # Finds the pair that intersects for all files
-    intu = curr_pair[mylist[0]]
-    for f in mylist[1:]:
-        intu = intu & curr_pair[f]
-    return intu
-
-
-def get_uniqrow(i, allcomb, curr_pair, combtab) -> list:
-    uniqdic = {}
-    for comb in allcomb.keys():
-        raw_n = len(allinter(allcomb[comb], curr_pair))
-        octab = pd.DataFrame(
-            map(lambda ff: combtab[ff] > combtab.loc[comb, ff],
-                allcomb[comb])).all()
-        overcount = octab.index[octab == True].tolist()
-        uniqdic[comb] = raw_n - \
-            sum(list(map(lambda oc: uniqdic[oc], overcount)))
-    return list(uniqdic.values())
-
-
-# This is pair that has union for all files
-def all_agree_pair(pair_list: dict) -> list:
-    unionpair = list(pair_list.values())[0]
-    for f in pair_list.keys():
-        unionpair = unionpair.union(pair_list[f])
-    return unionpair
-
-
-
 def get_carrier_list(file: str, variant_id: str) -> list:
     """Function to get a list of IIDs who are carrier from the carrier file
     Parameters
@@ -82,28 +44,6 @@ def get_carrier_list(file: str, variant_id: str) -> list:
     return carrier_list
 
 
-def check_for_missed_carriers(pair_2: str, pair_list: list,
-                              carrier_list: list) -> int:
-    '''This function will check for variants that may be missed carriers'''
-
-    # get a list of all strings that contain the pair
-    pair2_in_str: list = [string for string in pair_list if pair_2 in string]
-
-    connected_carriers_list: list = []
-
-    for pair in pair2_in_str:
-
-        pair_iids: list = pair.split(":")[1]
-
-        pair_1, pair_2 = pair_iids.split("-")
-
-        if pair_1 in carrier_list or pair_2 in carrier_list:
-
-            connected_carriers_list.append(pair)
-
-    return int(len(connected_carriers_list))
-
-
 # TODO: incorporate this function into the main combine_output function
 def get_file(file_list: list, identifier: str = None, chr_num=None) -> str:
     '''This function gets the file that matches a condition from a list of files'''
@@ -205,67 +145,19 @@ def gather_files(ibd_files: dict, segment_dir: str, map_file_dir: str = None) ->
     
     
 
-def read_first_line(files: list, openfile: dict, endline: dict, curr_pos: dict, curr_ibd: dict, curr_pair: dict, newpos: dict, newline: dict, endtest: dict) -> str:
-    """This function will read the first line of the files into the appropriate dictionary
-    Parameters
-    __________"""
-
-    for f in files:
-        openfile[f] = gzip.open(files[f], 'rt')
-        openfile[f].seek(0, 2)
-        endline[f] = openfile[f].tell()
-        openfile[f].seek(0)
-        line0 = openfile[f].readline()
-        curr_pos[f] = 0
-        curr_ibd[f] = set([])
-        curr_pair[f] = set([])
-        line1 = openfile[f].readline()
-        line1 = line1.strip()
-        newpos[f] = int(line1.split('\t')[1])
-        newline[f] = line1
-        endtest[f] = 0
-    
-    return line1
-
-def form_all_combinations(file_dict: dict, all_comb_dict: dict):
-    """Function to form all the combinations from the file dict
-    Parameters
-    __________
-    file_dict : dict
-        dictionary that has the files per certain chromosomes and the identifier
-    
-    all_comb_dict : dict
-        dictionary that will have the different combinations of items from
-        the file dictionary
-    """
-
-    for i in range(len(file_dict.keys()), 0, -1):
-        for item in list(itertools.combinations(file_dict.keys(), i)):
-            all_comb_dict['+'.join(item)] = item
-
-
-def write_to_file(output_path: str, pair_list: list):
-    """Function to write the pair string to a file 
+def write_allpair_file(output_path: str, pairs_df: pd.DataFrame):
+    """Function to write the dataframe of pairs to the allpair file with 
+    one call. If the output_path ends in .gz then the file is compressed
     Parameters
     _________
     output_path : str
         string that has the filepath to write the output to
     
-    pair_list : list
-        list that has the string of information for each pair in the 
-        pair iid list
+    pairs_df : pd.DataFrame
+        dataframe with the ALLPAIR_COLUMNS that has the information for 
+        each pair in the pair iid list
     """
-
-    with open(output_path, "a+") as allpair_new_file:
-            # Checks to see if the file is empty. If it is empty then it write the header
-        if os.path.getsize(output_path) == 0:
-            # creating a header_line
-            allpair_new_file.write(
-                "IBD_programs\tpair_1\tpair_2\tchr\tvariant_id\tgene_name\tcarrier_status\tpotential_missed_carrier\tconnected_carriers\thapibd_phase1\thapibd_phase2\tilash_phase1\tilash_phase2\thapibd_start\thapibd_end\thapibd_len\tilash_start\tilash_end\tilash_len\n"
-            )
-        # writing the pairs strings to the output file
-        for pair_str in pair_list:
-            allpair_new_file.write(pair_str)
+    pairs_df.to_csv(output_path, sep="\t", index=False, columns=ALLPAIR_COLUMNS, compression="infer")
 
 def fix_chr_num(chr_num: str) -> str:
     """Function to convert the chromosome number into a single digit if it is a single digit chromosome so chr08 == chr8
@@ -291,18 +183,16 @@ def fix_chr_num(chr_num: str) -> str:
 
 class Combine_Info:
     """Class that will contain information about the files that need ot be combined"""
-    def __init__(self, chr_num: str, identifier: str, gathered_file_dict: Dict[str, List], analysis_type: str, ibd_pairs_file_list: List[str], output_dir: str,  analysis_files: Dict) -> None:
+    def __init__(self, chr_num: str, identifier: str, gathered_file_dict: Dict[str, List], analysis_type: str, ibd_pairs_file_list: List[str], output_dir: str,  analysis_files: Dict, cache_dir: str = None, compress_allpair: bool = False) -> None:
         self.chr_num: str = chr_num
+        self.cache_dir: str = cache_dir
+        # if True then the allpair files are written as .allpair.txt.gz
+        self.compress_allpair: bool = compress_allpair
         self.identifier: str = identifier
         self.analysis_type: str = analysis_type
         self.ibd_file_list: List[str] = ibd_pairs_file_list
         self.output_dir: str = output_dir
         self.gather_file_dict: Dict[str, List] = gathered_file_dict
-        # # getting the correct hapibd dataframe and the correct ilash
-        # # dataframe for the specified chromosome number and identifier
-        # TODO: it is too memory expensive to do this
-        # self.hapibd_df: pd.DataFrame = self.get_ibd_df(gathered_file_dict["hapibd_file_list"])
-        # self.ilash_df: pd.DataFrame = self.get_ibd_df(gathered_file_dict["ilash_file_list"])
 
         # if the gene analysis approach is being used then the map file 
         # has to be gathered and the analysis type dict will use the map 
@@ -321,24 +211,35 @@ class Combine_Info:
 
         
     
-    def get_ibd_df(self, ibd_file_key: str) -> pd.DataFrame:
-        """Method to get the ibd file dataframe from the list in the gathered_file_dict
+    def get_ibd_file(self, ibd_file_key: str) -> str:
+        """Method to get the ibd file for the chromosome
         Parameters
         __________
         ibd_file_key : str
-            dictionary key for the gathereD_file_dict to get the appropriate ibd_files
-        
-        key_value : str
-            This is the string of the key to get the files from
-        
+            dictionary key for the gathered_file_dict to get the appropriate ibd_files
+
         Returns
         _______
-        pd.DataFrame
-            returns a dataframe of the ibd_file
+        str
+            returns the filepath of the ibd file
         """
-        ibd_file: str = find_ibd_file(self.gather_file_dict[ibd_file_key], fix_chr_num(self.chr_num))
+        return find_ibd_file(self.gather_file_dict[ibd_file_key], fix_chr_num(self.chr_num))
 
-        return  pd.read_csv(ibd_file, sep="\t", header=None)
+    def get_pair_index(self, ibd_file_key: str) -> Pair_Index:
+        """Method to get the pair index of the ibd file for the chromosome. 
+        The index is built once per chromosome and shared by every 
+        identifier so only the segments for each pair are looked up
+        Parameters
+        __________
+        ibd_file_key : str
+            dictionary key for the gathered_file_dict to get the appropriate ibd_files
+
+        Returns
+        _______
+        Pair_Index
+            returns the pair index of the ibd file
+        """
+        return load_pair_index(self.get_ibd_file(ibd_file_key), ibd_file_key.split("_")[0], self.cache_dir)
 
     def get_map_file(self, map_file_list: List[str]) -> str:
         """Method to get the correct map file from the list of map files for the correct chromosome
@@ -372,8 +273,438 @@ class Combine_Info:
         else:
             return 1
 
-def combine_output(gathered_file_dict: Dict, file_dict: Dict, output: str, analysis_type: str,threads: int, analysis_files: Dict):
-    """main function to run for this script"""
+class Pair_Stream_Merger:
+    """class that merges the .small.txt.gz files from each ibd program with 
+    a heap of the next position in each file. The segments and pairs for 
+    each program are kept up to date from the add and delete lists so each 
+    breakpoint only costs the size of those lists"""
+
+    def __init__(self, files: Dict[str, str]) -> None:
+        """
+        Parameters
+        __________
+        files : Dict[str, str]
+            dictionary where the keys are the ibd programs and the values 
+            are the filepaths to the .small.txt.gz files
+        """
+        self.programs: List[str] = list(files.keys())
+
+        self.openfile: dict = {}
+
+        # heap of the next position, the program index, and the line for 
+        # each file that has lines left
+        self.heap: list = []
+
+        # set of the segment strings in each program at the current 
+        # position
+        self.curr_ibd: Dict[str, set] = {}
+
+        # dictionary for each program where the keys are the pairs and the 
+        # values are the number of segments the pair has at the current 
+        # position
+        self.pair_counts: Dict[str, Dict[str, int]] = {}
+
+        # dictionary where the keys are the pairs that are in any program 
+        # and the values are the set of programs that have the pair
+        self.pair_programs: Dict[str, set] = {}
+
+        # list of the (pair, program, added) changes from the last position 
+        # so that the previous position can be formed
+        self.last_changes: list = []
+
+        for program_indx, program in enumerate(self.programs):
+
+            self.openfile[program] = gzip.open(files[program], "rt")
+
+            # skipping the header line
+            self.openfile[program].readline()
+
+            self.curr_ibd[program] = set()
+
+            self.pair_counts[program] = {}
+
+            self.push_next_line(program_indx)
+
+    def __len__(self) -> int:
+        return len(self.pair_programs)
+
+    def push_next_line(self, program_indx: int):
+        """Method to read the next line of a file and add it to the heap. 
+        The file is closed once it has no lines left
+        Parameters
+        __________
+        program_indx : int
+            index of the program in the programs list
+        """
+        program: str = self.programs[program_indx]
+
+        line: str = self.openfile[program].readline().strip()
+
+        if line == "":
+            self.openfile[program].close()
+
+            return
+
+        heapq.heappush(self.heap, (int(line.split("\t", 2)[1]), program_indx, line))
+
+    def update_pair(self, pair: str, program: str, change: int):
+        """Method to update the number of segments that a pair has for a 
+        program. The union of the programs is only changed when the pair 
+        is gained or lost by the program
+        Parameters
+        __________
+        pair : str
+            string of the pair in the format id1-id2
+
+        program : str
+            ibd program of the segment
+
+        change : int
+            1 if the segment was added or -1 if the segment was removed
+        """
+        program_counts: Dict[str, int] = self.pair_counts[program]
+
+        segment_count: int = program_counts.get(pair, 0) + change
+
+        if segment_count > 0:
+            program_counts[pair] = segment_count
+
+        else:
+            del program_counts[pair]
+
+        # the pair was gained by the program
+        if change == 1 and segment_count == 1:
+
+            self.pair_programs.setdefault(pair, set()).add(program)
+
+            self.last_changes.append((pair, program, True))
+
+        # the pair was lost by the program
+        elif change == -1 and segment_count == 0:
+
+            self.pair_programs[pair].discard(program)
+
+            if not self.pair_programs[pair]:
+                del self.pair_programs[pair]
+
+            self.last_changes.append((pair, program, False))
+
+    def apply_line(self, program: str, line: str) -> str:
+        """Method to add and remove the segments from one line of a 
+        .small.txt.gz file
+        Parameters
+        __________
+        program : str
+            ibd program of the file
+
+        line : str
+            line from the file with the chromosome, the position, the 
+            number of segments, the number of pairs, the added segments, 
+            and the removed segments
+
+        Returns
+        _______
+        str
+            returns the chromosome from the line
+        """
+        split_line: list = line.split("\t")
+
+        addibd: set = set(split_line[4].split(" ")) if split_line[4] != "NA" else set()
+
+        delibd: set = set(split_line[5].split(" ")) if split_line[5] != "NA" else set()
+
+        curr_ibd: set = self.curr_ibd[program]
+
+        # this matches (curr_ibd | addibd) - delibd
+        added_segments: set = addibd - delibd - curr_ibd
+
+        removed_segments: set = delibd & curr_ibd
+
+        curr_ibd |= added_segments
+
+        curr_ibd -= removed_segments
+
+        for segment in added_segments:
+            self.update_pair(segment.split(":")[1], program, 1)
+
+        for segment in removed_segments:
+            self.update_pair(segment.split(":")[1], program, -1)
+
+        return split_line[0]
+
+    def __iter__(self):
+        """Generator that moves to each position in the files in order
+
+        Returns
+        _______
+        Iterator[tuple]
+            yields a tuple of the chromosome and the position after the 
+            lines at that position are applied
+        """
+        while self.heap:
+
+            pos: int = self.heap[0][0]
+
+            # getting the line from every file at this position before 
+            # reading the next lines
+            line_list: list = []
+
+            while self.heap and self.heap[0][0] == pos:
+                line_list.append(heapq.heappop(self.heap))
+
+            self.last_changes = []
+
+            for _, program_indx, line in line_list:
+
+                CHR: str = self.apply_line(self.programs[program_indx], line)
+
+                self.push_next_line(program_indx)
+
+            yield CHR, pos
+
+    def close(self):
+        """Method to close the files that still have lines left if the 
+        merge is stopped early"""
+
+        for open_file in self.openfile.values():
+            open_file.close()
+
+    def format_pair(self, pair: str, program_set: set) -> str:
+        """Method to form the string of the programs that found the pair and 
+        the pair"""
+
+        return "{0}:{1}".format(",".join([program for program in self.programs if program in program_set]), pair)
+
+    def get_pair_str(self, previous: bool = False) -> str:
+        """Method to get the string of every pair and the programs that found 
+        it
+        Parameters
+        __________
+        previous : bool
+            if True then the pairs from the position before the last 
+            position are returned by undoing the last changes
+
+        Returns
+        _______
+        str
+            returns a space separated string of the pairs or NA if there 
+            are no pairs
+        """
+        if not previous:
+            outpair: list = [self.format_pair(pair, program_set) for pair, program_set in self.pair_programs.items()]
+
+            return " ".join(outpair) if outpair else "NA"
+
+        # getting the program set of each pair that changed at the last 
+        # position before the change
+        previous_programs: Dict[str, set] = {}
+
+        for pair, program, added in reversed(self.last_changes):
+
+            program_set: set = previous_programs.setdefault(pair, set(self.pair_programs.get(pair, set())))
+
+            if added:
+                program_set.discard(program)
+            else:
+                program_set.add(program)
+
+        outpair = []
+
+        for pair, program_set in self.pair_programs.items():
+
+            program_set = previous_programs.get(pair, program_set)
+
+            if program_set:
+                outpair.append(self.format_pair(pair, program_set))
+
+        # adding the pairs that were removed at the last position
+        for pair, program_set in previous_programs.items():
+
+            if pair not in self.pair_programs and program_set:
+                outpair.append(self.format_pair(pair, program_set))
+
+        return " ".join(outpair) if outpair else "NA"
+
+def group_by_chromosome(file_info_list: List[Combine_Info]) -> Dict[str, List[Combine_Info]]:
+    """Function to group the Combine_Info objects by chromosome so that the 
+    pair indices of a chromosome are loaded once for all of its identifiers
+    Parameters
+    __________
+    file_info_list : List[Combine_Info]
+        list of the Combine_Info objects for every chromosome/identifier combo
+
+    Returns
+    _______
+    Dict[str, List[Combine_Info]]
+        returns a dictionary where the keys are the chromosome numbers and 
+        the values are the list of Combine_Info objects for the chromosome
+    """
+    chromosome_dict: Dict[str, List[Combine_Info]] = {}
+
+    for combine_info in file_info_list:
+
+        chromosome_dict.setdefault(combine_info.chr_num, []).append(combine_info)
+
+    return chromosome_dict
+
+def estimate_chromosome_memory(combine_info_list: List[Combine_Info]) -> int:
+    """Function to estimate how much memory is needed to combine the pairs 
+    for a chromosome. This is the decoded size of the hapibd and ilash pair 
+    indices. The size of the cached index arrays is used if the cache is 
+    built and otherwise the rows of each file are estimated and multiplied 
+    by the bytes that read_pair_index uses for each row
+    Parameters
+    __________
+    combine_info_list : List[Combine_Info]
+        list of the Combine_Info objects for the chromosome
+
+    Returns
+    _______
+    int
+        returns the estimated number of bytes
+    """
+    memory_estimate: int = 0
+
+    for ibd_file_key in ["hapibd_file_list", "ilash_file_list"]:
+
+        memory_estimate += estimate_pair_index_memory(combine_info_list[0].get_ibd_file(ibd_file_key), ibd_file_key.split("_")[0], combine_info_list[0].cache_dir)
+
+    return memory_estimate
+
+def get_concurrent_chromosomes(memory_list: List[int], threads: int, memory_budget: float = None) -> int:
+    """Function to find how many chromosomes can be combined at the same 
+    time. This is the most chromosomes where the largest chromosomes still 
+    fit in the memory budget
+    Parameters
+    __________
+    memory_list : List[int]
+        list of the estimated number of bytes for each chromosome
+
+    threads : int
+        number of cpu cores to be used during the computation
+
+    memory_budget : float
+        number of gigabytes that can be used to combine the pairs. If this 
+        value is None then the number of chromosomes is only limited by the 
+        threads. This value is None by default
+
+    Returns
+    _______
+    int
+        returns the number of chromosomes to run at the same time. This is 
+        always at least 1
+    """
+    max_chromosomes: int = max(min(int(threads), len(memory_list)), 1)
+
+    if memory_budget is None:
+        return max_chromosomes
+
+    budget_bytes: float = float(memory_budget) * 1024 ** 3
+
+    concurrent_chromosomes: int = 1
+
+    # the largest chromosomes could all run at the same time so they 
+    # are used to check the budget
+    for chromosome_count in range(2, max_chromosomes + 1):
+
+        if sum(sorted(memory_list, reverse=True)[:chromosome_count]) > budget_bytes:
+            break
+
+        concurrent_chromosomes = chromosome_count
+
+    return concurrent_chromosomes
+
+def run_chromosome(combine_info_list: List[Combine_Info]):
+    """Function that combines the pairs for every identifier on a 
+    chromosome in one worker so that the pair indices of the chromosome are 
+    only loaded once
+    Parameters
+    __________
+    combine_info_list : List[Combine_Info]
+        list of the Combine_Info objects for the chromosome
+    """
+    for combine_info in combine_info_list:
+
+        run(combine_info)
+
+def run_combine_parallel(file_info_list: List[Combine_Info], threads: int, memory_budget: float = None):
+    """Function to run the chromosomes in parallel. Each worker combines 
+    one chromosome at a time and the number of workers is limited by the 
+    memory budget
+    Parameters
+    __________
+    file_info_list : List[Combine_Info]
+        list of the Combine_Info objects for every chromosome/identifier combo
+
+    threads : int
+        number of cpu cores to be used during the computation
+
+    memory_budget : float
+        number of gigabytes that can be used to combine the pairs. This 
+        value is None by default
+    """
+    chromosome_dict: Dict[str, List[Combine_Info]] = group_by_chromosome(file_info_list)
+
+    if not chromosome_dict:
+        return
+
+    memory_dict: Dict[str, int] = {chr_num: estimate_chromosome_memory(combine_info_list) for chr_num, combine_info_list in chromosome_dict.items()}
+
+    workers: int = get_concurrent_chromosomes(list(memory_dict.values()), threads, memory_budget)
+
+    # the largest chromosomes are started first so they are not the last 
+    # ones running
+    chromosome_list: List[List[Combine_Info]] = [chromosome_dict[chr_num] for chr_num in sorted(chromosome_dict, key=lambda chr_num: memory_dict[chr_num], reverse=True)]
+
+    # each worker is replaced after a chromosome so that the memory from 
+    # the pair indices is given back
+    pool = mp.Pool(workers, maxtasksperchild=1)
+
+    for _ in pool.imap_unordered(run_chromosome, chromosome_list, chunksize=1):
+        pass
+
+    pool.close()
+
+    pool.join()
+
+def combine_output(gathered_file_dict: Dict, file_dict: Dict, output: str, analysis_type: str,threads: int, analysis_files: Dict, cache_dir: str = None, memory_budget: float = None, compress_allpair: bool = False):
+    """main function to run for this script
+    Parameters
+    __________
+    gathered_file_dict : Dict
+        dictionary of the hapibd, ilash, and map files
+
+    file_dict : Dict
+        dictionary where the keys are tuples of the chromosome number and 
+        the identifier and the values are the list of .small.txt.gz files
+
+    output : str
+        the path to the directory to output files into
+
+    analysis_type : str
+        string of the analysis type. This will be either gene or phenotype
+
+    threads : int
+        number of cpu cores to be used during the computation
+
+    analysis_files : Dict
+        dictionary with the carrier_dir for the gene analysis or the 
+        pheno_gmap_df and the pheno_carrier_df for the phenotype analysis
+
+    cache_dir : str
+        directory of the segment cache. If this value is None then each 
+        worker parses the hapibd and ilash files of its chromosome and 
+        builds the pair index in memory. This value is None by default
+
+    memory_budget : float
+        number of gigabytes that can be used to combine the pairs. This 
+        value limits how many chromosomes are combined at the same time. 
+        This value is None by default
+
+    compress_allpair : bool
+        if True then the allpair files are written with gzip compression. 
+        This value is False by default
+    """
 
     # making sure the output directory exist
     output_dir: str = utility_scripts.check_dir(output, "pairs")
@@ -386,7 +717,7 @@ def combine_output(gathered_file_dict: Dict, file_dict: Dict, output: str, analy
     # this step will create a list that contains objects that have all the necessary files for each chromosome/identifier combo
 
     for chr_num, identifier in file_dict.keys():
-        combiner_info: Combine_Info = Combine_Info(chr_num, identifier, gathered_file_dict, analysis_type, file_dict[(chr_num, identifier)], output_dir, analysis_files)
+        combiner_info: Combine_Info = Combine_Info(chr_num, identifier, gathered_file_dict, analysis_type, file_dict[(chr_num, identifier)], output_dir, analysis_files, cache_dir, compress_allpair)
 
         # need to check the length of the combiner_info.
         # ibd_file_list and if it is zero then write that 
@@ -397,9 +728,7 @@ def combine_output(gathered_file_dict: Dict, file_dict: Dict, output: str, analy
 
         file_info_list.append(combiner_info)
 
-    utility_scripts.parallelize_test(run, threads, combined_info_list=file_info_list)
-
-    #TODO: Keep trying to parallelize this function
+    run_combine_parallel(file_info_list, threads, memory_budget)
 
 
 def run(combined_info_object: Combine_Info):
@@ -415,8 +744,10 @@ def run(combined_info_object: Combine_Info):
     chr_num: str = combined_info_object.chr_num
     output_dir: str = combined_info_object.output_dir
     analysis_type: str = combined_info_object.analysis_type
-    hapibd_df: pd.DataFrame = combined_info_object.get_ibd_df("hapibd_file_list")
-    ilash_df: pd.DataFrame = combined_info_object.get_ibd_df("ilash_file_list")
+    # using the pair index of each ibd file instead of loading the 
+    # whole file into a dataframe
+    hapibd_index: Pair_Index = combined_info_object.get_pair_index("hapibd_file_list")
+    ilash_index: Pair_Index = combined_info_object.get_pair_index("ilash_file_list")
     analysis_type_dict: Dict = combined_info_object.analysis_type_dict
 
     # Setting a max_number of pairs parameter ot use for comparision so that it only keeps one line
@@ -432,98 +763,37 @@ def run(combined_info_object: Combine_Info):
     # think about turning all of these into an object to group them together
     files = form_file_dict(file_list)
 
-    # creating dictionaries that will be used in the rest of the 
-    # code
-    curr_pair = {}
-    curr_pos = {}
-    curr_ibd = {}
-    newpos = {}
-    newline = {}
-    openfile = {}
-    endtest = {}
-    endline = {}
-
-    # read first line for all input files
-    line1: str = read_first_line(files, openfile, endline, curr_pos, curr_ibd, curr_pair, newpos, newline, endtest)
-
-    #TODO: keep working on changing this into smaller functions
-    allcomb = {}
-
-    # creating all the combinations based on the file dict
-    form_all_combinations(files, allcomb)
-
-
-    combtab = pd.DataFrame(0, columns=files.keys(), index=allcomb.keys())
-
-    for item in allcomb:
-        combtab.loc[item, allcomb[item]] = len(allcomb[item])
-
-    oldallpair = set([])
-
+    # merging the files from each program so that the pairs at each 
+    # position are kept up to date as the files are read
+    pair_merger: Pair_Stream_Merger = Pair_Stream_Merger(files)
 
     count: int = 0
-    
-    while sum(list(map(lambda f: endtest[f],
-                        endtest.keys()))) < len(endtest):
-        pos = min(newpos.values())
-        nowf = findkey(pos, newpos)
 
-        for f in nowf:
+    # information about the previous row so that the row string can be 
+    # formed if the max number of pairs is found
+    previous_row_chr: str = None
+    previous_row_bp: str = None
 
-            CHR = str(newline[f].split('\t')[0])
-            if newline[f].split('\t')[4] != 'NA':
-                addibd = set(newline[f].split('\t')[4].split(' '))
-            else:
-                addibd = set([])
-            if newline[f].split('\t')[5] != 'NA':
-                delibd = set(newline[f].split('\t')[5].split(' '))
-            else:
-                delibd = set([])
-            curr_ibd[f] = set(set(curr_ibd[f] | addibd) - delibd)
-            if len(curr_ibd[f]) > 0:
-                curr_pair[f] = set(
-                    map(lambda x: x.split(':')[1], curr_ibd[f]))
-            else:
-                curr_pair[f] = set([])
-            nextline = openfile[f].readline()
-            nextline = nextline.strip()
-            if nextline == '' and openfile[f].tell() == endline[f]:
-                endtest[f] = 1
-                newpos[f] = float('inf')
-            else:
-                #            nextline = nextline.strip()
-                newpos[f] = int(nextline.split('\t')[1])
-                newline[f] = nextline
+    for CHR, pos in pair_merger:
 
+        n_pairs: int = len(pair_merger)
         
-        newallpair: list = all_agree_pair(curr_pair)
-        
-        max_pairs_int: int = is_max_pairs_found(max_pairs, len(newallpair))
-
-        outpair: list = []
-
-        for pp in newallpair:
-            tool = []
-            for f in curr_pair.keys():
-                if pp in curr_pair[f]:
-                    tool.append(f)
-            outpair.append('{0}:{1}'.format(','.join(tool), pp))
-
-        if len(outpair) == 0:
-            outpair = ['NA']
+        max_pairs_int: int = is_max_pairs_found(max_pairs, n_pairs)
 
         if max_pairs_int == 1:
 
             # update the counter
             count += 1
 
-            # This will return a 0 if the max pairs == the len(newallpair) and a one if max_pairs is greater
+            # This will return a 0 if the max pairs == the n_pairs and a one if max_pairs is greater
             after_max_pair: int = after_max_pair_found(
-                max_pairs, len(newallpair))
+                max_pairs, n_pairs)
 
             if after_max_pair == 0 and count == 1:
 
-                max_pairs_str: str = previous_row_str
+                # the row string is only formed for the previous row when 
+                # it is needed
+                max_pairs_str: str = f"{previous_row_chr}\t{previous_row_bp}\tNA\t{max_pairs}\t{pair_merger.get_pair_str(previous=True)}\n"
 
                 # get the start base position which will be used later in the allpair path
                 start_bp: str = previous_row_bp
@@ -536,9 +806,15 @@ def run(combined_info_object: Combine_Info):
                 allagree_path = "".join(
                     [out, ".", start_bp, "-", end_bp, ".allpair.txt"])
 
-                # deleting the file if it is there from a previous run
+                # deleting the file if it is there from a previous run 
+                # in either format
                 utility_scripts.check_file(allagree_path)
 
+                utility_scripts.check_file("".join([allagree_path, ".gz"]))
+
+                if combined_info_object.compress_allpair:
+                    allagree_path = "".join([allagree_path, ".gz"])
+
                 # Entering into the get_max_pairs function
                 # TODO: Make a pairs object that can contain the information about the pair object such as the string of pairs, the identifier which is the variant_id or gene name, the chromosome number, the output_path, and the analysis type
                 pair_info_object = Pair_Info_Class(
@@ -557,9 +833,9 @@ def run(combined_info_object: Combine_Info):
                     pair_info_object.iid_list_handler(carrier_dir=combined_info_object.carrier_dir, pheno_carriers=None)
                 #
                 # Next line will actually generate a string with all the necesary information in it
-                pair_info_list: list = pair_info_object.generate_pairs_dict(hapibd_df, ilash_df, analysis_type_dict)
+                pairs_df: pd.DataFrame = pair_info_object.generate_pairs_df(hapibd_index, ilash_index, analysis_type_dict)
 
-                write_to_file(pair_info_object.output_path, pair_info_list)
+                write_allpair_file(pair_info_object.output_path, pairs_df)
 
                 break
 
@@ -569,9 +845,12 @@ def run(combined_info_object: Combine_Info):
             # Reseting the counter
             count = 0
 
-        max_pairs = len(newallpair)
+        max_pairs = n_pairs
+
         # keeping track of the previous row so that it can be used if necessary
-        previous_row_str: str = f"{str(CHR)}\t{str(pos)}\tNA\t{len(newallpair)}\t{' '.join(outpair)}\n"
+        previous_row_chr = str(CHR)
 
         # Also keeping track of the base position
-        previous_row_bp: str = str(pos)
+        previous_row_bp = str(pos)
+
+    pair_merger.close()
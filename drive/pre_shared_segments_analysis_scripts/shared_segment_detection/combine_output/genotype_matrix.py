@@ -0,0 +1,151 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# alleles that are one character long use their byte value as the code so
+# the codes for longer alleles start after these
+FIRST_LONG_ALLELE_CODE: int = 256
+
+class Genotype_Matrix:
+    """class that keeps the genotypes from a plink .ped and .map file as a
+    matrix of allele codes with two columns for each variant. The rows are
+    the samples in the order of the .ped file and the columns are the
+    variants in the order of the .map file"""
+
+    def __init__(self, iids: np.ndarray, variants: np.ndarray, allele_codes: np.ndarray, allele_dict: Dict[int, str]) -> None:
+        """
+        Parameters
+        __________
+        iids : np.ndarray
+            array of the iid of each sample
+
+        variants : np.ndarray
+            array of the variant id of each variant
+
+        allele_codes : np.ndarray
+            2-D array of the allele codes with a row for each sample and the
+            first and second allele of each variant in adjacent columns.
+            This array is uint8 unless there are alleles longer than one
+            character
+
+        allele_dict : Dict[int, str]
+            dictionary where the keys are the allele codes and the values
+            are the allele strings
+        """
+        self.iids: np.ndarray = iids
+        self.variants: np.ndarray = variants
+        self.allele_codes: np.ndarray = allele_codes
+        self.allele_dict: Dict[int, str] = allele_dict
+
+    @classmethod
+    def from_plink(cls, map_file_path: str, ped_file_path: str):
+        """Method to read the .map file once and the alleles of each row of
+        the .ped file into the matrix of allele codes
+        Parameters
+        __________
+        map_file_path : str
+            filepath to the .map file from plink
+
+        ped_file_path : str
+            filepath to the .ped file from plink
+
+        Returns
+        _______
+        Genotype_Matrix
+            returns the genotype matrix
+        """
+        variants: np.ndarray = pd.read_csv(map_file_path, sep="\t", header=None, usecols=[1], dtype=str)[1].to_numpy()
+
+        allele_count: int = 2 * len(variants)
+
+        # codes of alleles that are longer than one character
+        long_allele_dict: Dict[str, int] = {}
+
+        iid_list: List[str] = []
+
+        code_row_list: List[np.ndarray] = []
+
+        with open(ped_file_path, "r") as ped_file:
+
+            for row in ped_file:
+
+                # the first six columns are the family id, the iid, the
+                # parents, the sex, and the phenotype
+                row_values: list = row.rstrip("\n").split(" ", 6)
+
+                iid_list.append(row_values[1])
+
+                allele_str: str = row_values[6] if len(row_values) > 6 else ""
+
+                allele_bytes: np.ndarray = np.frombuffer(allele_str.encode("ascii"), dtype=np.uint8) if allele_str.isascii() else np.empty(0, dtype=np.uint8)
+
+                # if every allele is one character then the alleles are
+                # every other byte of the line
+                if len(allele_bytes) == 2 * allele_count - 1 and np.all(allele_bytes[1::2] == ord(" ")):
+
+                    code_row_list.append(allele_bytes[::2].astype(np.uint16))
+
+                else:
+                    code_row_list.append(np.array([cls.get_allele_code(allele, long_allele_dict) for allele in allele_str.split(" ")[:allele_count]], dtype=np.uint16))
+
+        allele_codes: np.ndarray = np.vstack(code_row_list) if code_row_list else np.empty((0, allele_count), dtype=np.uint16)
+
+        # the codes fit in a uint8 if every allele is one character long
+        if not long_allele_dict:
+            allele_codes = allele_codes.astype(np.uint8)
+
+        allele_dict: Dict[int, str] = {code: chr(code) for code in range(FIRST_LONG_ALLELE_CODE)}
+
+        allele_dict.update({code: allele for allele, code in long_allele_dict.items()})
+
+        return cls(np.array(iid_list, dtype=object), variants, allele_codes, allele_dict)
+
+    @staticmethod
+    def get_allele_code(allele: str, long_allele_dict: Dict[str, int]) -> int:
+        """Method to get the code of an allele from a row that has alleles
+        longer than one character
+        Parameters
+        __________
+        allele : str
+            string of the allele
+
+        long_allele_dict : Dict[str, int]
+            dictionary of the codes for the alleles that are longer than one
+            character. New alleles are added to this dictionary
+
+        Returns
+        _______
+        int
+            returns the code for the allele
+        """
+        if len(allele) == 1 and ord(allele) < FIRST_LONG_ALLELE_CODE:
+            return ord(allele)
+
+        return long_allele_dict.setdefault(allele, FIRST_LONG_ALLELE_CODE + len(long_allele_dict))
+
+    def get_genotypes(self, carrier_list: list, variant_id: str) -> list:
+        """Method to get the genotype strings of the carriers for a variant.
+        The genotypes are in the order of the .ped file
+        Parameters
+        __________
+        carrier_list : list
+            list of iids that are identified as carriers for the variant
+
+        variant_id : str
+            string that has the variant_id
+
+        Returns
+        _______
+        list
+            returns a list of the genotype strings such as AG
+        """
+        sample_rows: np.ndarray = np.flatnonzero(pd.Series(self.iids).isin(carrier_list).to_numpy())
+
+        variant_columns: np.ndarray = np.flatnonzero(self.variants == variant_id)
+
+        allele_1_codes: np.ndarray = self.allele_codes[np.ix_(sample_rows, 2 * variant_columns)].ravel()
+
+        allele_2_codes: np.ndarray = self.allele_codes[np.ix_(sample_rows, 2 * variant_columns + 1)].ravel()
+
+        return ["".join([self.allele_dict[allele_1], self.allele_dict[allele_2]]) for allele_1, allele_2 in zip(allele_1_codes.tolist(), allele_2_codes.tolist())]
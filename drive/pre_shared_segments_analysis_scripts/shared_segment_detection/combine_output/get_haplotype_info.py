@@ -1,5 +1,8 @@
+from typing import List, Union
+import numpy as np
 import pandas as pd
 from ..generate_indx_dict.generate_dict import Ilash_Indices, Hapibd_Indices
+from ..segment_cache.pair_index import Pair_Index
 
 # This script will pull out the necessary information from the ibd 
 # output such as start and end point, length, phase1, and phase2
@@ -10,7 +13,9 @@ class ibd_info_finder:
         Parameters
         __________
         ibd_df : pd.DataFrame
-            dataframe of the output from either ilash or hapibd
+            dataframe of the output from either ilash or hapibd. This can 
+            also be a Pair_Index of the ibd file so that only the segments 
+            for the pair are looked up
         
         pair_1 : str
             string of the first iid in the pair
@@ -49,8 +54,30 @@ class ibd_info_finder:
             information for the pair of interest
         """
 
-        # filtering the ibd file for just values that have the pair 1 or pair 2
-        filtered_df: pd.DataFrame = self.ibd_file[(self.ibd_file[self.indx_dict["id1_indx"]] == self.pair_1) & (self.ibd_file[self.indx_dict["id2_indx"]] == self.pair_2)]
+        # the pair index already returns the segments for the pair in 
+        # either order
+        if isinstance(self.ibd_file, Pair_Index):
+
+            filtered_df: pd.DataFrame = self.ibd_file.get_pair_segments(self.pair_1, self.pair_2)
+
+        else:
+            # filtering the ibd file for just values that have the pair 1 or pair 2
+            filtered_df: pd.DataFrame = self.ibd_file[(self.ibd_file[self.indx_dict["id1_indx"]] == self.pair_1) & (self.ibd_file[self.indx_dict["id2_indx"]] == self.pair_2)]
+
+            if filtered_df.empty:
+                
+                # switching the pairs if the dataframe is empty
+                filtered_df: pd.DataFrame = self.ibd_file[(self.ibd_file[self.indx_dict["id1_indx"]] == self.pair_2) & (self.ibd_file[self.indx_dict["id2_indx"]] == self.pair_1)]
+
+        # if it is still empty than it returns a null dictionary
+        if filtered_df.empty:
+            return {
+                "start": "N/A",
+                "end": "N/A",
+                "length": "N/A",
+                "phase1": "N/A",
+                "phase2": "N/A"
+            }
 
         # now need to filter to just the values that have are have 
         # the var_position within them if the phenotype analysis is 
@@ -59,20 +86,6 @@ class ibd_info_finder:
         # doing the non phenotype analysis first
         # makes sure the variant postion is within the gene
 
-        if filtered_df.empty:
-            
-            # switching the pairs if the dataframe is empty
-            filtered_df: pd.DataFrame = self.ibd_file[(self.ibd_file[self.indx_dict["id1_indx"]] == self.pair_2) & (self.ibd_file[self.indx_dict["id2_indx"]] == self.pair_1)]
-
-            # if it is still empty than it returns a null dictionary
-            if filtered_df.empty:
-                return {
-                    "start": "N/A",
-                    "end": "N/A",
-                    "length": "N/A",
-                    "phase1": "N/A",
-                    "phase2": "N/A"
-                }
         # if the var_position is provided then the function will 
         # filter for segments that have the variant within them
         if var_position:
@@ -158,4 +171,131 @@ class ilash_info_finder(ibd_info_finder):
         # getting the phasing for pair 2
         self.indx_dict["phase_2"] = 3
 
-        
+
+# dictionary of the info finder class for each ibd program
+INFO_FINDER_CLASSES: dict = {
+    "hapibd": hapibd_info_finder,
+    "ilash": ilash_info_finder
+}
+
+def get_pairs_len_info(ibd_index: Union[pd.DataFrame, Pair_Index], pair_1_list: List[str], pair_2_list: List[str], ibd_format: str, var_position: int=None, gene_start: int=None, gene_end: int = None) -> List[dict]:
+    """Function to get the shared segment information for every pair at 
+    once. The pairs are joined to the segments on the smaller and the 
+    larger iid of each pair instead of filtering the ibd file for each pair. 
+    The values match what get_len_info returns for each pair
+    Parameters
+    __________
+    ibd_index : Union[pd.DataFrame, Pair_Index]
+        Pair_Index of the output from either ilash or hapibd. This can also 
+        be a dataframe of the ibd file
+
+    pair_1_list : List[str]
+        list of the first iid in each pair
+
+    pair_2_list : List[str]
+        list of the second iid in each pair
+
+    ibd_format : str
+        string of the ibd program. This will be either hapibd or ilash
+
+    var_position : int
+        This is the base position of the variant of interest. This value is None 
+        by default
+
+    gene_start : int
+        This is the base position of where the gene of interest starts. This 
+        value is None by default.
+
+    gene_end : int
+        This is the base position of where the gene of interest ends. This value is None by default.
+
+    Returns
+    _______
+    List[dict]
+        returns a list with a dictionary for each pair that has the start, 
+        end, length, phase1, and phase2 information
+    """
+    # the pairs are not used to get the column indices
+    indx_dict: dict = INFO_FINDER_CLASSES[ibd_format](ibd_index, None, None, ibd_format).indx_dict
+
+    # only the segments for these pairs are needed from the pair index
+    if isinstance(ibd_index, Pair_Index):
+        segments_df: pd.DataFrame = ibd_index.get_pairs_segments(pair_1_list, pair_2_list)
+    else:
+        segments_df: pd.DataFrame = ibd_index
+
+    segments_df = pd.DataFrame({
+        "id1": segments_df[indx_dict["id1_indx"]].astype(str).to_numpy(),
+        "id2": segments_df[indx_dict["id2_indx"]].astype(str).to_numpy(),
+        "phase1": segments_df[indx_dict["phase_1"]].to_numpy(),
+        "phase2": segments_df[indx_dict["phase_2"]].to_numpy(),
+        "start": segments_df[indx_dict["str_indx"]].to_numpy(),
+        "end": segments_df[indx_dict["end_indx"]].to_numpy(),
+        "length": segments_df[indx_dict["cM_indx"]].to_numpy(),
+        # keeping the file order so that the first segment is used 
+        # like in get_len_info
+        "segment_order": np.arange(len(segments_df))
+    })
+
+    pairs_df: pd.DataFrame = pd.DataFrame({
+        "pair_1": pd.Series(pair_1_list, dtype=object),
+        "pair_2": pd.Series(pair_2_list, dtype=object),
+        "pair_order": np.arange(len(pair_1_list))
+    })
+
+    # normalizing the order of the iids so that both orders of a pair are 
+    # joined with one merge
+    for df, id_1, id_2 in [(pairs_df, "pair_1", "pair_2"), (segments_df, "id1", "id2")]:
+        in_order: pd.Series = df[id_1] <= df[id_2]
+
+        df["low_id"] = np.where(in_order, df[id_1], df[id_2])
+        df["high_id"] = np.where(in_order, df[id_2], df[id_1])
+
+    merged_df: pd.DataFrame = pairs_df.merge(segments_df, on=["low_id", "high_id"], how="inner")
+
+    # get_len_info only uses the switched order of the pair if there are 
+    # no segments where pair_1 is id1 and pair_2 is id2. This choice is 
+    # made before the segments are filtered by position
+    merged_df["switched"] = (merged_df["id1"] != merged_df["pair_1"]).astype(int)
+
+    merged_df = merged_df[merged_df["switched"] == merged_df.groupby("pair_order")["switched"].transform("min")]
+
+    # filtering for segments that have the variant within them or that 
+    # overlap the gene
+    if var_position:
+        merged_df = merged_df[(merged_df["start"] <= var_position) & (merged_df["end"] >= var_position)]
+    else:
+        start: pd.Series = merged_df["start"].astype(int)
+        end: pd.Series = merged_df["end"].astype(int)
+
+        merged_df = merged_df[((end <= int(gene_end)) & (end >= int(gene_start))) | ((start >= int(gene_start)) & (start <= int(gene_end))) | ((start <= int(gene_start)) & (end >= int(gene_end)))]
+
+    # keeping the first segment in file order for each pair
+    merged_df = merged_df.sort_values(["pair_order", "segment_order"], kind="mergesort").drop_duplicates("pair_order", keep="first")
+
+    pairs_info_list: List[dict] = [
+        {
+            "start": "N/A",
+            "end": "N/A",
+            "length": "N/A",
+            "phase1": "N/A",
+            "phase2": "N/A"
+        } for _ in range(len(pair_1_list))
+    ]
+
+    for pair_order, phase_1, phase_2, start, end, length in zip(*[merged_df[column].tolist() for column in ["pair_order", "phase1", "phase2", "start", "end", "length"]]):
+
+        # For ilash the phase is at the end of the string
+        if len(str(phase_1)) != 1:
+            phase_1 = phase_1[-1]
+            phase_2 = phase_2[-1]
+
+        pairs_info_list[pair_order] = {
+            "start": start,
+            "end": end,
+            "length": length,
+            "phase1": phase_1,
+            "phase2": phase_2
+        }
+
+    return pairs_info_list
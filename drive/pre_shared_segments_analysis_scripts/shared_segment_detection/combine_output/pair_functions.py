@@ -1,8 +1,13 @@
+from typing import Dict, Union
 import pandas as pd
 import utility_scripts
-from .get_haplotype_info import hapibd_info_finder, ilash_info_finder
+from .get_haplotype_info import get_pairs_len_info
+from ..segment_cache.pair_index import Pair_Index
 # This script keeps some of the functions that are used for determining if pairs are found
 
+# columns of the allpair.txt files
+ALLPAIR_COLUMNS: list = ["IBD_programs", "pair_1", "pair_2", "chr", "variant_id", "gene_name", "carrier_status", "potential_missed_carrier", "connected_carriers", "hapibd_phase1", "hapibd_phase2", "ilash_phase1", "ilash_phase2", "hapibd_start", "hapibd_end", "hapibd_len", "ilash_start", "ilash_end", "ilash_len"]
+
 def is_max_pairs_found(curr_max_pairs: int, new_max_pairs: int) -> int:
     """Function to determine if the max number of pairs was found.
     It checks to see if the max pair from the previous row is largeer or not
@@ -174,6 +179,24 @@ class Pair_Info_Class:
 
         self.iid_list: list = iid_list
     
+    def build_adjacency_dict(self):
+        """Function to build a dictionary of the iids that each iid shares a 
+        segment with and the set of carriers. These are built once for the 
+        allpair file and assigned to the attributes adjacency_dict and 
+        carrier_set
+        """
+        self.carrier_set: set = set(self.iid_list)
+
+        self.adjacency_dict: Dict[str, set] = {}
+
+        for pair in self.pair_list:
+
+            pair_1, pair_2 = pair.split(":")[1].strip("\n").split("-")
+
+            self.adjacency_dict.setdefault(pair_1, set()).add(pair_2)
+
+            self.adjacency_dict.setdefault(pair_2, set()).add(pair_1)
+
     def check_for_missed_carriers(self, pair_object: Pairs) -> int:
         """This function will check for variants that may be missed carriers, meaning that pair 2 may be connected to other carriers
 
@@ -189,25 +212,9 @@ class Pair_Info_Class:
         int
             returns an integer that is the number of carriers that the pair 2 is connected to 
         """
-        # get a list of all strings that contain the pair2 value
-        pair2_in_str: list = [string for string in self.pair_list if pair_object.pair2 in string]
-
-        # getting a list of connected carriers that can be summed at the end
-        connected_carriers_list: list = []
-
-        # iterating through each pair
-        for pair in pair2_in_str:
-
-            pair_iids: list = pair.split(":")[1]
-
-            pair_1, pair_2 = pair_iids.split("-")
-
-            # checking if the pair_1 and pair_2 are a carrier
-            if pair_1 in self.iid_list or pair_2 in self.iid_list:
-
-                connected_carriers_list.append(pair)
-
-        return int(len(connected_carriers_list))
+        # the iids are matched exactly so that an iid like R1 is not 
+        # matched to R10
+        return len(self.adjacency_dict.get(pair_object.pair2, set()) & self.carrier_set)
 
     def set_missed_carrier_status_null(self, pairs_dict: dict, pairs_object: Pairs):
         """Function to provide values to the dictionary when the pair2 is a confirmed carrier and then the connected carriers value doesn't matter
@@ -252,40 +259,49 @@ class Pair_Info_Class:
         else:
             pairs_dict[(pairs_object.pair1, pairs_object.pair2)]["missed_carrier"] = 0
         
-    def generate_pairs_dict(self, hapibd_file: pd.DataFrame, ilash_file: pd.DataFrame, analysis_type_info: dict) -> str:
-        """Function that generates a dictionary of all the pairs and information
+    def generate_pairs_df(self, hapibd_index: Union[pd.DataFrame, Pair_Index], ilash_index: Union[pd.DataFrame, Pair_Index], analysis_type_info: dict) -> pd.DataFrame:
+        """Function that generates a dataframe of all the pairs and information
         
         Parameters
         __________
-        hapibd_file : pd.DataFrame
-            dataframe of the hapibd output file for the specific chromosome
+        hapibd_index : Union[pd.DataFrame, Pair_Index]
+            pair index of the hapibd output file for the specific chromosome. 
+            This can also be a dataframe of the file
         
-        ilash_file : pd.DataFrame
-            dataframe of the ilash output file for the specific chromosome
+        ilash_index : Union[pd.DataFrame, Pair_Index]
+            pair index of the ilash output file for the specific chromosome. 
+            This can also be a dataframe of the file
         
         analysis_type_info : dict
             dictionary containing the analysis type, the variant position or the gene start and end. These will be under these respective keys
 
         Returns
         _______
-        list 
-            returns a list that has information about the for each 
-            pair as the values"""
+        pd.DataFrame 
+            returns a dataframe with the ALLPAIR_COLUMNS that has a row 
+            of information for each pair"""
         # creating an empty dictionary to put the pairs into
         pairs_dict: dict = {}
 
-        pairs_list: list = []
+        pair_object_list: list = []
+
+        # the iids connected to each iid are only found once for the 
+        # allpair file
+        self.build_adjacency_dict()
+
         # iterating through each pair in the pair list
         for pair in self.pair_list:
             
             # creating an Pairs object that has each pair string
             pair_object: Pairs = Pairs(pair)
 
+            pair_object_list.append(pair_object)
+
             # updating the pairs_dict so that there is a key for this pair
             pairs_dict[(pair_object.pair1, pair_object.pair2)] = {}
 
             # check if the second pair is in the carrier iid list
-            if pair_object.pair2 in self.iid_list:
+            if pair_object.pair2 in self.carrier_set:
 
                 # if the pair is a carrier than the carrier status will be set to 1
                 pairs_dict[(pair_object.pair1, pair_object.pair2)]["carrier_status"] = 1
@@ -303,34 +319,54 @@ class Pair_Info_Class:
                 # assigning values for the missed carriers
                 self.set_missed_carrier_status(pairs_dict, connected_carriers, pair_object)
 
-            # need to get the information from hapibd and ilash about the segment length
-            hapibd_info_object: hapibd_info_finder = hapibd_info_finder(hapibd_file, pair_object.pair1, pair_object.pair2, "hapibd")
+        pair_1_list: list = [pair_object.pair1 for pair_object in pair_object_list]
+        pair_2_list: list = [pair_object.pair2 for pair_object in pair_object_list]
 
-            ilash_info_object: ilash_info_finder = ilash_info_finder(ilash_file, pair_object.pair1, pair_object.pair2, "ilash")
-            
-            
-            # if the analysis type is phenotype then have to use the 
-            # gene start and end
-            if analysis_type_info["analysis_type"] == "phenotype":
-                
-                hapibd_info_dict: dict = hapibd_info_object.get_len_info(gene_start=analysis_type_info["gene_start"], gene_end=analysis_type_info["gene_end"])
-
-                ilash_info_dict: dict = ilash_info_object.get_len_info(gene_start=analysis_type_info["gene_start"], gene_end=analysis_type_info["gene_end"])
-
-                # creating the pair_str when the phenotype analysis is selected
-                pair_str:str = f"{pair_object.program}\t{pair_object.pair1}\t{pair_object.pair2}\t{self.chromo_num.strip('.')[3:]}\t{'N/A'}\t{self.identifier}\t{pairs_dict[(pair_object.pair1, pair_object.pair2)]['carrier_status']}\t{str(pairs_dict[(pair_object.pair1, pair_object.pair2)]['missed_carrier'])}\t{str(pairs_dict[(pair_object.pair1, pair_object.pair2)]['connected_carriers'])}\t{hapibd_info_dict['phase1']}\t{hapibd_info_dict['phase2']}\t{ilash_info_dict['phase1']}\t{ilash_info_dict['phase2']}\t{hapibd_info_dict['start']}\t{hapibd_info_dict['end']}\t{hapibd_info_dict['length']}\t{ilash_info_dict['start']}\t{ilash_info_dict['end']}\t{ilash_info_dict['length']}\n"
-            # if it is not phenotype then you have to use the 
-            # variant position
-            else:
-                hapibd_info_dict: dict = hapibd_info_object.get_len_info(var_position=analysis_type_info["variant_pos"])
+        # getting the information from hapibd and ilash about the segment 
+        # for every pair with one join per program. If the analysis type 
+        # is phenotype then the gene start and end are used otherwise the 
+        # variant position is used
+        if analysis_type_info["analysis_type"] == "phenotype":
 
-                ilash_info_dict: dict = ilash_info_object.get_len_info(var_position=analysis_type_info["variant_pos"])
-            
-                # writing the pair string when the phenotype analysis is not used
-                pair_str: str = f"{pair_object.program}\t{pair_object.pair1}\t{pair_object.pair2}\t{self.chromo_num.strip('.')[3:]}\t{self.identifier}\t{'N/A'}\t{pairs_dict[(pair_object.pair1, pair_object.pair2)]['carrier_status']}\t{str(pairs_dict[(pair_object.pair1, pair_object.pair2)]['missed_carrier'])}\t{str(pairs_dict[(pair_object.pair1, pair_object.pair2)]['connected_carriers'])}\t{hapibd_info_dict['phase1']}\t{hapibd_info_dict['phase2']}\t{ilash_info_dict['phase1']}\t{ilash_info_dict['phase2']}\t{hapibd_info_dict['start']}\t{hapibd_info_dict['end']}\t{hapibd_info_dict['length']}\t{ilash_info_dict['start']}\t{ilash_info_dict['end']}\t{ilash_info_dict['length']}\n"
-            
-            pairs_list.append(pair_str)
+            position_kwargs: dict = {"gene_start": analysis_type_info["gene_start"], "gene_end": analysis_type_info["gene_end"]}
 
-        return pairs_list
+        else:
+            position_kwargs: dict = {"var_position": analysis_type_info["variant_pos"]}
+
+        hapibd_info_list: list = get_pairs_len_info(hapibd_index, pair_1_list, pair_2_list, "hapibd", **position_kwargs)
+
+        ilash_info_list: list = get_pairs_len_info(ilash_index, pair_1_list, pair_2_list, "ilash", **position_kwargs)
+
+        # the variant id and the gene name columns depend on the analysis type
+        if analysis_type_info["analysis_type"] == "phenotype":
+            variant_id, gene_name = "N/A", self.identifier
+        else:
+            variant_id, gene_name = self.identifier, "N/A"
+
+        pair_status_list: list = [pairs_dict[(pair_object.pair1, pair_object.pair2)] for pair_object in pair_object_list]
+
+        # forming each column of the allpair file at once instead of 
+        # formatting a string for each row
+        pairs_df: pd.DataFrame = pd.DataFrame({
+            "IBD_programs": [pair_object.program for pair_object in pair_object_list],
+            "pair_1": pair_1_list,
+            "pair_2": pair_2_list,
+            "chr": self.chromo_num.strip('.')[3:],
+            "variant_id": variant_id,
+            "gene_name": gene_name,
+            "carrier_status": [pair_status["carrier_status"] for pair_status in pair_status_list],
+            "potential_missed_carrier": [pair_status["missed_carrier"] for pair_status in pair_status_list],
+            "connected_carriers": [pair_status["connected_carriers"] for pair_status in pair_status_list]
+        }, columns=ALLPAIR_COLUMNS)
+
+        for ibd_program, info_list in [("hapibd", hapibd_info_list), ("ilash", ilash_info_list)]:
+
+            for info_key in ["phase1", "phase2"]:
+                pairs_df["_".join([ibd_program, info_key])] = [info_dict[info_key] for info_dict in info_list]
+
+        for ibd_program, info_list in [("hapibd", hapibd_info_list), ("ilash", ilash_info_list)]:
 
+            for info_key, column_suffix in [("start", "start"), ("end", "end"), ("length", "len")]:
+                pairs_df["_".join([ibd_program, column_suffix])] = [info_dict[info_key] for info_dict in info_list]
 
+        return pairs_df
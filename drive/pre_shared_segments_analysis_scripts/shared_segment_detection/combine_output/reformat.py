@@ -2,6 +2,8 @@
 import utility_scripts
 import pandas as pd
 import os
+from typing import Dict, Tuple
+from .genotype_matrix import Genotype_Matrix
 
 # Next three classes will be involved in reformatting the information in the allpair.
 # txt file to the expected format in the confirmed_carriers.txt files
@@ -68,7 +70,7 @@ class Base_Reformatter:
         # [r"chr\d_", r"chr\d\d_"] pattern for the gene analysis
 
         return utility_scripts.match_chr(pattern_list, file)
-    
+
     @staticmethod
     def get_confirmed_carriers(allpair_file: str, carrier_list: list) -> list:
         """Function to get the list of confirmed carriers from the allpairs.txt file
@@ -124,6 +126,26 @@ class Base_Reformatter:
         else:
             return 0
 
+    @staticmethod
+    def get_confirmed_status_list(iid_list: list, confirmed_carriers: list) -> list:
+        """Function to get the confirmed status of every iid at once using a set 
+        of the confirmed carriers
+        Parameters
+        __________
+        iid_list : list
+            list of the iids that were identified as carriers
+
+        confirmed_carriers : list
+            list of iids that were confirmed by the combined_ibd_pairs script
+
+        Returns
+        _______
+        list
+            returns a list of 1 or 0 for each iid depending on whether the iid 
+            is a confirmed carrier or not
+        """
+        return pd.Series(iid_list, dtype=object).isin(set(confirmed_carriers)).astype(int).tolist()
+
 class Gene_Reformatter(Base_Reformatter):
 
     def __init__(self,carrier_file_dir: str, allpair_file_dir: str, plink_file_dir:str, no_carrier_file: str, output_path: str) -> None:
@@ -152,68 +174,25 @@ class Gene_Reformatter(Base_Reformatter):
         super(Gene_Reformatter, self).__init__(output_path)
     
     @staticmethod
-    def form_genotype_df(map_file_path: str, ped_file_path: str) -> pd.DataFrame:
-        """ This function will form a dictionary of dictionaries where the outer key is the iid,
-        the inner key is the variant and the inner value is the genotype string """
-
-        # form three list for the iid, the variant, and the genotype string
-        iid_list: list = []
-        variant_list: list = []
-        geno_list: list = []
-
-        # opening the ped file
-        with open(ped_file_path, "r") as ped_file:
-
-            # iterating through row
-            for row in ped_file:
-
-                # split row
-                row: list = row.split(" ")
-
-                # getting only the genotype portion of the row
-
-                geno_row: list = row[6:]
-
-                # getting the iid
-                iid: str = row[1]
-
-                # using enumerate to iterate through each row of the file and get the index of the row
-                with open(map_file_path, "r") as map_file:
-
-                    for index, map_row in enumerate(map_file):
-
-                        map_row: list = map_row.split("\t")
-
-                        # getting the variant id
-                        variant_id: str = map_row[1]
-
-                        # getting the genotype index positions
-                        start_indx: int = index * 2
-
-                        second_indx: int = start_indx + 1
-
-                        # getting the genotypes from the geno_row
-                        allele_1: str = geno_row[start_indx]
-
-                        allele_2: str = geno_row[second_indx]
-
-                        # appending to all the list
-                        iid_list.append(iid)
-
-                        variant_list.append(variant_id)
-
-                        geno_list.append("".join([allele_1, allele_2]).strip("\n"))
+    def form_genotype_matrix(map_file_path: str, ped_file_path: str) -> Genotype_Matrix:
+        """ This function will read the map file once and the ped file into a matrix 
+        of allele codes where the rows are the iids and there are two columns for 
+        each variant
+        Parameters
+        __________
+        map_file_path : str
+            filepath to the map file from plink
 
-        # inserting values into the genotyped dict
-        genotype_dict = {
-            "IID": iid_list,
-            "Variant": variant_list,
-            "Genotype": geno_list
-        }
+        ped_file_path : str
+            filepath to the ped file from plink
 
-        genotype_df = pd.DataFrame.from_dict(genotype_dict)
+        Returns
+        _______
+        Genotype_Matrix
+            returns the genotype matrix for the chromosome
+        """
+        return Genotype_Matrix.from_plink(map_file_path, ped_file_path)
 
-        return genotype_df
     @staticmethod
     def check_no_carrier(no_carrier_file: str, variant_id: str) -> int:
         """function that will check if the variant_id has no carriers"""
@@ -277,7 +256,7 @@ class Gene_Reformatter(Base_Reformatter):
 
         ped_files_list: list = utility_scripts.get_file_list(self.plink_files, "*.ped")
 
-        allpair_files_list: list = utility_scripts.get_file_list(self.allpair_files, "*allpair.txt")
+        allpair_files_list: list = utility_scripts.get_file_list(self.allpair_files, "*allpair.txt*")
 
         # returning the output as a dictionary
         self.file_dict: dict = {
@@ -288,13 +267,13 @@ class Gene_Reformatter(Base_Reformatter):
             }
 
     @staticmethod
-    def get_genotype_list(geno_df: pd.DataFrame, carrier_list: list,
+    def get_genotype_list(genotype_matrix: Genotype_Matrix, carrier_list: list,
                     variant_id: str) -> list:
         """This function will get the genotypes out for each variant
         Parameters
         __________
-        geno_df : pd.DataFrame
-            dataframe that has all of the genotypes for each iid and each variant
+        genotype_matrix : Genotype_Matrix
+            matrix that has all of the genotypes for each iid and each variant
         
         carrier_list : list
             list of iids that are identified as carriers for the variant 
@@ -307,12 +286,8 @@ class Gene_Reformatter(Base_Reformatter):
         list
             returns a list of genotypes"""
 
-        # subsetting the dataframe to only the list of identified carriers
-        geno_df_subset: pd.DataFrame = geno_df[geno_df["IID"].isin(carrier_list)]
-
-        geno_list = geno_df_subset[geno_df_subset.Variant == variant_id]["Genotype"].values.tolist()
-
-        return geno_list
+        # indexing the rows of the carriers and the columns of the variant
+        return genotype_matrix.get_genotypes(carrier_list, variant_id)
 
     def reformat(self):
         """Function that will write the information from the allpairs.txt file about 
@@ -331,6 +306,9 @@ class Gene_Reformatter(Base_Reformatter):
         # gathering all the files into a dictionary
         self.get_files()
 
+        # finding the allpair file for each chromosome and variant once
+        allpair_file_dict: Dict[Tuple[str, str], str] = utility_scripts.get_allpair_file_dict(self.allpair_files)
+
         # Iterating through the ped files
         for file in self.file_dict["ped_files"]:
 
@@ -342,7 +320,7 @@ class Gene_Reformatter(Base_Reformatter):
             
             map_file: str = Base_Reformatter.get_file(self.file_dict["map_files"], chr_num)
 
-            genotype_df: pd.DataFrame = self.form_genotype_df(map_file, file)
+            genotype_matrix: Genotype_Matrix = self.form_genotype_matrix(map_file, file)
 
             # getting the correct carrier file based off of the chromosome
             car_file: str = Base_Reformatter.get_file(self.file_dict["carrier_files"], chr_num)
@@ -350,26 +328,18 @@ class Gene_Reformatter(Base_Reformatter):
             # load the car_file into a dataframe
             car_df: pd.DataFrame = pd.read_csv(car_file, sep=",")
 
-            # getting a list of all the unique variants in the dataframe
-            variant_list: list = list(set(car_df["Variant ID"].values.tolist()))
-
             # Iterating through each variant and then getting a list of carriers
-            # for each variant
-            for variant in variant_list:
+            # for each variant from one grouping of the carrier dataframe
+            for variant, variant_df in car_df.groupby("Variant ID", sort=False):
                 
                 # getting a list of carriers from the carrier_df for the specific variant
-                iid_list: list = car_df[car_df["Variant ID"] == variant ]["IID"].values.tolist()
-
-                # using list comprehension to get the allpair file for a specific chromosome and variant
+                iid_list: list = variant_df["IID"].values.tolist()
 
                 # There is an error if it does not find an allpair_file. Some of these files don't exist because there are no carriers
                 try:
-                    allpair_file: str = [
-                        file for file in self.file_dict["allpair_files"]
-                        if "".join([chr_num, "."]) in file and variant in file
-                    ][0]
+                    allpair_file: str = allpair_file_dict[(utility_scripts.fix_chr(chr_num), variant)]
 
-                except IndexError:
+                except KeyError:
 
                     # returns either a 1 or 0 if the variant is in the no_carrier_file.txt list
                     carrier_int: int = self.check_no_carrier(self.no_carrier_file, variant)
@@ -400,14 +370,14 @@ class Gene_Reformatter(Base_Reformatter):
                 # need to get the genotype for each carrier_list
 
                 # This will subset the dataframe for the carriers
-                genotype_list: list = self.get_genotype_list(genotype_df,
+                genotype_list: list = self.get_genotype_list(genotype_matrix,
                                     iid_list, variant[:-2])
                 
                 output_dict["IID"].extend(iid_list)
                 output_dict["variant_id"].extend([variant]*len(iid_list))
                 output_dict["gene_name"].extend(["N/A"]*len(iid_list))
                 output_dict["genotype"].extend(genotype_list)
-                output_dict["confirmed_status"].extend([Base_Reformatter.get_confirmed_status(iid, confirmed_carrier_list) for iid in iid_list])
+                output_dict["confirmed_status"].extend(Base_Reformatter.get_confirmed_status_list(iid_list, confirmed_carrier_list))
                 output_dict["chr"].extend([chr_num.strip(".")[-2:]]*len(iid_list))
 
         output_df: pd.DataFrame = pd.DataFrame.from_dict(output_dict)
@@ -483,36 +453,31 @@ class Pheno_Reformatter(Base_Reformatter):
                 "chr":[]
             }
 
+        # finding the allpair file for each gene once instead of for 
+        # every gene
+        allpair_file_dict: Dict[str, Tuple[str, str]] = {identifier: (chr_num, allpair_file) for (chr_num, identifier), allpair_file in utility_scripts.get_allpair_file_dict(self.allpair_files).items()}
+
+        # grouping the carriers by gene once
+        gene_carrier_dict: dict = {gene: gene_df.IID.values.tolist() for gene, gene_df in self.pheno_carrier.groupby("gene", sort=False)}
+
         for gene in gene_list:
 
             # getting the list of supposed carriers for that gene
-            iid_list: list = self.get_iids(gene)
-
-            # get the allpair files from allpair file directory
-            allpair_file_list: list = utility_scripts.get_file_list(self.allpair_files, "*allpair.txt")
+            iid_list: list = gene_carrier_dict.get(gene, [])
 
-            # getting the allpair.txt file
-            allpair_file: str = Base_Reformatter.get_file(allpair_file_list, gene)
+            # getting the allpair.txt file and the chromosome number
+            chr_num, allpair_file = allpair_file_dict[gene]
 
             # getting a list carriers which means that the iid is paired with
             # another iid that is in the iid_list
             confirmed_carriers: list = Base_Reformatter.get_confirmed_carriers(allpair_file, iid_list)
-            
-            chr_num: str = self.get_chr_num([r'chr\d\d.', r'chr\d.'], allpair_file)
-
-            if len(chr_num.strip(".")) == 4:
-
-                chr_num = "".join([chr_num[:3], "0", chr_num[-1]])
-            
-
-
 
             output_dict["IID"].extend(iid_list)
             output_dict["variant_id"].extend(["N/A"]*len(iid_list))
             output_dict["gene_name"].extend([gene]*len(iid_list))
             output_dict["genotype"].extend(["N/A"]*len(iid_list))
-            output_dict["confirmed_status"].extend([Base_Reformatter.get_confirmed_status(iid, confirmed_carriers) for iid in iid_list])
-            output_dict["chr"].extend([chr_num.strip(".")[-2:]]*len(iid_list))
+            output_dict["confirmed_status"].extend(Base_Reformatter.get_confirmed_status_list(iid_list, confirmed_carriers))
+            output_dict["chr"].extend([chr_num[-2:]]*len(iid_list))
             
         # converting the dictionary to a dataframe
         confirmed_carrier_df: pd.DataFrame = pd.DataFrame.from_dict(output_dict)
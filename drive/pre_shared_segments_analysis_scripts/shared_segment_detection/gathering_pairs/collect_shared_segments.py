@@ -7,16 +7,25 @@ import glob
 import os
 import utility_scripts
 import pandas as pd
+import numpy as np
 from dataclasses import dataclass
 import shutil
 from typing import Union
 
 from ..generate_indx_dict.generate_dict import Germline_Indices, Ilash_Indices, Hapibd_Indices
-from .filtering_functions import filter_to_greater_than_3_cm, filter_to_individual_in_uniqID, filter_for_correct_base_pair, filter_for_gene_site
+from .filtering_functions import filter_for_correct_base_pair, filter_for_gene_site
+from ..segment_cache.segment_cache import Segment_Cache
+from ..segment_cache.iid_encoder import IID_Encoder
+from ..segment_cache.interval_index import Interval_Index
 
 
 ####################################################################################################
 
+# number of rows that are parsed at a time when the segment file is streamed. 
+# Rows that are filtered out are dropped after each chunk so a smaller chunk 
+# keeps the memory of each worker low
+STREAM_CHUNK_SIZE: int = 200000
+
 
 class newPOS:
     __slots__ = 'add', 'rem'
@@ -184,6 +193,273 @@ def build_ibddata_and_ibddict(row: pd.Series, start_indx: int, end_indx: int, ch
 
     return CHR
 
+def get_pair_strings(chunk: pd.DataFrame, id1_indx: int, id2_indx: int, cM_indx: int, uniqID: dict) -> pd.Series:
+    """Function to get the pair string for every row in the chunk at once. This is 
+    the columnar version of the get_pair_string function
+    Parameters
+    __________
+    chunk : pd.DataFrame
+        dataframe chunk from the ibd file
+
+    id1_indx : int
+        this is the index to the column that has the pair1 id information
+    
+    id2_indx : int
+        this is the index to the column that has the pair2 id information
+    
+    cM_indx : int
+        this is the index to the column that has the total length of the ibd segment in centimorgans
+
+    uniqID : dict 
+        this is the dictionary were each key is the iids that carry the specific variant 
+
+    Returns
+    _______
+    pd.Series
+        returns a series of the pair strings with the same index as the chunk
+    """
+    id1: pd.Series = chunk[id1_indx].astype(str)
+    id2: pd.Series = chunk[id2_indx].astype(str)
+
+    # getting the rank of each id in the uniqID dictionary. Ids that 
+    # are not carriers will be NaN
+    rank1: pd.Series = chunk[id1_indx].map(uniqID)
+    rank2: pd.Series = chunk[id2_indx].map(uniqID)
+
+    # id1 goes first if it is the only carrier or if both ids are 
+    # carriers and id1 has the lower rank. Otherwise id2 goes first
+    id1_first: np.ndarray = (rank1.notna() & (rank2.isna() | (rank1 < rank2))).values
+
+    first_id: pd.Series = pd.Series(np.where(id1_first, id1.values, id2.values), index=chunk.index)
+    second_id: pd.Series = pd.Series(np.where(id1_first, id2.values, id1.values), index=chunk.index)
+
+    return chunk[cM_indx].astype(str) + ":" + first_id + "-" + second_id
+
+def group_pairs_by_position(positions: np.ndarray, pair_strings: np.ndarray) -> zip:
+    """Function to group the pair strings by their breakpoint while keeping the 
+    original row order within each breakpoint
+    Parameters
+    __________
+    positions : np.ndarray
+        array of the start or end positions for each row
+
+    pair_strings : np.ndarray
+        array of the pair strings for each row
+
+    Returns
+    _______
+    zip
+        returns a zip of each unique position and the list of pair strings at 
+        that position
+    """
+    # a stable sort keeps the row order for pairs at the same position
+    order: np.ndarray = np.argsort(positions, kind="stable")
+
+    sorted_positions: np.ndarray = positions[order]
+
+    sorted_pairs: list = pair_strings[order].tolist()
+
+    unique_positions, first_indx = np.unique(sorted_positions, return_index=True)
+
+    # getting the slice boundaries for each position
+    boundaries: list = first_indx.tolist() + [len(sorted_pairs)]
+
+    return zip(unique_positions.tolist(), (sorted_pairs[boundaries[i]:boundaries[i+1]] for i in range(len(unique_positions))))
+
+def add_breakpoints(chunk: pd.DataFrame, pair_strings: pd.Series, start_indx: int, end_indx: int, chr_indx: int, IBDdata: dict, IBDindex: dict) -> str:
+    """Function that will add the start and end breakpoints of every row in the chunk. 
+    This is the columnar version of build_ibddata_and_ibddict. The keys of IBDdata are 
+    used to check if a breakpoint was already identified
+    Parameters
+    __________
+    chunk : pd.DataFrame
+        dataframe chunk from the ibd file
+
+    pair_strings : pd.Series
+        series of the pair strings for each row in the chunk
+
+    start_indx : int
+        index of the column with the segment start position
+
+    end_indx : int
+        index of the column with the segment end position
+
+    chr_indx : int
+        index of the column with the chromosome number
+
+    IBDdata : dict
+        dictionary where the keys are the chromosome and the values are 
+        dictionaries of the breakpoints and the newPOS object at that breakpoint
+
+    IBDindex : dict
+        dictionary where the keys are the chromosome and the values are 
+        dictionaries that keep track of all the breakpoints in 'allpos'
+
+    Returns
+    _______
+    str
+        returns the chromosome number of the chunk
+    """
+    CHR: str = str(chunk[chr_indx].iloc[0])
+
+    chr_data: dict = IBDdata[CHR]
+
+    allpos: list = IBDindex[CHR]['allpos']
+
+    pair_array: np.ndarray = pair_strings.values
+
+    # adding the pairs to the add list at the start of the segment
+    for pos, pair_list in group_pairs_by_position(chunk[start_indx].values.astype(np.int64), pair_array):
+
+        if str(pos) in chr_data:
+            chr_data[str(pos)].add.extend(pair_list)
+        else:
+            chr_data[str(pos)] = newPOS(pair_list, [])
+            allpos.append(pos)
+
+    # adding the pairs to the rem list at the end of the segment
+    for pos, pair_list in group_pairs_by_position(chunk[end_indx].values.astype(np.int64), pair_array):
+
+        if str(pos) in chr_data:
+            chr_data[str(pos)].rem.extend(pair_list)
+        else:
+            chr_data[str(pos)] = newPOS([], pair_list)
+            allpos.append(pos)
+
+    return CHR
+
+def add_chunk_to_ibd_arrays(chunk: pd.DataFrame, IBDdata: dict, IBDindex: dict, parameter_dict: dict, uniqID: dict) -> str:
+    """Function to add the breakpoints of every row in a filtered chunk to the IBDdata and IBDindex dictionaries
+    Parameters
+    __________
+    chunk : pd.DataFrame
+        dataframe chunk from the ibd file that has already been filtered 
+        for carriers, the minimum centimorgan threshold, and the variant 
+        position or gene site
+
+    IBDdata : dict
+        dictionary where the keys are the chromosome and the values are 
+        dictionaries of the breakpoints and the newPOS object at that breakpoint
+
+    IBDindex : dict
+        dictionary where the keys are the chromosome and the values are 
+        dictionaries that keep track of all the breakpoints in 'allpos'
+
+    parameter_dict : dict
+        dictionary of the column indices generated by the generate_parameters 
+        function
+
+    uniqID : dict
+        dictionary where the keys are the iids that carry the variant
+
+    Returns
+    _______
+    str
+        returns the chromosome number of the chunk
+    """
+    # undoing the parameter_dict
+    id1_indx = int(parameter_dict["id1_indx"])
+    id2_indx = int(parameter_dict["id2_indx"])
+    chr_indx = int(parameter_dict["chr_indx"])
+    str_indx = int(parameter_dict["str_indx"])
+    end_indx = int(parameter_dict["end_indx"])
+    cM_indx = int(parameter_dict["cM_indx"])
+
+    # creating the pair string for each pair
+    pair_strings: pd.Series = get_pair_strings(chunk, id1_indx, id2_indx, cM_indx, uniqID)
+
+    return add_breakpoints(chunk, pair_strings, str_indx, end_indx, chr_indx, IBDdata, IBDindex)
+
+# number of lines that are kept in memory before writing to the .small.txt.gz file
+WRITE_BLOCK_SIZE: int = 10000
+
+def sweep_breakpoints(chr_data: dict, allpos: list):
+    """Generator that walks through the sorted breakpoints and keeps 
+    track of the number of open segments and the number of pairs 
+    incrementally. Each segment string and each pair gets an integer 
+    id so that every add or remove event only updates a counter
+    Parameters
+    __________
+    chr_data : dict
+        dictionary where the keys are the breakpoints as strings and 
+        the values are the newPOS objects with the add and rem lists
+
+    allpos : list
+        list of all the breakpoints for the chromosome
+
+    Returns
+    _______
+    generator
+        yields a tuple of the position, the number of open segments, 
+        the number of pairs, the add list and the rem list
+    """
+    # dictionary mapping the cM:pair string to an integer segment id
+    segment_ids: dict = {}
+
+    # list that keeps track of whether each segment id is open
+    segment_open: list = []
+
+    # list that maps each segment id to its pair id
+    segment_pair: list = []
+
+    # dictionary mapping the pair string to an integer pair id
+    pair_ids: dict = {}
+
+    # list that counts the number of open segments for each pair id
+    pair_counts: list = []
+
+    nseg: int = 0
+    npair: int = 0
+
+    for pos in sorted(allpos):
+
+        pos_info = chr_data[str(pos)]
+
+        for cM_pair in pos_info.add:
+
+            seg_id: int = segment_ids.get(cM_pair, -1)
+
+            if seg_id == -1:
+                seg_id = len(segment_open)
+                segment_ids[cM_pair] = seg_id
+                segment_open.append(False)
+
+                pair: str = cM_pair.split(':')[1]
+
+                if pair not in pair_ids:
+                    pair_ids[pair] = len(pair_counts)
+                    pair_counts.append(0)
+
+                segment_pair.append(pair_ids[pair])
+
+            # segments that are already open are not counted twice
+            if not segment_open[seg_id]:
+                segment_open[seg_id] = True
+                nseg += 1
+
+                pair_id: int = segment_pair[seg_id]
+                pair_counts[pair_id] += 1
+
+                if pair_counts[pair_id] == 1:
+                    npair += 1
+
+        for cM_pair in pos_info.rem:
+
+            seg_id = segment_ids.get(cM_pair, -1)
+
+            # only segments that are open can be closed
+            if seg_id != -1 and segment_open[seg_id]:
+                segment_open[seg_id] = False
+                nseg -= 1
+
+                pair_id = segment_pair[seg_id]
+                pair_counts[pair_id] -= 1
+
+                if pair_counts[pair_id] == 0:
+                    npair -= 1
+
+        yield pos, nseg, npair, pos_info.add, pos_info.rem
+
 def write_to_file(IBDdata: dict, IBDindex: dict, output: str, CHR: str, que_object, ibd_program: str, variant_name: str=None, gene_name: str=None):
     
     try:
@@ -210,42 +486,21 @@ def write_to_file(IBDdata: dict, IBDindex: dict, output: str, CHR: str, que_obje
         # Writing the header line to the file
         out.write('chr\tpos\tsegments\tpairs\tadd\tdel\n')
 
-        allibd = set([])
-
-        for pos in sorted(IBDindex[str(CHR)]['allpos']):
-            
-            allibd = allibd | set(IBDdata[str(CHR)][str(pos)].add)
-            allibd = allibd - set(IBDdata[str(CHR)][str(pos)].rem)
-
-            allibdpair = {}
-
-            if len(IBDdata[str(CHR)][str(pos)].add) == 0:
-                IBDdata[str(CHR)][str(pos)].add.append('NA')
-            if len(IBDdata[str(CHR)][str(pos)].rem) == 0:
-                IBDdata[str(CHR)][str(pos)].rem.append('NA')
-
-            nseg = str(len(allibd))
+        # buffering the lines so that they are written in blocks
+        line_buffer: list = []
 
-            for cM_pair in allibd:
-                pair = cM_pair.split(':')[1]
-                cM = cM_pair.split(':')[0]
-
-                if pair in allibdpair:
-
-                    allibdpair[pair] = '{0};{1}'.format(
-                        allibdpair[pair], cM)
-
-                else:
-
-                    allibdpair[pair] = str(cM)
+        for pos, nseg, npair, add_list, rem_list in sweep_breakpoints(IBDdata[str(CHR)], IBDindex[str(CHR)]['allpos']):
 
+            line_buffer.append('{0}\t{1}\t{2}\t{3}\t{4}\t{5}\n'.format(
+                str(CHR), str(pos), nseg, npair,
+                ' '.join(add_list) if add_list else 'NA',
+                ' '.join(rem_list) if rem_list else 'NA'))
 
-            npair = str(len(allibdpair))
+            if len(line_buffer) >= WRITE_BLOCK_SIZE:
+                out.write(''.join(line_buffer))
+                line_buffer = []
 
-            out.write('{0}\t{1}\t{2}\t{3}\t{4}\t{5}\n'.format(
-                str(CHR), str(pos), nseg, npair,
-                ' '.join(IBDdata[str(CHR)][str(pos)].add),
-                ' '.join(IBDdata[str(CHR)][str(pos)].rem)))
+        out.write(''.join(line_buffer))
 
         IBDdata[str(CHR)] = []
         out.close()
@@ -281,7 +536,268 @@ def fix_chr_str(chr_num: str) -> str:
     
     return chr_num
 
-def gather_pairs(IBDdata: dict, IBDindex: dict, parameter_dict: dict, segment_file: str, uniqID: dict,  min_cM: int, que_object, output_path: str, ibd_program: str, var_position: int = None, gene_start: int = None, gene_end: int = None, variant_name=None, gene_name=None):
+def stream_filtered_segments(segment_file: str, parameter_dict: dict, carriers: set = None, min_cM: int = None, chunksize: int = STREAM_CHUNK_SIZE):
+    """Generator that reads the segment file in small chunks and only yields 
+    the rows with a carrier that are at least min_cM long. Only the columns 
+    used to build the pairs are parsed and the ids, positions, and lengths 
+    are read with fixed dtypes so that pandas does not have to infer them
+    Parameters
+    __________
+    segment_file : str
+        filepath to the ibd file for the chromosome. This will be either 
+        the .ibd.gz or the .match.gz file
+
+    parameter_dict : dict
+        dictionary of the column indices generated by the generate_parameters 
+        function
+
+    carriers : set
+        set of the iids that the rows are filtered to. If None then rows are 
+        not filtered by carrier
+
+    min_cM : int
+        minimum centimorgan threshold. If None then rows are not filtered by 
+        length
+
+    chunksize : int
+        number of rows that are parsed at a time
+
+    Returns
+    _______
+    Iterator
+        yields dataframes of the kept rows where the columns are the column 
+        indices of the ibd file
+    """
+    id1_indx: int = int(parameter_dict["id1_indx"])
+    id2_indx: int = int(parameter_dict["id2_indx"])
+    str_indx: int = int(parameter_dict["str_indx"])
+    end_indx: int = int(parameter_dict["end_indx"])
+    cM_indx: int = int(parameter_dict["cM_indx"])
+
+    # unit is only found in GERMLINE files so this will be None otherwise
+    unit = parameter_dict.get("unit")
+
+    used_columns: list = [id1_indx, id2_indx, int(parameter_dict["chr_indx"]), str_indx, end_indx, cM_indx]
+
+    if unit:
+        used_columns.append(int(unit))
+
+    column_dtypes: dict = {
+        id1_indx: str,
+        id2_indx: str,
+        str_indx: np.int64,
+        end_indx: np.int64,
+        cM_indx: np.float64
+    }
+
+    for chunk in pd.read_csv(segment_file, sep="\t", header=None, usecols=sorted(used_columns), dtype=column_dtypes, chunksize=chunksize):
+
+        # building one mask for the chunk so that the dropped rows are never 
+        # copied into a new dataframe
+        row_mask: np.ndarray = np.ones(len(chunk), dtype=bool)
+
+        if min_cM is not None:
+            row_mask &= chunk[cM_indx].to_numpy() >= min_cM
+
+        if unit:
+            row_mask &= (chunk[unit] == "cM").to_numpy()
+
+        if carriers is not None:
+            row_mask &= (chunk[id1_indx].isin(carriers) | chunk[id2_indx].isin(carriers)).to_numpy()
+
+        if row_mask.any():
+            yield chunk[row_mask]
+
+def read_segment_chunks(segment_file: str, ibd_program: str, cache_dir: str = None, carriers: set = None, min_cM: int = None, positions: list = None, windows: list = None, parameter_dict: dict = None):
+    """Function to get an iterator of dataframe chunks from the segment file. 
+    Only the rows with a carrier that are at least min_cM long are returned. 
+    If a cache directory is provided then these rows are loaded from the 
+    cached columns. Otherwise the text file is streamed in small chunks
+    Parameters
+    __________
+    segment_file : str
+        filepath to the ibd file for the chromosome. This will be either 
+        the .ibd.gz or the .match.gz file
+
+    ibd_program : str
+        ibd program that was used. This will be either hapibd or ilash
+
+    cache_dir : str
+        directory of the segment cache. This value is None by default
+
+    carriers : set
+        set of the iids that the rows are filtered to when the cache is used
+
+    min_cM : int
+        minimum centimorgan threshold used when the cache is used
+
+    positions : list
+        list of variant positions. When the cache is used only the segments 
+        covering one of these positions are loaded
+
+    windows : list
+        list of tuples of the gene start and end. When the cache is used only 
+        the segments overlapping one of these windows are loaded
+
+    parameter_dict : dict
+        dictionary of the column indices generated by the generate_parameters 
+        function. If None then the indices are generated from the ibd_program
+
+    Returns
+    _______
+    Iterator
+        returns an iterator of dataframes where the columns are the column 
+        indices of the ibd file
+    """
+    # germline files are not cached so they are always read from the text file
+    if cache_dir and ibd_program.lower() in ["hapibd", "ilash"]:
+
+        segment_cache: Segment_Cache = Segment_Cache(cache_dir, ibd_program)
+
+        return segment_cache.iter_segments(segment_file, ["id1", "id2", "chr", "start", "end", "cM"], carriers, min_cM, positions=positions, windows=windows)
+
+    if not parameter_dict:
+        parameter_dict = generate_parameters(ibd_program)
+
+    return stream_filtered_segments(segment_file, parameter_dict, carriers, min_cM)
+
+def decode_chunk_ids(chunk: pd.DataFrame, iid_encoder: IID_Encoder, id1_indx: int, id2_indx: int) -> pd.DataFrame:
+    """Function to convert the id codes of a chunk back into the iids
+    Parameters
+    __________
+    chunk : pd.DataFrame
+        dataframe chunk where the id columns are int32 codes
+
+    iid_encoder : IID_Encoder
+        encoder that the codes came from
+
+    id1_indx : int
+        integer that tells the index of the id1 column
+
+    id2_indx : int
+        integer that tells the index of the id2 column
+
+    Returns
+    _______
+    pd.DataFrame
+        returns a copy of the chunk where the id columns are the iids
+    """
+    decoded_chunk: pd.DataFrame = chunk.copy()
+
+    # the iids are converted to objects to match the output of pd.read_csv
+    decoded_chunk[id1_indx] = iid_encoder.decode(chunk[id1_indx].to_numpy()).astype(object)
+
+    decoded_chunk[id2_indx] = iid_encoder.decode(chunk[id2_indx].to_numpy()).astype(object)
+
+    return decoded_chunk
+
+def get_segment_encoder(segment_file: str, ibd_program: str, carriers: set, cache_dir: str = None, iid_encoder: IID_Encoder = None) -> IID_Encoder:
+    """Function to get the encoder whose codes are used to check the carriers 
+    of a segment file. The cached columns already use the encoder of the 
+    cached file. The text file is encoded with the global iid dictionary 
+    and any carriers that are missing from it are added to the end
+    Parameters
+    __________
+    segment_file : str
+        filepath to the ibd file for the chromosome. This will be either 
+        the .ibd.gz or the .match.gz file
+
+    ibd_program : str
+        ibd program that was used. This will be either hapibd or ilash
+
+    carriers : set
+        set of the iids that are carriers of any variant in the task
+
+    cache_dir : str
+        directory of the segment cache. This value is None by default
+
+    iid_encoder : IID_Encoder
+        global iid dictionary built from the .fam file, the .raw file, or 
+        the pop_info file. If this value is None then only the carriers are 
+        given codes
+
+    Returns
+    _______
+    IID_Encoder
+        returns the encoder for the codes of the segment file
+    """
+    if cache_dir and ibd_program.lower() in ["hapibd", "ilash"]:
+        return Segment_Cache(cache_dir, ibd_program).get_file_encoder(segment_file)
+
+    return (iid_encoder or IID_Encoder()).extend(sorted(carriers))
+
+def read_encoded_segment_chunks(segment_file: str, ibd_program: str, segment_encoder: IID_Encoder, cache_dir: str = None, carriers: set = None, min_cM: int = None, positions: list = None, parameter_dict: dict = None):
+    """Generator that yields the same rows as read_segment_chunks with the 
+    id codes of each row. The cached id columns are already codes so they 
+    are yielded without decoding. The ids of the text file are looked up 
+    once in the segment_encoder and the carrier rows are kept with a boolean 
+    array so the iids are only hashed once per row
+    Parameters
+    __________
+    segment_file : str
+        filepath to the ibd file for the chromosome. This will be either 
+        the .ibd.gz or the .match.gz file
+
+    ibd_program : str
+        ibd program that was used. This will be either hapibd or ilash
+
+    segment_encoder : IID_Encoder
+        encoder from get_segment_encoder. Every carrier has a code in it
+
+    cache_dir : str
+        directory of the segment cache. This value is None by default
+
+    carriers : set
+        set of the iids that the rows are filtered to
+
+    min_cM : int
+        minimum centimorgan threshold
+
+    positions : list
+        list of variant positions. When the cache is used only the segments 
+        covering one of these positions are loaded
+
+    parameter_dict : dict
+        dictionary of the column indices generated by the generate_parameters 
+        function. If None then the indices are generated from the ibd_program
+
+    Returns
+    _______
+    Iterator
+        yields tuples of the dataframe chunk, the id1 codes, and the id2 
+        codes. The id columns of the chunk are codes if the cache is used 
+        and the iids otherwise. Ids that are not in the encoder are -1
+    """
+    if not parameter_dict:
+        parameter_dict = generate_parameters(ibd_program)
+
+    id1_indx: int = int(parameter_dict["id1_indx"])
+    id2_indx: int = int(parameter_dict["id2_indx"])
+
+    if cache_dir and ibd_program.lower() in ["hapibd", "ilash"]:
+
+        segment_cache: Segment_Cache = Segment_Cache(cache_dir, ibd_program)
+
+        for chunk in segment_cache.iter_segments(segment_file, ["id1", "id2", "chr", "start", "end", "cM"], carriers, min_cM, positions=positions, decode_ids=False):
+            yield chunk, chunk[id1_indx].to_numpy(), chunk[id2_indx].to_numpy()
+
+    else:
+        # the last value is False so that the code -1 of the ids that are 
+        # not in the encoder is never a carrier
+        carrier_mask: np.ndarray = np.append(segment_encoder.carrier_mask(carriers), False)
+
+        for chunk in stream_filtered_segments(segment_file, parameter_dict, None, min_cM):
+
+            id1_codes: np.ndarray = segment_encoder.encode(chunk[id1_indx].to_numpy())
+
+            id2_codes: np.ndarray = segment_encoder.encode(chunk[id2_indx].to_numpy())
+
+            row_mask: np.ndarray = carrier_mask[id1_codes] | carrier_mask[id2_codes]
+
+            if row_mask.any():
+                yield chunk[row_mask], id1_codes[row_mask], id2_codes[row_mask]
+
+def gather_pairs(IBDdata: dict, IBDindex: dict, parameter_dict: dict, segment_file: str, uniqID: dict,  min_cM: int, que_object, output_path: str, ibd_program: str, var_position: int = None, gene_start: int = None, gene_end: int = None, variant_name=None, gene_name=None, cache_dir: str = None):
     '''This function will be used in the parallelism function'''
     # undoing the parameter_dict
     id1_indx = int(parameter_dict["id1_indx"])
@@ -289,38 +805,25 @@ def gather_pairs(IBDdata: dict, IBDindex: dict, parameter_dict: dict, segment_fi
     chr_indx = int(parameter_dict["chr_indx"])
     str_indx = int(parameter_dict["str_indx"])
     end_indx = int(parameter_dict["end_indx"])
-    cM_indx = int(parameter_dict["cM_indx"])
 
     # getting the chromosome number that will be returned at the end of the program
 
-    # This catches the KeyError raised because unit is only found in GERMLINE files
-    try:
-        unit = parameter_dict["unit"]
-    except KeyError:
-        unit = None
-
     # creating a dictionary to handle which way to filter for above the min_cM threshold
     # giving the chromosome a default value. If this value does not 
     # change throughout the program then the program will just move on
     chr_num: str = "0"
 
-    for chunk in pd.read_csv(segment_file,
-                                sep="\t",
-                                header=None,
-                                chunksize=1000000):
-
+    # the position or the gene window is passed so that the cached interval 
+    # index can be used to skip segments that are not at the site
+    positions: list = [var_position] if var_position else None
 
-        # Checking to see if the ids are in the uniqID dictionary
-        chunk_in_uniqID = filter_to_individual_in_uniqID(chunk, uniqID, id1_indx, id2_indx)
+    windows: list = [(gene_start, gene_end)] if gene_start and gene_end else None
 
+    # the chunks are already filtered to the rows that have a carrier and 
+    # are at least min_cM long. When the cache is used the carriers are 
+    # checked with the id codes so only the kept rows are decoded
+    for chunk_greater_than_3_cm in read_segment_chunks(segment_file, ibd_program, cache_dir, uniqID, min_cM, positions, windows, parameter_dict):
 
-        # This is filtering the dataframe to only pairs greater than min_cM threshold
-        if unit:
-            # If germline files are used then you have to use this
-            chunk_greater_than_3_cm = filter_to_greater_than_3_cm(chunk_in_uniqID, cM_indx, min_cM, unit)
-        else:
-            chunk_greater_than_3_cm = filter_to_greater_than_3_cm(chunk_in_uniqID, cM_indx, min_cM)
-        
         # filtering for values where the start value is less than the base pair and the 
         # end value is greater than the base pair
         # This method will only be done if the user is using a gene 
@@ -336,17 +839,8 @@ def gather_pairs(IBDdata: dict, IBDindex: dict, parameter_dict: dict, segment_fi
             
         # This will iterate through each row of the filtered chunk
         if not chunk.empty:
-            # getting rid of an warning message that indicates that the resulting chunk is a pandas dataframe
-            chunk_copy: pd.DataFrame = chunk.__deepcopy__()
-
 
-            # creating a new column with the pair string for each pair
-            chunk_copy.loc[:,"pair_string"] = chunk_copy.apply(lambda row: get_pair_string(row, id1_indx, id2_indx, cM_indx, uniqID), axis=1)
-
-            
-            chr_num_series:pd.Series = chunk_copy.apply(lambda row: build_ibddata_and_ibddict(row, str_indx, end_indx, chr_indx, IBDdata, IBDindex), axis=1)
-
-            chr_num: str = list(set(chr_num_series.values))[0]
+            chr_num = add_chunk_to_ibd_arrays(chunk, IBDdata, IBDindex, parameter_dict, uniqID)
 
     
     if chr_num != "0":
@@ -365,3 +859,119 @@ def gather_pairs(IBDdata: dict, IBDindex: dict, parameter_dict: dict, segment_fi
 
     
     
+
+def gather_pairs_all_variants(var_info_dict: dict, parameter_dict: dict, segment_file: str, min_cM: int, que_object, output_path: str, ibd_program: str, cache_dir: str = None, iid_encoder: IID_Encoder = None):
+    """Function that reads the segment file once for a chromosome and fans the 
+    matched rows out to every variant on that chromosome
+    Parameters
+    __________
+    var_info_dict : dict
+        dictionary where the keys are the variant ids and the values are 
+        dictionaries with the keys base_pos and iid_list
+
+    parameter_dict : dict
+        dictionary of the column indices generated by the generate_parameters 
+        function
+
+    segment_file : str
+        filepath to the ibd file for the chromosome. This will be either 
+        the .ibd.gz or the .match.gz file
+
+    min_cM : int
+        minimum centimorgan threshold
+
+    que_object
+        que that failures get written to
+
+    output_path : str
+        directory that the .small.txt.gz files will be written to
+
+    ibd_program : str
+        ibd program that was used. This will be either hapibd or ilash
+
+    cache_dir : str
+        directory of the segment cache. If this value is None then the 
+        segment file is read directly. This value is None by default
+
+    iid_encoder : IID_Encoder
+        global iid dictionary that the text file is encoded with. If this 
+        value is None then only the carriers are given codes. This value is 
+        None by default
+    """
+    id1_indx = int(parameter_dict["id1_indx"])
+    id2_indx = int(parameter_dict["id2_indx"])
+    str_indx = int(parameter_dict["str_indx"])
+    end_indx = int(parameter_dict["end_indx"])
+
+    # the cached id columns are codes that are decoded for the kept rows
+    use_cache: bool = bool(cache_dir) and ibd_program.lower() in ["hapibd", "ilash"]
+
+    # building the uniqID dictionary and the ibd arrays for each variant. 
+    # Every variant keeps the default chromosome of "0" until a row is found
+    variant_dict: dict = {}
+
+    for variant, variant_info in var_info_dict.items():
+
+        IBDdata, IBDindex = create_ibd_arrays()
+
+        variant_dict[variant] = {
+            "uniqID": build_unique_id_dict(variant_info["iid_list"]),
+            "base_pos": int(variant_info["base_pos"]),
+            "IBDdata": IBDdata,
+            "IBDindex": IBDindex,
+            "chr_num": "0"
+        }
+
+    # getting a set of all the carriers for the chromosome so that each 
+    # chunk can be reduced once before it is tested against each variant
+    all_carriers: set = set()
+
+    for variant_info in variant_dict.values():
+        all_carriers.update(variant_info["uniqID"])
+
+    variant_positions: list = [variant_info["base_pos"] for variant_info in variant_dict.values()]
+
+    segment_encoder: IID_Encoder = get_segment_encoder(segment_file, ibd_program, all_carriers, cache_dir, iid_encoder)
+
+    # building the carrier mask of each variant once for the whole file. The 
+    # last value is False so that the code -1 is never a carrier
+    for variant_info in variant_dict.values():
+        variant_info["carrier_mask"] = np.append(segment_encoder.carrier_mask(variant_info["uniqID"]), False)
+
+    # the chunks are already filtered to the rows with any carrier that are 
+    # at least min_cM long
+    for chunk_greater_than_3_cm, id1_codes, id2_codes in read_encoded_segment_chunks(segment_file, ibd_program, segment_encoder, cache_dir, all_carriers, min_cM, variant_positions, parameter_dict):
+
+        if chunk_greater_than_3_cm.empty:
+            continue
+
+        # indexing the reduced chunk once so that each variant only looks 
+        # at the segments that cover its position
+        chunk_index: Interval_Index = Interval_Index(chunk_greater_than_3_cm[str_indx].values, chunk_greater_than_3_cm[end_indx].values)
+
+        # fanning the reduced chunk out to each variant
+        for variant_info in variant_dict.values():
+
+            covering_rows: np.ndarray = chunk_index.covering(variant_info["base_pos"])
+
+            carrier_mask: np.ndarray = variant_info["carrier_mask"]
+
+            variant_rows: np.ndarray = covering_rows[carrier_mask[id1_codes[covering_rows]] | carrier_mask[id2_codes[covering_rows]]]
+
+            if len(variant_rows) > 0:
+
+                variant_chunk: pd.DataFrame = chunk_greater_than_3_cm.iloc[variant_rows]
+
+                # only the rows for the variant are decoded back into iids
+                if use_cache:
+                    variant_chunk = decode_chunk_ids(variant_chunk, segment_encoder, id1_indx, id2_indx)
+
+                variant_info["chr_num"] = add_chunk_to_ibd_arrays(variant_chunk, variant_info["IBDdata"], variant_info["IBDindex"], parameter_dict, variant_info["uniqID"])
+
+    # writing the .small.txt.gz file for each variant
+    for variant, variant_info in variant_dict.items():
+
+        if variant_info["chr_num"] != "0":
+            write_to_file(variant_info["IBDdata"], variant_info["IBDindex"], output_path, variant_info["chr_num"], que_object, ibd_program, variant)
+        else:
+            print(f"the were no shared IBD segments found for the variant: {variant}")
@@ -6,6 +6,7 @@ import multiprocessing as mp
 from functools import partial
 
 from .collect_shared_segments import generate_parameters, build_unique_id_dict, create_ibd_arrays, gather_pairs
+from ..segment_cache.segment_cache import convert_segment_files
 import utility_scripts
 
 # making a custom exception for when the iid_list is empty
@@ -91,7 +92,7 @@ def get_ibd_file(ibd_list: list, chr_num) -> str:
 
     return [file for file in ibd_list if chr_num in file][0]
 
-def collect_IBD_segments(carrier_list: list, ibd_program:str, min_CM: str, ibd_file_list: list, output_path: str, gene_dict: dict, que_object, key: str):
+def collect_IBD_segments(carrier_list: list, ibd_program:str, min_CM: str, ibd_file_list: list, output_path: str, gene_dict: dict, que_object, key: str, cache_dir: str = None):
 
     gene_info: dict = gene_dict[key]
     
@@ -106,34 +107,40 @@ def collect_IBD_segments(carrier_list: list, ibd_program:str, min_CM: str, ibd_f
 
     IBDdata, IBDindex = create_ibd_arrays()
 
-    gather_pairs(IBDdata, IBDindex, parameter_dict, ibd_file, uniqID, min_CM, que_object, output_path, ibd_program, gene_start=gene_info["start"], gene_end=gene_info["end"], gene_name=key) 
+    gather_pairs(IBDdata, IBDindex, parameter_dict, ibd_file, uniqID, min_CM, que_object, output_path, ibd_program, gene_start=gene_info["start"], gene_end=gene_info["end"], gene_name=key, cache_dir=cache_dir) 
 
-def run_parallel(gene_info_dict: dict, ibd_file_list: list,THREADS: int, min_CM: str, ibd_program: str, output: str, carrier_list: list):
+def run_parallel(gene_info_dict: dict, ibd_file_list: list,THREADS: int, min_CM: str, ibd_program: str, output: str, carrier_list: list, cache_dir: str = None):
     """function to run through the genes in parallel"""
 
-    manager = mp.Manager()
+    header:str = "gene\n"
 
-    que = manager.Queue()
+    # the failed genes are written by a thread in this process so that 
+    # every worker in the pool is used for the genes
+    result_channel = utility_scripts.Result_Channel("".join([output, "gene_target_failed.txt"]), header).start()
 
-    pool = mp.Pool(int(THREADS))
-    header:str = "gene\n"
+    # the gene dictionary, the carriers, and the ibd file list are loaded 
+    # once in each worker instead of being pickled with every gene
+    worker_tables: dict = {
+        "gene_dict": gene_info_dict,
+        "carrier_list": carrier_list,
+        "ibd_file_list": ibd_file_list,
+        "result_queue": result_channel.queue
+    }
 
-    watcher = pool.apply_async(
-            utility_scripts.listener,
-            (que, "".join([output, "gene_target_failed.txt"]), header))
+    pool = mp.Pool(int(THREADS), initializer=utility_scripts.set_worker_tables, initargs=(worker_tables,))
 
-    func = partial(collect_IBD_segments, carrier_list, ibd_program, min_CM, ibd_file_list, output, gene_info_dict, que)
+    func = partial(utility_scripts.call_with_worker_tables, collect_IBD_segments, utility_scripts.Worker_Table("carrier_list"), ibd_program, min_CM, utility_scripts.Worker_Table("ibd_file_list"), output, utility_scripts.Worker_Table("gene_dict"), utility_scripts.Worker_Table("result_queue"), cache_dir=cache_dir)
 
     pool.map(func, list(gene_info_dict.keys()))
 
-    que.put("kill")
-
     pool.close()
 
     pool.join()
 
+    result_channel.close()
+
 
-def gather_shared_segments(ibd_file_list: list, pheno_gmap_df:pd.DataFrame, phenotype_carriers_df: pd.DataFrame, output_path: str, ibd_program: str, min_CM: str, ibd_suffix: str, THREADS):
+def gather_shared_segments(ibd_file_list: list, pheno_gmap_df:pd.DataFrame, phenotype_carriers_df: pd.DataFrame, output_path: str, ibd_program: str, min_CM: str, ibd_suffix: str, THREADS, cache_dir: str = None, iid_file: str = None):
     """Function to get the shared segments for each pair within a gene of interest
     Parameters
     __________
@@ -153,7 +160,16 @@ def gather_shared_segments(ibd_file_list: list, pheno_gmap_df:pd.DataFrame, phen
         a string listing the output path to write the file to
     
     ibd_program : str
-        This is the ibd program used to get the shared segment data. Should be either ilash or hapibd"""
+        This is the ibd program used to get the shared segment data. Should be either ilash or hapibd
+
+    cache_dir : str
+        directory of the segment cache. If this value is provided then the 
+        interval index in the cache is used to find the segments in each 
+        gene. This value is None by default
+
+    iid_file : str
+        filepath to the file used to build the global iid dictionary for 
+        the segment cache. This value is None by default"""
     
     # checking to make sure the output directory subdirectory "collected_pairs" exists
     output_path: str = utility_scripts.check_dir(output_path, "collected_pairs/")
@@ -161,11 +177,16 @@ def gather_shared_segments(ibd_file_list: list, pheno_gmap_df:pd.DataFrame, phen
     # getting a list of ibd_files
     ibd_file_list: list = utility_scripts.get_file_list(ibd_file_list, ibd_suffix)
 
+    # converting the segment files before the genes are run in parallel 
+    # so that two workers never build the same cache
+    if cache_dir and ibd_program.lower() in ["hapibd", "ilash"]:
+        convert_segment_files(ibd_file_list, cache_dir, ibd_program, int(THREADS), iid_file)
+
     # getting a list of grids that have the phenotype of interest
     carrier_list: list = get_carriers(phenotype_carriers_df)
 
     # need to generate a dictionary of all chromosomes, with their start and end point
     gene_dict: dict = gather_gene_info(pheno_gmap_df)
 
-    run_parallel(gene_dict, ibd_file_list, THREADS, min_CM, ibd_program, output_path, carrier_list)
+    run_parallel(gene_dict, ibd_file_list, THREADS, min_CM, ibd_program, output_path, carrier_list, cache_dir)
 
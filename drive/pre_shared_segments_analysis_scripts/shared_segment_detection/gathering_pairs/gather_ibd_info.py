@@ -6,7 +6,9 @@ import pandas as pd
 
 import utility_scripts
 import pre_shared_segments_analysis_scripts.file_dict_creator as file_dict_creator
-from .collect_shared_segments import gather_pairs, generate_parameters, build_unique_id_dict, create_ibd_arrays, write_to_file
+from ..segment_cache.segment_cache import convert_segment_files
+from ..segment_cache.iid_encoder import IID_Encoder
+from .collect_shared_segments import gather_pairs, gather_pairs_all_variants, generate_parameters, build_unique_id_dict, create_ibd_arrays, write_to_file
 
 ####################################################################################################
 
@@ -221,9 +223,50 @@ def filter_no_carriers(var_iid_dict: dict, output_path: str, chr_num: str) -> di
 
     return filtered_var_dict
 
+def estimate_task_cost(segment_file: str, var_info_dict: dict) -> int:
+    """Function to estimate how long a task will take from the size of the 
+    segment file and the number of carriers in the task
+    Parameters
+    __________
+    segment_file : str
+        filepath to the ibd file for the chromosome
+
+    var_info_dict : dict
+        dictionary where the keys are the variant ids and the values are 
+        dictionaries with the keys base_pos and iid_list
+
+    Returns
+    _______
+    int
+        returns the file size in bytes times the number of carriers
+    """
+    carrier_count: int = sum(len(variant_info["iid_list"]) for variant_info in var_info_dict.values())
+
+    file_size: int = path.getsize(segment_file) if path.exists(segment_file) else 0
+
+    return file_size * max(carrier_count, 1)
+
+def schedule_tasks(task_list: list) -> list:
+    """Function to order the tasks from every chromosome so that the largest 
+    tasks are started first. This keeps a large chromosome from being the 
+    only task left running at the end
+    Parameters
+    __________
+    task_list : list
+        list of tuples where the first value is the segment file and the 
+        second value is the var_info_dict of the variants in the task
+
+    Returns
+    _______
+    list
+        returns the task list sorted from the largest estimated cost to the 
+        smallest. Tasks with the same cost keep their original order
+    """
+    return sorted(task_list, key=lambda task: estimate_task_cost(*task), reverse=True)
+
 #TODO: refactor to make this function testable
 # This function is not testable at the moment
-def iterate_file_dict(file_dict: dict, output: str, threads: str, ibd_program: str, min_CM: str):
+def iterate_file_dict(file_dict: dict, output: str, threads: str, ibd_program: str, min_CM: str, single_pass: bool = False, cache_dir: str = None, iid_file: str = None):
     """Function will iterate through the file dictionary which has paired the chromosome number with the appropriate files 
     Parameters
     __________
@@ -235,7 +278,45 @@ def iterate_file_dict(file_dict: dict, output: str, threads: str, ibd_program: s
     
     output : str
         string that list directory to output files at
+
+    single_pass : bool
+        if True then each segment file is read once per chromosome 
+        and every variant on that chromosome is tested against each 
+        chunk. If False then each variant reads the segment file 
+        separately. This value is False by default
+
+    cache_dir : str
+        directory that the parsed segment files are cached in. If this 
+        value is None then the segment files are read directly. This 
+        value is None by default
+
+    iid_file : str
+        filepath to the PLINK .fam file, the PLINK .raw file, or the 
+        pop_info file used to build the global iid dictionary for the 
+        segment cache and the single pass scan. This value is None by default
     """
+    # converting each segment file once before any of the variants 
+    # are run so that the workers only read the cached columns
+    if cache_dir and ibd_program.lower() in ["hapibd", "ilash"]:
+
+        segment_file_list: list = [file_dict[key]["ibd"] for key in file_dict if "None" not in file_dict[key].values()]
+
+        convert_segment_files(segment_file_list, cache_dir, ibd_program, int(threads), iid_file)
+
+    # the single pass scan of the text files checks the carriers with the 
+    # codes of the global iid dictionary. The dictionary is loaded once and 
+    # shared with the workers when the pool starts. The cached files 
+    # already store codes so the dictionary is not needed for them
+    iid_encoder: IID_Encoder = None
+
+    if single_pass and iid_file and not (cache_dir and ibd_program.lower() in ["hapibd", "ilash"]):
+        iid_encoder = IID_Encoder.from_file(iid_file)
+
+    # list of the segment file and the variant information for every 
+    # task in the run. Each task is either a single variant or every 
+    # variant on a chromosome if the single pass scan is used
+    task_list: list = []
+
     # Iterating through the chromosomes that have a value
     for key in file_dict:
     
@@ -264,20 +345,29 @@ def iterate_file_dict(file_dict: dict, output: str, threads: str, ibd_program: s
             for variant, bp in var_pos_dict.items():
                 var_info_dict = create_var_info_dict(var_info_dict, var_iid_dict, variant, bp)
 
-            # need to fix this part for the new function
-            parallel_runner: object = utility_scripts.Segment_Parallel_Runner(
-                int(threads), output, ibd_program, min_CM, var_info_dict,
-                ibd_file)
+            if single_pass:
+
+                task_list.append((ibd_file, var_info_dict))
+
+            else:
+                # each variant only needs its own information so the 
+                # whole dictionary is not sent to the worker
+                task_list.extend([(ibd_file, {variant: variant_info}) for variant, variant_info in var_info_dict.items()])
 
-            error_filename: str = "nopairs-identified.txt"
-            header_str: str = "variant_id"
+    # running the tasks from every chromosome in one pool so that the 
+    # chromosomes with only a few variants do not leave cores idle
+    if task_list:
 
-            parallel_runner.run_segments_parallel(error_filename, gather_shared_segments,
-                                                  header_str)
+        parallel_runner: object = utility_scripts.Task_Parallel_Runner(
+            int(threads), output, ibd_program, min_CM, schedule_tasks(task_list), cache_dir, iid_encoder)
+
+        task_func: object = gather_chromosome_segments if single_pass else gather_variant_segments
+
+        parallel_runner.run_tasks_parallel("nopairs-identified.txt", task_func, "variant_id")
 
 # TODO: rename function
 def gather_shared_segments(segment_file: str, output_path: str, ibd_format: str,
-             min_CM: str, var_info_dict: list, que_object, variant):
+             min_CM: str, var_info_dict: list, que_object, variant, cache_dir: str = None):
 
     output_path: str = utility_scripts.check_dir(output_path, "collected_pairs/")
     variant_position: int = int(var_info_dict[variant]["base_pos"])
@@ -292,6 +382,73 @@ def gather_shared_segments(segment_file: str, output_path: str, ibd_format: str,
 
     IBDdata, IBDindex = create_ibd_arrays()
 
-    gather_pairs(IBDdata, IBDindex, parameter_dict, segment_file, uniqID, min_CM, que_object, output_path, ibd_format, var_position=variant_position, variant_name=variant) 
+    gather_pairs(IBDdata, IBDindex, parameter_dict, segment_file, uniqID, min_CM, que_object, output_path, ibd_format, var_position=variant_position, variant_name=variant, cache_dir=cache_dir) 
 
     
+
+
+def gather_variant_segments(output_path: str, ibd_format: str, min_CM: str, que_object, variant_task: tuple, cache_dir: str = None):
+    """Function that will gather the shared segments for a single variant task from the scheduler
+    Parameters
+    __________
+    output_path : str
+        string that list the directory to output files at
+
+    ibd_format : str
+        ibd program that was used. This will be either hapibd or ilash
+
+    min_CM : str
+        minimum centimorgan threshold
+
+    que_object
+        que that failures get written to
+
+    variant_task : tuple
+        tuple where the first value is the segment file for the chromosome 
+        and the second value is a var_info_dict with only the variant
+
+    cache_dir : str
+        directory of the segment cache. This value is None by default
+    """
+    segment_file, var_info_dict = variant_task
+
+    for variant in var_info_dict:
+
+        gather_shared_segments(segment_file, output_path, ibd_format, min_CM, var_info_dict, que_object, variant, cache_dir)
+
+def gather_chromosome_segments(output_path: str, ibd_format: str, min_CM: str, que_object, chromosome_info: tuple, cache_dir: str = None, iid_encoder: IID_Encoder = None):
+    """Function that will gather the shared segments for every variant on a chromosome with a single read of the segment file
+    Parameters
+    __________
+    output_path : str
+        string that list the directory to output files at
+
+    ibd_format : str
+        ibd program that was used. This will be either hapibd or ilash
+
+    min_CM : str
+        minimum centimorgan threshold
+
+    que_object
+        que that failures get written to
+
+    chromosome_info : tuple
+        tuple where the first value is the segment file for the chromosome 
+        and the second value is the var_info_dict for the chromosome
+
+    cache_dir : str
+        directory of the segment cache. This value is None by default
+
+    iid_encoder : IID_Encoder
+        global iid dictionary that the text file is encoded with. This 
+        value is None by default
+    """
+    segment_file, var_info_dict = chromosome_info
+
+    output_path: str = utility_scripts.check_dir(output_path, "collected_pairs/")
+
+    print(f"running the variants {', '.join(var_info_dict.keys())}")
+
+    parameter_dict: dict = generate_parameters(ibd_format)
+
+    gather_pairs_all_variants(var_info_dict, parameter_dict, segment_file, min_CM, que_object, output_path, ibd_format, cache_dir, iid_encoder)
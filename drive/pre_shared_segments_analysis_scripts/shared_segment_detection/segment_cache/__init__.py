@@ -0,0 +1,5 @@
+# __init__.py
+from .segment_cache import Segment_Cache, convert_segment_files, get_cache_layout, load_pair_index
+from .interval_index import Interval_Index
+from .iid_encoder import IID_Encoder
+from .pair_index import Pair_Index
@@ -0,0 +1,206 @@
+import os
+import json
+import hashlib
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+# name of the file that has every iid in the cohort in code order
+IID_DICTIONARY_FILE: str = "iid_dictionary.npy"
+
+# name of the file that has the checksum of the iid dictionary
+IID_DICTIONARY_META: str = "iid_dictionary.json"
+
+class IID_Encoder:
+    """class that maps each grid iid to a dense int32 code so that the ibd
+    files can store integer id columns and carrier membership can be checked
+    with a boolean array instead of hashing strings"""
+
+    def __init__(self, iid_array: Iterable = ()) -> None:
+        """
+        Parameters
+        __________
+        iid_array : Iterable
+            iterable of the iids in code order. Duplicate iids only keep
+            their first code
+        """
+        iid_list: np.ndarray = np.asarray(iid_array if isinstance(iid_array, np.ndarray) else list(iid_array), dtype=str)
+
+        self.iids: np.ndarray = np.asarray(pd.unique(iid_list), dtype=str)
+
+        # the pandas index does the hashing in C when encoding arrays
+        self.iid_index: pd.Index = pd.Index(self.iids)
+
+    def __len__(self) -> int:
+        return len(self.iids)
+
+    @classmethod
+    def from_file(cls, iid_file: str):
+        """Method to build the encoder from a PLINK .fam file, a PLINK .raw
+        file, or the pop_info file
+        Parameters
+        __________
+        iid_file : str
+            filepath to the .fam file, the .raw file, or the pop_info file.
+            The .fam file has the iid in the second column, the .raw file has
+            a column called IID, and the pop_info file has a column called grid
+
+        Returns
+        _______
+        IID_Encoder
+            returns the encoder with every iid in the file
+        """
+        if iid_file.endswith(".fam"):
+            iid_series: pd.Series = pd.read_csv(iid_file, sep=r"\s+", header=None, usecols=[1], dtype=str)[1]
+
+        elif iid_file.endswith(".raw"):
+            iid_series = pd.read_csv(iid_file, sep=" ", usecols=["IID"], dtype=str)["IID"]
+
+        else:
+            iid_series = pd.read_csv(iid_file, sep="\t", usecols=["grid"], dtype=str)["grid"]
+
+        return cls(iid_series.to_numpy())
+
+    @classmethod
+    def load(cls, cache_dir: str):
+        """Method to load the iid dictionary that was saved in the cache
+        directory
+        Parameters
+        __________
+        cache_dir : str
+            directory of the segment cache
+
+        Returns
+        _______
+        IID_Encoder
+            returns the encoder or an empty encoder if there is no saved
+            dictionary
+        """
+        dictionary_path: str = os.path.join(cache_dir, IID_DICTIONARY_FILE)
+
+        if not os.path.exists(dictionary_path):
+            return cls()
+
+        return cls(np.load(dictionary_path))
+
+    @staticmethod
+    def load_checksum(cache_dir: str) -> str:
+        """Method to get the checksum of the saved iid dictionary
+        Parameters
+        __________
+        cache_dir : str
+            directory of the segment cache
+
+        Returns
+        _______
+        str
+            returns the checksum or an empty string if there is no saved
+            dictionary
+        """
+        meta_path: str = os.path.join(cache_dir, IID_DICTIONARY_META)
+
+        if not os.path.exists(meta_path):
+            return ""
+
+        with open(meta_path, "r") as meta_file:
+            return json.load(meta_file)["checksum"]
+
+    def get_checksum(self) -> str:
+        """Method to get a checksum of the iids in code order. Cached files
+        store this value so that they are rebuilt if the codes change"""
+
+        return hashlib.md5("\n".join(self.iids.tolist()).encode()).hexdigest()
+
+    def save(self, cache_dir: str):
+        """Method to save the iid dictionary to the cache directory. The
+        dictionary is only rewritten if the iids changed
+        Parameters
+        __________
+        cache_dir : str
+            directory of the segment cache
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+
+        checksum: str = self.get_checksum()
+
+        if checksum == self.load_checksum(cache_dir):
+            return
+
+        np.save(os.path.join(cache_dir, IID_DICTIONARY_FILE), self.iids)
+
+        with open(os.path.join(cache_dir, IID_DICTIONARY_META), "w") as meta_file:
+            json.dump({"checksum": checksum, "n_iids": len(self)}, meta_file)
+
+    def encode(self, iid_values: Iterable) -> np.ndarray:
+        """Method to convert iids into their integer codes
+        Parameters
+        __________
+        iid_values : Iterable
+            iterable of the iids
+
+        Returns
+        _______
+        np.ndarray
+            returns an int32 array of the codes where iids that are not in
+            the dictionary are -1
+        """
+        return self.iid_index.get_indexer(np.asarray(iid_values, dtype=str)).astype(np.int32)
+
+    def extend(self, iid_values: Iterable):
+        """Method to get a new encoder where the iids that are not in the
+        dictionary are added to the end. This is used for iids in the ibd
+        files that are not in the cohort
+        Parameters
+        __________
+        iid_values : Iterable
+            iterable of the iids
+
+        Returns
+        _______
+        IID_Encoder
+            returns a new encoder. The codes of the existing iids do not change
+        """
+        iid_values = np.asarray(iid_values, dtype=str)
+
+        missing_iids: np.ndarray = iid_values[self.iid_index.get_indexer(iid_values) == -1]
+
+        if len(missing_iids) == 0:
+            return self
+
+        return IID_Encoder(np.concatenate([self.iids, pd.unique(missing_iids).astype(str)]))
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Method to convert integer codes back into the iids
+        Parameters
+        __________
+        codes : np.ndarray
+            array of the integer codes
+
+        Returns
+        _______
+        np.ndarray
+            returns an array of the iids
+        """
+        return self.iids[np.asarray(codes)]
+
+    def carrier_mask(self, carriers: Iterable) -> np.ndarray:
+        """Method to build a boolean array where the value at each code is
+        True if that iid is a carrier
+        Parameters
+        __________
+        carriers : Iterable
+            iterable of the carrier iids
+
+        Returns
+        _______
+        np.ndarray
+            returns a boolean array with one value for each code
+        """
+        mask: np.ndarray = np.zeros(len(self), dtype=bool)
+
+        carrier_codes: np.ndarray = self.encode(list(carriers))
+
+        mask[carrier_codes[carrier_codes >= 0]] = True
+
+        return mask
@@ -0,0 +1,205 @@
+import numpy as np
+
+# number of segments that are summarized by each max end value
+BLOCK_SIZE: int = 256
+
+class Interval_Index:
+    """class that indexes the start and end positions of the ibd segments
+    on a chromosome. The segments are sorted by start position and the
+    maximum end position is kept for each block of segments so that only
+    the blocks that can contain a match are scanned"""
+
+    def __init__(self, start: np.ndarray, end: np.ndarray, block_size: int = BLOCK_SIZE) -> None:
+        """
+        Parameters
+        __________
+        start : np.ndarray
+            array of the start positions of each segment
+
+        end : np.ndarray
+            array of the end positions of each segment
+
+        block_size : int
+            number of segments in each block
+        """
+        start = np.asarray(start, dtype=np.int64)
+        end = np.asarray(end, dtype=np.int64)
+
+        # a stable sort keeps segments with the same start in file order
+        self.order: np.ndarray = np.argsort(start, kind="stable")
+        self.sorted_start: np.ndarray = start[self.order]
+        self.sorted_end: np.ndarray = end[self.order]
+        self.block_size: int = block_size
+        self.block_max_end: np.ndarray = self.get_block_max_end(self.sorted_end, block_size)
+
+        # the longest segment bounds how far before a position a
+        # covering segment can start
+        self.max_length: int = int((end - start).max()) if len(start) else 0
+
+    @classmethod
+    def from_arrays(cls, order: np.ndarray, sorted_start: np.ndarray, sorted_end: np.ndarray, block_max_end: np.ndarray, max_length: int, block_size: int = BLOCK_SIZE):
+        """Method to create the index from arrays that were already built.
+        This is used to load the index from the segment cache
+        Parameters
+        __________
+        order : np.ndarray
+            array of the row of each segment in the sorted order
+
+        sorted_start : np.ndarray
+            array of the start positions sorted by start
+
+        sorted_end : np.ndarray
+            array of the end positions in the same order as sorted_start
+
+        block_max_end : np.ndarray
+            array of the maximum end position in each block
+
+        max_length : int
+            length of the longest segment in base pairs
+
+        block_size : int
+            number of segments in each block
+
+        Returns
+        _______
+        Interval_Index
+            returns the index object
+        """
+        interval_index = cls.__new__(cls)
+
+        interval_index.order = order
+        interval_index.sorted_start = sorted_start
+        interval_index.sorted_end = sorted_end
+        interval_index.block_max_end = block_max_end
+        interval_index.max_length = int(max_length)
+        interval_index.block_size = int(block_size)
+
+        return interval_index
+
+    @staticmethod
+    def get_block_max_end(sorted_end: np.ndarray, block_size: int) -> np.ndarray:
+        """Method to get the maximum end position for each block of segments
+        Parameters
+        __________
+        sorted_end : np.ndarray
+            array of the end positions in start order
+
+        block_size : int
+            number of segments in each block
+
+        Returns
+        _______
+        np.ndarray
+            returns an array with the maximum end position of each block
+        """
+        if len(sorted_end) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        return np.maximum.reduceat(sorted_end, np.arange(0, len(sorted_end), block_size))
+
+    def __len__(self) -> int:
+        return len(self.sorted_start)
+
+    def query_sorted_range(self, lower: int, upper: int, min_end: int, inclusive: bool) -> np.ndarray:
+        """Method to find the segments between two positions in the sorted
+        order that end after min_end
+        Parameters
+        __________
+        lower : int
+            first position in the sorted order to check
+
+        upper : int
+            position in the sorted order to stop at
+
+        min_end : int
+            base position that the segment has to end after
+
+        inclusive : bool
+            if True then segments that end at min_end are kept
+
+        Returns
+        _______
+        np.ndarray
+            returns the rows of the matching segments in file order
+        """
+        if upper <= lower:
+            return np.empty(0, dtype=np.int64)
+
+        first_block: int = lower // self.block_size
+        last_block: int = (upper - 1) // self.block_size
+
+        block_max: np.ndarray = self.block_max_end[first_block:last_block + 1]
+
+        # only the blocks that have a segment ending after min_end are
+        # scanned
+        if inclusive:
+            kept_blocks: np.ndarray = np.flatnonzero(block_max >= min_end) + first_block
+        else:
+            kept_blocks = np.flatnonzero(block_max > min_end) + first_block
+
+        if len(kept_blocks) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        candidates: np.ndarray = (kept_blocks[:, None] * self.block_size + np.arange(self.block_size)[None, :]).ravel()
+
+        candidates = candidates[(candidates >= lower) & (candidates < upper)]
+
+        candidate_end: np.ndarray = self.sorted_end[candidates]
+
+        if inclusive:
+            matches: np.ndarray = candidates[candidate_end >= min_end]
+        else:
+            matches = candidates[candidate_end > min_end]
+
+        return np.sort(self.order[matches])
+
+    def covering(self, position: int, inclusive: bool = False) -> np.ndarray:
+        """Method to find all the segments that cover a base position
+        Parameters
+        __________
+        position : int
+            base position of the variant
+
+        inclusive : bool
+            if True then segments that start or end at the position are
+            kept. If False then the position has to be strictly between the
+            start and end like in filter_for_correct_base_pair. This value
+            is False by default
+
+        Returns
+        _______
+        np.ndarray
+            returns the rows of the segments in file order
+        """
+        position = int(position)
+
+        upper: int = int(np.searchsorted(self.sorted_start, position, side="right" if inclusive else "left"))
+
+        lower: int = int(np.searchsorted(self.sorted_start, position - self.max_length, side="left"))
+
+        return self.query_sorted_range(lower, upper, position, inclusive)
+
+    def overlapping(self, window_start: int, window_end: int) -> np.ndarray:
+        """Method to find all the segments that overlap a window such as a
+        gene. This matches the rows kept by filter_for_gene_site
+        Parameters
+        __________
+        window_start : int
+            base position where the window starts
+
+        window_end : int
+            base position where the window ends
+
+        Returns
+        _______
+        np.ndarray
+            returns the rows of the segments in file order
+        """
+        window_start = int(window_start)
+        window_end = int(window_end)
+
+        upper: int = int(np.searchsorted(self.sorted_start, window_end, side="right"))
+
+        lower: int = int(np.searchsorted(self.sorted_start, window_start - self.max_length, side="left"))
+
+        return self.query_sorted_range(lower, upper, window_start, True)
@@ -0,0 +1,244 @@
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .iid_encoder import IID_Encoder
+
+class Pair_Index:
+    """class that indexes the segments of an ibd file by pair. Each segment
+    gets a key from the smaller and the larger id code of the pair and the
+    rows are sorted by this key so that the segments for a pair are found
+    with a binary search instead of scanning the whole file"""
+
+    def __init__(self, id1_codes: np.ndarray, id2_codes: np.ndarray, iid_encoder: IID_Encoder, column_dict: Dict[int, np.ndarray], id_columns: Tuple[int, int]) -> None:
+        """
+        Parameters
+        __________
+        id1_codes : np.ndarray
+            array of the id1 code of each segment
+
+        id2_codes : np.ndarray
+            array of the id2 code of each segment
+
+        iid_encoder : IID_Encoder
+            encoder that was used to get the id codes
+
+        column_dict : Dict[int, np.ndarray]
+            dictionary where the keys are the raw column indices and the
+            values are the arrays of the segment information such as the
+            phase, start, end, and length
+
+        id_columns : Tuple[int, int]
+            raw column indices of id1 and id2
+        """
+        pair_keys: np.ndarray = self.get_pair_keys(id1_codes, id2_codes, len(iid_encoder))
+
+        # a stable sort keeps the segments of each pair in file order
+        order: np.ndarray = np.argsort(pair_keys, kind="stable")
+
+        self.set_arrays(order, pair_keys[order], id1_codes, id2_codes, iid_encoder, column_dict, id_columns)
+
+    @classmethod
+    def from_arrays(cls, order: np.ndarray, sorted_keys: np.ndarray, id1_codes: np.ndarray, id2_codes: np.ndarray, iid_encoder: IID_Encoder, column_dict: Dict[int, np.ndarray], id_columns: Tuple[int, int]):
+        """Method to create the index from arrays that were already built.
+        This is used to load the index from the segment cache
+        Parameters
+        __________
+        order : np.ndarray
+            array of the row of each segment in key order
+
+        sorted_keys : np.ndarray
+            array of the pair keys in sorted order
+
+        id1_codes : np.ndarray
+            array of the id1 code of each segment in file order
+
+        id2_codes : np.ndarray
+            array of the id2 code of each segment in file order
+
+        iid_encoder : IID_Encoder
+            encoder that was used to get the id codes
+
+        column_dict : Dict[int, np.ndarray]
+            dictionary of the segment information columns in file order
+
+        id_columns : Tuple[int, int]
+            raw column indices of id1 and id2
+
+        Returns
+        _______
+        Pair_Index
+            returns the index object
+        """
+        pair_index = cls.__new__(cls)
+
+        pair_index.set_arrays(order, sorted_keys, id1_codes, id2_codes, iid_encoder, column_dict, id_columns)
+
+        return pair_index
+
+    def set_arrays(self, order: np.ndarray, sorted_keys: np.ndarray, id1_codes: np.ndarray, id2_codes: np.ndarray, iid_encoder: IID_Encoder, column_dict: Dict[int, np.ndarray], id_columns: Tuple[int, int]):
+        """Method to set the attributes of the index"""
+
+        self.order: np.ndarray = order
+        self.sorted_keys: np.ndarray = sorted_keys
+        self.id1_codes: np.ndarray = id1_codes
+        self.id2_codes: np.ndarray = id2_codes
+        self.iid_encoder: IID_Encoder = iid_encoder
+        self.column_dict: Dict[int, np.ndarray] = column_dict
+        self.id_columns: Tuple[int, int] = id_columns
+
+    @staticmethod
+    def get_pair_keys(id1_codes: np.ndarray, id2_codes: np.ndarray, n_codes: int) -> np.ndarray:
+        """Method to get the key for each pair from the smaller and the
+        larger id code so that both orders of a pair have the same key
+        Parameters
+        __________
+        id1_codes : np.ndarray
+            array of the id1 codes
+
+        id2_codes : np.ndarray
+            array of the id2 codes
+
+        n_codes : int
+            number of codes in the encoder
+
+        Returns
+        _______
+        np.ndarray
+            returns an int64 array of the pair keys
+        """
+        id1_codes = np.asarray(id1_codes, dtype=np.int64)
+        id2_codes = np.asarray(id2_codes, dtype=np.int64)
+
+        return np.minimum(id1_codes, id2_codes) * n_codes + np.maximum(id1_codes, id2_codes)
+
+    def __len__(self) -> int:
+        return len(self.sorted_keys)
+
+    def get_pair_rows(self, pair_1: str, pair_2: str) -> np.ndarray:
+        """Method to get the rows of the segments for a pair. The rows where
+        pair_1 is id1 and pair_2 is id2 are returned and if there are none
+        then the rows where the ids are switched are returned
+        Parameters
+        __________
+        pair_1 : str
+            string of the first iid in the pair
+
+        pair_2 : str
+            string of the second iid in the pair
+
+        Returns
+        _______
+        np.ndarray
+            returns the rows of the segments in file order
+        """
+        pair_1_code, pair_2_code = self.iid_encoder.encode([pair_1, pair_2])
+
+        if pair_1_code == -1 or pair_2_code == -1:
+            return np.empty(0, dtype=np.int64)
+
+        pair_key: int = min(pair_1_code, pair_2_code) * len(self.iid_encoder) + max(pair_1_code, pair_2_code)
+
+        lower: int = int(np.searchsorted(self.sorted_keys, pair_key, side="left"))
+        upper: int = int(np.searchsorted(self.sorted_keys, pair_key, side="right"))
+
+        rows: np.ndarray = np.asarray(self.order[lower:upper])
+
+        # keeping the order of the pair that was asked for first
+        in_order_rows: np.ndarray = rows[(self.id1_codes[rows] == pair_1_code) & (self.id2_codes[rows] == pair_2_code)]
+
+        if len(in_order_rows) > 0:
+            return in_order_rows
+
+        return rows[(self.id1_codes[rows] == pair_2_code) & (self.id2_codes[rows] == pair_1_code)]
+
+    def get_pair_segments(self, pair_1: str, pair_2: str) -> pd.DataFrame:
+        """Method to get a dataframe of the segments for a pair. The columns
+        of the dataframe are the raw column indices so it can be used in
+        place of filtering the dataframe of the whole ibd file
+        Parameters
+        __________
+        pair_1 : str
+            string of the first iid in the pair
+
+        pair_2 : str
+            string of the second iid in the pair
+
+        Returns
+        _______
+        pd.DataFrame
+            returns a dataframe of the segments for the pair
+        """
+        return self.get_rows_df(self.get_pair_rows(pair_1, pair_2))
+
+    def get_pairs_segments(self, pair_1_list: Iterable, pair_2_list: Iterable) -> pd.DataFrame:
+        """Method to get a dataframe of the segments for many pairs at once.
+        The segments of both orders of each pair are returned in file order
+        so that the caller can join them to the pairs
+        Parameters
+        __________
+        pair_1_list : Iterable
+            iids of the first iid in each pair
+
+        pair_2_list : Iterable
+            iids of the second iid in each pair
+
+        Returns
+        _______
+        pd.DataFrame
+            returns a dataframe of the segments for the pairs with the raw 
+            column indices as the columns
+        """
+        pair_1_codes: np.ndarray = self.iid_encoder.encode(pair_1_list)
+        pair_2_codes: np.ndarray = self.iid_encoder.encode(pair_2_list)
+
+        # pairs with an iid that is not in the file have no segments
+        known_pairs: np.ndarray = (pair_1_codes != -1) & (pair_2_codes != -1)
+
+        pair_keys: np.ndarray = np.unique(self.get_pair_keys(pair_1_codes[known_pairs], pair_2_codes[known_pairs], len(self.iid_encoder)))
+
+        lower: np.ndarray = np.searchsorted(self.sorted_keys, pair_keys, side="left")
+        upper: np.ndarray = np.searchsorted(self.sorted_keys, pair_keys, side="right")
+
+        range_lengths: np.ndarray = upper - lower
+
+        # getting every position between lower and upper for each key 
+        # without looping over the keys
+        range_starts: np.ndarray = np.repeat(lower - np.cumsum(range_lengths) + range_lengths, range_lengths)
+
+        positions: np.ndarray = range_starts + np.arange(range_lengths.sum())
+
+        rows: np.ndarray = np.sort(np.asarray(self.order)[positions])
+
+        return self.get_rows_df(rows)
+
+    def get_rows_df(self, rows: np.ndarray) -> pd.DataFrame:
+        """Method to form a dataframe of the segments at the provided rows
+        Parameters
+        __________
+        rows : np.ndarray
+            array of the rows of the segments
+
+        Returns
+        _______
+        pd.DataFrame
+            returns a dataframe where the columns are the raw column indices
+        """
+        df_dict: dict = {
+            self.id_columns[0]: self.iid_encoder.decode(self.id1_codes[rows]).astype(object),
+            self.id_columns[1]: self.iid_encoder.decode(self.id2_codes[rows]).astype(object)
+        }
+
+        for column_indx, values in self.column_dict.items():
+
+            values = np.asarray(values[rows])
+
+            # the fixed width strings are converted back to objects to
+            # match the output of pd.read_csv
+            if values.dtype.kind == "U":
+                values = values.astype(object)
+
+            df_dict[column_indx] = values
+
+        return pd.DataFrame(df_dict)
@@ -0,0 +1,1000 @@
+import os
+import json
+import zlib
+from collections import OrderedDict
+import multiprocessing as mp
+from functools import partial
+from typing import Dict, List, Iterator
+
+import numpy as np
+import pandas as pd
+
+from ..generate_indx_dict.generate_dict import Hapibd_Indices, Ilash_Indices
+from .interval_index import Interval_Index
+from .iid_encoder import IID_Encoder
+from .pair_index import Pair_Index
+
+# version of the cache layout. If the way the columns are stored
+# changes then this number needs to be increased so that old caches
+# are rebuilt
+CACHE_VERSION: int = 5
+
+# name of the file that has the information about the source file
+META_FILE: str = "meta.json"
+
+# name of the file that has the iids in the ibd file that are not in the
+# global iid dictionary
+EXTRA_IIDS_FILE: str = "extra_iids.npy"
+
+# names of the files that store the interval index
+INTERVAL_FILES: Dict[str, str] = {
+    "order": "interval_order.npy",
+    "sorted_start": "interval_start.npy",
+    "sorted_end": "interval_end.npy",
+    "block_max_end": "interval_block_max.npy"
+}
+
+# names of the files that store the pair index
+PAIR_INDEX_FILES: Dict[str, str] = {
+    "order": "pair_order.npy",
+    "sorted_keys": "pair_keys.npy"
+}
+
+# columns of the segment information that are returned by the pair index
+PAIR_INDEX_COLUMNS: List[str] = ["phase1", "phase2", "start", "end", "cM"]
+
+# maximum number of pair indices that are kept loaded in a process. This 
+# is enough for the hapibd and ilash files of two chromosomes
+MAX_LOADED_PAIR_INDICES: int = 4
+
+# dictionary of the pair indices that are loaded in this process where 
+# the keys are the ibd program and the ibd file
+LOADED_PAIR_INDICES: "OrderedDict[tuple, Pair_Index]" = OrderedDict()
+
+# peak number of bytes for each row of the ibd file while read_pair_index 
+# parses the text file. Most of this is the object columns of the 
+# dataframe and the temporary unicode arrays of the ids
+TEXT_INDEX_BYTES_PER_ROW: int = 600
+
+# number of compressed bytes that are read from the start of an ibd file to 
+# estimate the number of rows in the file
+ROW_SAMPLE_BYTES: int = 1048576
+
+def get_cache_layout(ibd_program: str) -> Dict[str, int]:
+    """Function to get the names of the columns that are used from the
+    ibd files and the index of each column in the raw file
+    Parameters
+    __________
+    ibd_program : str
+        string containing the ibd program that the input is coming from.
+        This value should be ilash or hapibd
+
+    Returns
+    _______
+    dict
+        returns a dictionary where the keys are the column names and the
+        values are the column indices
+    """
+    ibd_handler_dict: dict = {
+        "hapibd": Hapibd_Indices,
+        "ilash": Ilash_Indices
+    }
+
+    if ibd_program.lower() not in ibd_handler_dict:
+        raise ValueError(f"The segment cache only supports hapibd and ilash files, not {ibd_program}")
+
+    param_class = ibd_handler_dict[ibd_program.lower()](ibd_program)
+
+    param_class.update_indices()
+
+    param_dict: dict = param_class.return_param_dict()
+
+    # the phase columns are right after each id in both programs
+    return {
+        "id1": param_dict["id1_indx"],
+        "phase1": param_dict["id1_indx"] + 1,
+        "id2": param_dict["id2_indx"],
+        "phase2": param_dict["id2_indx"] + 1,
+        "chr": param_dict["chr_indx"],
+        "start": param_dict["str_indx"],
+        "end": param_dict["end_indx"],
+        "cM": param_dict["cM_indx"]
+    }
+
+class Segment_Cache:
+    """class that converts the hapibd .ibd.gz files or the ilash .match.gz
+    files into a directory of typed .npy columns so that the text file only
+    has to be parsed once"""
+
+    def __init__(self, cache_dir: str, ibd_program: str) -> None:
+        """
+        Parameters
+        __________
+        cache_dir : str
+            directory that the cached columns will be written to
+
+        ibd_program : str
+            ibd program that the segment files come from. This value
+            should be ilash or hapibd
+        """
+        self.cache_dir: str = cache_dir
+        self.ibd_program: str = ibd_program.lower()
+        self.layout: Dict[str, int] = get_cache_layout(self.ibd_program)
+
+        # the id columns are stored as codes from the global iid dictionary
+        self.iid_encoder: IID_Encoder = IID_Encoder.load(cache_dir)
+        self.encoded_columns: List[int] = [self.layout["id1"], self.layout["id2"]]
+
+        # dictionary of the encoder for each ibd file so that the extra
+        # iids are only loaded once
+        self.file_encoders: Dict[str, IID_Encoder] = {}
+
+    def get_cache_path(self, ibd_file: str) -> str:
+        """Method to get the directory that the columns for a specific ibd
+        file are stored in
+        Parameters
+        __________
+        ibd_file : str
+            filepath to the ibd file
+
+        Returns
+        _______
+        str
+            returns the path to the cache directory for that file
+        """
+        return os.path.join(self.cache_dir, self.ibd_program, "".join([os.path.basename(ibd_file), ".cache"]))
+
+    @staticmethod
+    def get_source_info(ibd_file: str) -> dict:
+        """Method to get the modification time and the size of the source
+        file. These values are used to tell if the cache is out of date
+        Parameters
+        __________
+        ibd_file : str
+            filepath to the ibd file
+
+        Returns
+        _______
+        dict
+            returns a dictionary with the keys mtime and size
+        """
+        file_stats = os.stat(ibd_file)
+
+        return {"mtime": file_stats.st_mtime_ns, "size": file_stats.st_size}
+
+    def read_meta(self, ibd_file: str) -> dict:
+        """Method to read the meta.json file for the cached ibd file
+        Parameters
+        __________
+        ibd_file : str
+            filepath to the ibd file
+
+        Returns
+        _______
+        dict
+            returns the contents of the meta.json file or an empty
+            dictionary if the file does not exist
+        """
+        meta_path: str = os.path.join(self.get_cache_path(ibd_file), META_FILE)
+
+        if not os.path.exists(meta_path):
+            return {}
+
+        with open(meta_path, "r") as meta_file:
+            return json.load(meta_file)
+
+    def is_valid(self, ibd_file: str) -> bool:
+        """Method to check if the cache for the ibd file exist and was built
+        from the current version of the ibd file
+        Parameters
+        __________
+        ibd_file : str
+            filepath to the ibd file
+
+        Returns
+        _______
+        bool
+            returns True if the cache can be used and False if it has to be
+            rebuilt
+        """
+        meta_dict: dict = self.read_meta(ibd_file)
+
+        if not meta_dict:
+            return False
+
+        # the cache is also out of date if the iid dictionary changed since 
+        # the codes would point to different iids
+        return meta_dict.get("version") == CACHE_VERSION and meta_dict.get("source") == self.get_source_info(ibd_file) and meta_dict.get("iid_checksum") == IID_Encoder.load_checksum(self.cache_dir)
+
+    def get_dtypes(self) -> dict:
+        """Method to get the dtype that each column in the layout is read
+        in as
+
+        Returns
+        _______
+        dict
+            returns a dictionary where the keys are the column indices and
+            the values are the dtypes
+        """
+        return {
+            self.layout["id1"]: str,
+            self.layout["phase1"]: str,
+            self.layout["id2"]: str,
+            self.layout["phase2"]: str,
+            self.layout["start"]: np.int64,
+            self.layout["end"]: np.int64,
+            self.layout["cM"]: np.float64
+        }
+
+    def get_cached_columns(self) -> List[int]:
+        """Method to get the raw indices of the columns that are kept in the
+        cache. Only the columns in the layout are stored
+
+        Returns
+        _______
+        List[int]
+            returns a sorted list of the column indices
+        """
+        return sorted(self.layout.values())
+
+    def encode_ids(self, iid_values: np.ndarray, extra_iid_dict: Dict[str, int]) -> np.ndarray:
+        """Method to convert the iids of a chunk into codes. Iids that are
+        not in the global iid dictionary are given the next code after the
+        global codes and the extra iids found so far
+        Parameters
+        __________
+        iid_values : np.ndarray
+            array of the iids in the chunk
+
+        extra_iid_dict : Dict[str, int]
+            dictionary where the keys are the iids that are not in the
+            global dictionary and the values are their codes. The new iids
+            from the chunk are added to this dictionary
+
+        Returns
+        _______
+        np.ndarray
+            returns an int32 array of the codes
+        """
+        codes: np.ndarray = self.iid_encoder.encode(iid_values)
+
+        missing_mask: np.ndarray = codes == -1
+
+        if missing_mask.any():
+
+            # only the unique missing iids are looked up in the dictionary
+            missing_codes, missing_iids = pd.factorize(iid_values[missing_mask])
+
+            for iid in missing_iids.tolist():
+                extra_iid_dict.setdefault(iid, len(self.iid_encoder) + len(extra_iid_dict))
+
+            codes[missing_mask] = np.array([extra_iid_dict[iid] for iid in missing_iids.tolist()], dtype=np.int32)[missing_codes]
+
+        return codes
+
+    @staticmethod
+    def merge_column_parts(cache_path: str, column: int, part_count: int) -> int:
+        """Method to merge the .npy files that were written for each chunk
+        of a column into one .npy file. The parts are copied into a memory
+        mapped file one at a time and then removed
+        Parameters
+        __________
+        cache_path : str
+            path to the cache directory for the ibd file
+
+        column : int
+            raw index of the column
+
+        part_count : int
+            number of chunks that were written for the column
+
+        Returns
+        _______
+        int
+            returns the number of rows in the column
+        """
+        part_path_list: List[str] = [os.path.join(cache_path, f"{column}.part{part_number}.npy") for part_number in range(part_count)]
+
+        part_list: List[np.ndarray] = [np.load(part_path, mmap_mode="r") for part_path in part_path_list]
+
+        n_rows: int = sum(len(part) for part in part_list)
+
+        # the fixed width strings can be wider in later chunks so the
+        # widest dtype of the parts is used
+        column_array: np.ndarray = np.lib.format.open_memmap(
+            os.path.join(cache_path, f"{column}.npy"),
+            mode="w+",
+            dtype=np.result_type(*[part.dtype for part in part_list]),
+            shape=(n_rows,))
+
+        row_start: int = 0
+
+        for part in part_list:
+
+            column_array[row_start:row_start + len(part)] = part
+
+            row_start += len(part)
+
+        column_array.flush()
+
+        del column_array, part_list
+
+        for part_path in part_path_list:
+            os.remove(part_path)
+
+        return n_rows
+
+    def build(self, ibd_file: str, chunksize: int = 1000000) -> str:
+        """Method to parse the ibd file and write each column to a .npy
+        file. Each chunk is written to disk as it is read so only one chunk 
+        is kept in memory. The meta.json file is written last so a build 
+        that fails part way through is never seen as valid
+        Parameters
+        __________
+        ibd_file : str
+            filepath to the ibd file
+
+        chunksize : int
+            number of rows to read from the ibd file at a time
+
+        Returns
+        _______
+        str
+            returns the path to the cache directory
+        """
+        cache_path: str = self.get_cache_path(ibd_file)
+
+        os.makedirs(cache_path, exist_ok=True)
+
+        # removing the old meta file so that the cache is invalid
+        # while it is being rebuilt
+        if os.path.exists(os.path.join(cache_path, META_FILE)):
+            os.remove(os.path.join(cache_path, META_FILE))
+
+        source_info: dict = self.get_source_info(ibd_file)
+
+        cached_columns: List[int] = self.get_cached_columns()
+
+        # dictionary of the iids that are not in the cohort where the values
+        # are the codes after the global codes. The file encoder is only
+        # built once every chunk has been read
+        extra_iid_dict: Dict[str, int] = {}
+
+        part_count: int = 0
+
+        for chunk in pd.read_csv(ibd_file, sep="\t", header=None, usecols=cached_columns, dtype=self.get_dtypes(), chunksize=chunksize):
+
+            for column in cached_columns:
+
+                # the ids are converted to int32 codes
+                if column in self.encoded_columns:
+                    values: np.ndarray = self.encode_ids(chunk[column].to_numpy(), extra_iid_dict)
+
+                else:
+                    values = chunk[column].to_numpy()
+
+                # other strings are stored as fixed width unicode so the
+                # .npy files can be memory mapped
+                if values.dtype.kind == "O":
+                    values = values.astype(str)
+
+                np.save(os.path.join(cache_path, f"{column}.part{part_count}.npy"), values)
+
+            part_count += 1
+
+        # the codes of the extra iids are in the order that they were found
+        extra_iids: np.ndarray = np.array(list(extra_iid_dict.keys()), dtype=str)
+
+        np.save(os.path.join(cache_path, EXTRA_IIDS_FILE), extra_iids)
+
+        file_encoder: IID_Encoder = IID_Encoder(np.concatenate([self.iid_encoder.iids, extra_iids]))
+
+        n_rows: int = 0
+
+        for column in cached_columns:
+            n_rows = self.merge_column_parts(cache_path, column, part_count)
+
+        # building the interval index over the start and end positions
+        # so that position queries do not have to scan every segment
+        interval_index: Interval_Index = Interval_Index(
+            np.load(os.path.join(cache_path, f"{self.layout['start']}.npy"), mmap_mode="r"),
+            np.load(os.path.join(cache_path, f"{self.layout['end']}.npy"), mmap_mode="r"))
+
+        for attribute, file_name in INTERVAL_FILES.items():
+            np.save(os.path.join(cache_path, file_name), getattr(interval_index, attribute))
+
+        # building the pair index over the id codes so that the segments 
+        # of a pair can be found without scanning every segment
+        pair_keys: np.ndarray = Pair_Index.get_pair_keys(
+            np.load(os.path.join(cache_path, f"{self.layout['id1']}.npy"), mmap_mode="r"),
+            np.load(os.path.join(cache_path, f"{self.layout['id2']}.npy"), mmap_mode="r"),
+            len(file_encoder))
+
+        pair_order: np.ndarray = np.argsort(pair_keys, kind="stable")
+
+        np.save(os.path.join(cache_path, PAIR_INDEX_FILES["order"]), pair_order)
+        np.save(os.path.join(cache_path, PAIR_INDEX_FILES["sorted_keys"]), pair_keys[pair_order])
+
+        meta_dict: dict = {
+            "version": CACHE_VERSION,
+            "source": source_info,
+            "ibd_program": self.ibd_program,
+            "layout": self.layout,
+            "columns": cached_columns,
+            "n_rows": n_rows,
+            "iid_checksum": IID_Encoder.load_checksum(self.cache_dir),
+            "n_global_iids": len(self.iid_encoder),
+            "interval_index": {
+                "max_length": interval_index.max_length,
+                "block_size": interval_index.block_size
+            }
+        }
+
+        # writing to a temporary file first and then renaming so that the
+        # meta file is never partially written
+        with open(os.path.join(cache_path, "".join([META_FILE, ".tmp"])), "w") as meta_file:
+            json.dump(meta_dict, meta_file)
+
+        os.replace(os.path.join(cache_path, "".join([META_FILE, ".tmp"])), os.path.join(cache_path, META_FILE))
+
+        return cache_path
+
+    def build_if_needed(self, ibd_file: str) -> str:
+        """Method to build the cache only if it is missing or out of date
+        Parameters
+        __________
+        ibd_file : str
+            filepath to the ibd file
+
+        Returns
+        _______
+        str
+            returns the path to the cache directory
+        """
+        if not self.is_valid(ibd_file):
+            return self.build(ibd_file)
+
+        return self.get_cache_path(ibd_file)
+
+    def get_file_encoder(self, ibd_file: str) -> IID_Encoder:
+        """Method to get the encoder for the codes in a cached ibd file. This 
+        is the global iid dictionary with the extra iids from the file added 
+        to the end
+        Parameters
+        __________
+        ibd_file : str
+            filepath to the ibd file
+
+        Returns
+        _______
+        IID_Encoder
+            returns the encoder for the file
+        """
+        cache_path: str = self.build_if_needed(ibd_file)
+
+        if cache_path not in self.file_encoders:
+
+            extra_iids: np.ndarray = np.load(os.path.join(cache_path, EXTRA_IIDS_FILE))
+
+            self.file_encoders[cache_path] = IID_Encoder(np.concatenate([self.iid_encoder.iids, extra_iids]))
+
+        return self.file_encoders[cache_path]
+
+    def get_column_indices(self, columns: List[str]) -> List[int]:
+        """Method to convert a list of column names or raw indices into the
+        raw column indices
+        Parameters
+        __________
+        columns : List[str]
+            list of the column names from the layout. Integers are treated
+            as raw column indices. If None then every cached column is used
+
+        Returns
+        _______
+        List[int]
+            returns a list of the column indices
+        """
+        if columns is None:
+            return self.get_cached_columns()
+
+        return [self.layout[column] if column in self.layout else int(column) for column in columns]
+
+    def load_columns(self, ibd_file: str, columns: List[str] = None) -> Dict[int, np.ndarray]:
+        """Method to load the columns from the cache as memory mapped arrays.
+        The cache will be built if it is missing or out of date
+        Parameters
+        __________
+        ibd_file : str
+            filepath to the ibd file
+
+        columns : List[str]
+            list of the column names from the layout or raw column indices.
+            If None then every cached column is loaded
+
+        Returns
+        _______
+        dict
+            returns a dictionary where the keys are the raw column indices
+            and the values are the memory mapped arrays
+        """
+        cache_path: str = self.build_if_needed(ibd_file)
+
+        return {
+            column_indx: np.load(os.path.join(cache_path, f"{column_indx}.npy"), mmap_mode="r")
+            for column_indx in self.get_column_indices(columns)
+        }
+
+    def load_interval_index(self, ibd_file: str) -> Interval_Index:
+        """Method to load the interval index for the ibd file from the cache. 
+        The cache will be built if it is missing or out of date
+        Parameters
+        __________
+        ibd_file : str
+            filepath to the ibd file
+
+        Returns
+        _______
+        Interval_Index
+            returns the interval index with memory mapped arrays
+        """
+        cache_path: str = self.build_if_needed(ibd_file)
+
+        index_info: dict = self.read_meta(ibd_file)["interval_index"]
+
+        array_dict: Dict[str, np.ndarray] = {
+            attribute: np.load(os.path.join(cache_path, file_name), mmap_mode="r")
+            for attribute, file_name in INTERVAL_FILES.items()
+        }
+
+        return Interval_Index.from_arrays(max_length=index_info["max_length"], block_size=index_info["block_size"], **array_dict)
+
+    def load_pair_index(self, ibd_file: str) -> Pair_Index:
+        """Method to load the pair index for the ibd file from the cache. 
+        The cache will be built if it is missing or out of date
+        Parameters
+        __________
+        ibd_file : str
+            filepath to the ibd file
+
+        Returns
+        _______
+        Pair_Index
+            returns the pair index with memory mapped arrays
+        """
+        cache_path: str = self.build_if_needed(ibd_file)
+
+        id_dict: Dict[int, np.ndarray] = self.load_columns(ibd_file, ["id1", "id2"])
+
+        array_dict: Dict[str, np.ndarray] = {
+            attribute: np.load(os.path.join(cache_path, file_name), mmap_mode="r")
+            for attribute, file_name in PAIR_INDEX_FILES.items()
+        }
+
+        return Pair_Index.from_arrays(
+            id1_codes=id_dict[self.layout["id1"]],
+            id2_codes=id_dict[self.layout["id2"]],
+            iid_encoder=self.get_file_encoder(ibd_file),
+            column_dict=self.load_columns(ibd_file, PAIR_INDEX_COLUMNS),
+            id_columns=(self.layout["id1"], self.layout["id2"]),
+            **array_dict)
+
+    def get_pair_index_nbytes(self, ibd_file: str) -> int:
+        """Method to get the number of bytes of the cached arrays that are
+        used by the pair index of the ibd file
+        Parameters
+        __________
+        ibd_file : str
+            filepath to the ibd file
+
+        Returns
+        _______
+        int
+            returns the total size of the id, segment information, and pair 
+            index .npy files
+        """
+        cache_path: str = self.get_cache_path(ibd_file)
+
+        file_list: List[str] = [f"{column_indx}.npy" for column_indx in self.get_column_indices(["id1", "id2"] + PAIR_INDEX_COLUMNS)] + list(PAIR_INDEX_FILES.values())
+
+        return sum(os.path.getsize(os.path.join(cache_path, file_name)) for file_name in file_list)
+
+    def query_rows(self, ibd_file: str, positions: List[int] = None, windows: List[tuple] = None) -> np.ndarray:
+        """Method to get the rows of the segments that cover any of the 
+        positions or overlap any of the windows
+        Parameters
+        __________
+        ibd_file : str
+            filepath to the ibd file
+
+        positions : List[int]
+            list of base positions. Segments have to strictly cover the 
+            position like in filter_for_correct_base_pair
+
+        windows : List[tuple]
+            list of tuples of the start and end position of each window
+
+        Returns
+        _______
+        np.ndarray
+            returns the sorted rows of the matching segments
+        """
+        interval_index: Interval_Index = self.load_interval_index(ibd_file)
+
+        row_list: List[np.ndarray] = [np.empty(0, dtype=np.int64)]
+
+        for position in positions or []:
+            row_list.append(interval_index.covering(position))
+
+        for window_start, window_end in windows or []:
+            row_list.append(interval_index.overlapping(window_start, window_end))
+
+        return np.unique(np.concatenate(row_list))
+
+    def load_segments(self, ibd_file: str, columns: List[str] = None, row_mask: np.ndarray = None) -> pd.DataFrame:
+        """Method to load the cached columns into a dataframe. The columns
+        of the dataframe are the raw column indices so it can be used
+        in place of a dataframe from pd.read_csv(header=None)
+        Parameters
+        __________
+        ibd_file : str
+            filepath to the ibd file
+
+        columns : List[str]
+            list of the column names from the layout or raw column indices.
+            If None then every cached column is loaded
+
+        row_mask : np.ndarray
+            boolean array that selects the rows to load. If None then every
+            row is loaded
+
+        Returns
+        _______
+        pd.DataFrame
+            returns a dataframe of the selected rows and columns
+        """
+        column_dict: Dict[int, np.ndarray] = self.load_columns(ibd_file, columns)
+
+        return self.form_dataframe(column_dict, row_mask, self.get_file_encoder(ibd_file))
+
+    def form_dataframe(self, column_dict: Dict[int, np.ndarray], row_mask: np.ndarray = None, file_encoder: IID_Encoder = None) -> pd.DataFrame:
+        """Method to build a dataframe from the memory mapped columns
+        Parameters
+        __________
+        column_dict : dict
+            dictionary where the keys are the raw column indices and the
+            values are the memory mapped arrays
+
+        row_mask : np.ndarray
+            boolean array or array of row positions that selects the rows.
+            If None then every row is used
+
+        file_encoder : IID_Encoder
+            encoder used to convert the id codes back into iids. If None 
+            then the codes are returned
+
+        Returns
+        _______
+        pd.DataFrame
+            returns a dataframe of the selected rows where string columns
+            are converted back to python strings
+        """
+        df_dict: dict = {}
+
+        for column_indx, values in column_dict.items():
+
+            if row_mask is not None:
+                values = values[row_mask]
+
+            if file_encoder is not None and column_indx in self.encoded_columns:
+                values = file_encoder.decode(values)
+
+            # the fixed width strings are converted back to objects to
+            # match the output of pd.read_csv
+            if values.dtype.kind == "U":
+                values = values.astype(object)
+            else:
+                values = np.asarray(values)
+
+            df_dict[column_indx] = values
+
+        return pd.DataFrame(df_dict)
+
+    def iter_segments(self, ibd_file: str, columns: List[str] = None, carriers: Iterator = None, min_cM: float = None, chunksize: int = 1000000, positions: List[int] = None, windows: List[tuple] = None, decode_ids: bool = True) -> Iterator[pd.DataFrame]:
+        """Generator that yields dataframes of only the rows that have a
+        carrier and are at least min_cM long. This is used in place of
+        reading the ibd file in chunks
+        Parameters
+        __________
+        ibd_file : str
+            filepath to the ibd file
+
+        columns : List[str]
+            list of the column names from the layout or raw column indices.
+            If None then every cached column is loaded
+
+        carriers : Iterator
+            iterable of the iids that are carriers. If None then rows are
+            not filtered by carrier
+
+        min_cM : float
+            minimum centimorgan threshold. If None then rows are not
+            filtered by length
+
+        chunksize : int
+            maximum number of rows in each dataframe
+
+        positions : List[int]
+            list of base positions. If provided then only the segments that 
+            cover one of the positions are checked
+
+        windows : List[tuple]
+            list of the start and end of each window. If provided then only 
+            the segments that overlap one of the windows are checked
+
+        decode_ids : bool
+            if True then the id codes are converted back into the iids. If 
+            False then the id columns are the int32 codes of the file 
+            encoder so the caller can filter the rows before decoding. This 
+            value is True by default
+
+        Returns
+        _______
+        Iterator[pd.DataFrame]
+            yields dataframes where the columns are the raw column indices
+        """
+        filter_dict: Dict[int, np.ndarray] = self.load_columns(ibd_file, ["id1", "id2", "cM"])
+
+        # using the interval index to get the candidate rows if there are
+        # positions or windows. Otherwise every row is a candidate
+        if positions or windows:
+            row_positions: np.ndarray = self.query_rows(ibd_file, positions, windows)
+        else:
+            row_positions = np.arange(len(filter_dict[self.layout["cM"]]))
+
+        row_mask: np.ndarray = np.ones(len(row_positions), dtype=bool)
+
+        if min_cM is not None:
+            row_mask &= filter_dict[self.layout["cM"]][row_positions] >= float(min_cM)
+
+        file_encoder: IID_Encoder = self.get_file_encoder(ibd_file)
+
+        # carrier membership is checked by looking up the id codes in a 
+        # boolean array
+        if carriers is not None:
+            carrier_mask: np.ndarray = file_encoder.carrier_mask(carriers)
+
+            row_mask &= carrier_mask[filter_dict[self.layout["id1"]][row_positions]] | carrier_mask[filter_dict[self.layout["id2"]][row_positions]]
+
+        row_positions = row_positions[row_mask]
+
+        column_dict: Dict[int, np.ndarray] = self.load_columns(ibd_file, columns)
+
+        for chunk_start in range(0, len(row_positions), chunksize):
+
+            yield self.form_dataframe(column_dict, row_positions[chunk_start:chunk_start + chunksize], file_encoder if decode_ids else None)
+
+def read_pair_index(ibd_file: str, ibd_program: str) -> Pair_Index:
+    """Function to build the pair index from the text ibd file when there 
+    is no segment cache. Only the id and segment information columns are 
+    read but every row of the file is parsed and kept in memory by the 
+    worker, so the cache should be used for large cohorts
+    Parameters
+    __________
+    ibd_file : str
+        filepath to the ibd file
+
+    ibd_program : str
+        ibd program that the file comes from. This will be either hapibd or 
+        ilash
+
+    Returns
+    _______
+    Pair_Index
+        returns the pair index with the arrays in memory
+    """
+    layout: Dict[str, int] = get_cache_layout(ibd_program)
+
+    info_columns: List[int] = [layout[column] for column in PAIR_INDEX_COLUMNS]
+
+    ibd_df: pd.DataFrame = pd.read_csv(ibd_file, sep="\t", header=None, usecols=sorted([layout["id1"], layout["id2"]] + info_columns), dtype={layout["id1"]: str, layout["id2"]: str})
+
+    id1_values: np.ndarray = ibd_df[layout["id1"]].to_numpy(dtype=str)
+    id2_values: np.ndarray = ibd_df[layout["id2"]].to_numpy(dtype=str)
+
+    iid_encoder: IID_Encoder = IID_Encoder().extend(np.concatenate([id1_values, id2_values]))
+
+    return Pair_Index(
+        iid_encoder.encode(id1_values),
+        iid_encoder.encode(id2_values),
+        iid_encoder,
+        {column: ibd_df[column].to_numpy() for column in info_columns},
+        (layout["id1"], layout["id2"]))
+
+def estimate_ibd_rows(ibd_file: str) -> int:
+    """Function to estimate the number of rows in a gzipped ibd file without 
+    reading the whole file. The rows in the first ROW_SAMPLE_BYTES of the 
+    compressed file are counted and scaled to the size of the file
+    Parameters
+    __________
+    ibd_file : str
+        filepath to the ibd file
+
+    Returns
+    _______
+    int
+        returns the estimated number of rows
+    """
+    # the gzip header is skipped by adding 16 to the window bits
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+
+    compressed_bytes: int = 0
+
+    line_count: int = 0
+
+    with open(ibd_file, "rb") as ibd:
+
+        while compressed_bytes < ROW_SAMPLE_BYTES and not decompressor.eof:
+
+            block: bytes = ibd.read(65536)
+
+            if not block:
+                break
+
+            compressed_bytes += len(block)
+
+            line_count += decompressor.decompress(block).count(b"\n")
+
+    # bytes after the end of the first gzip member were not decompressed
+    compressed_bytes -= len(decompressor.unused_data)
+
+    if compressed_bytes <= 0:
+        return 0
+
+    return int(line_count * os.path.getsize(ibd_file) / compressed_bytes)
+
+def estimate_pair_index_memory(ibd_file: str, ibd_program: str, cache_dir: str = None) -> int:
+    """Function to estimate how many bytes the pair index of an ibd file 
+    uses. If the cache is built then this is the size of the cached arrays 
+    of the index. Otherwise it is the estimated number of rows times 
+    TEXT_INDEX_BYTES_PER_ROW, which is the peak while the text file is parsed
+    Parameters
+    __________
+    ibd_file : str
+        filepath to the ibd file
+
+    ibd_program : str
+        ibd program that the file comes from. This will be either hapibd or 
+        ilash
+
+    cache_dir : str
+        directory of the segment cache. This value is None by default
+
+    Returns
+    _______
+    int
+        returns the estimated number of bytes
+    """
+    if cache_dir:
+
+        segment_cache: Segment_Cache = Segment_Cache(cache_dir, ibd_program)
+
+        if segment_cache.is_valid(ibd_file):
+            return segment_cache.get_pair_index_nbytes(ibd_file)
+
+    return estimate_ibd_rows(ibd_file) * TEXT_INDEX_BYTES_PER_ROW
+
+def load_pair_index(ibd_file: str, ibd_program: str, cache_dir: str = None) -> Pair_Index:
+    """Function to get the pair index for an ibd file. The index is kept 
+    loaded in the process so that every identifier on the chromosome uses 
+    the same index
+    Parameters
+    __________
+    ibd_file : str
+        filepath to the ibd file
+
+    ibd_program : str
+        ibd program that the file comes from. This will be either hapibd or 
+        ilash
+
+    cache_dir : str
+        directory of the segment cache. If this value is None then the 
+        index is built from the text file. This value is None by default
+
+    Returns
+    _______
+    Pair_Index
+        returns the pair index for the file
+    """
+    index_key: tuple = (ibd_program.lower(), ibd_file, cache_dir)
+
+    if index_key in LOADED_PAIR_INDICES:
+
+        LOADED_PAIR_INDICES.move_to_end(index_key)
+
+        return LOADED_PAIR_INDICES[index_key]
+
+    if cache_dir:
+        pair_index: Pair_Index = Segment_Cache(cache_dir, ibd_program).load_pair_index(ibd_file)
+    else:
+        pair_index = read_pair_index(ibd_file, ibd_program)
+
+    LOADED_PAIR_INDICES[index_key] = pair_index
+
+    # removing the index that was used the longest time ago
+    if len(LOADED_PAIR_INDICES) > MAX_LOADED_PAIR_INDICES:
+        LOADED_PAIR_INDICES.popitem(last=False)
+
+    return pair_index
+
+def build_cache_file(cache_dir: str, ibd_program: str, ibd_file: str) -> str:
+    """Function that builds the cache for a single file. This is the
+    function that is mapped in the convert_segment_files function
+    Parameters
+    __________
+    cache_dir : str
+        directory that the cached columns will be written to
+
+    ibd_program : str
+        ibd program that the segment files come from
+
+    ibd_file : str
+        filepath to the ibd file
+
+    Returns
+    _______
+    str
+        returns the path to the cache directory
+    """
+    return Segment_Cache(cache_dir, ibd_program).build_if_needed(ibd_file)
+
+def convert_segment_files(ibd_file_list: List[str], cache_dir: str, ibd_program: str, threads: int = 1, iid_file: str = None) -> List[str]:
+    """Function to convert every ibd file into the cache format. Files
+    that already have a valid cache are skipped
+    Parameters
+    __________
+    ibd_file_list : List[str]
+        list of the filepaths to the ibd files
+
+    cache_dir : str
+        directory that the cached columns will be written to
+
+    ibd_program : str
+        ibd program that the segment files come from. This value should
+        be ilash or hapibd
+
+    threads : int
+        number of files to convert at the same time
+
+    iid_file : str
+        filepath to the PLINK .fam file, the PLINK .raw file, or the 
+        pop_info file that is used to build the global iid dictionary. If 
+        this value is None then the saved dictionary is used
+
+    Returns
+    _______
+    List[str]
+        returns a list of the cache directories
+    """
+    # saving the global iid dictionary before any file is converted. If 
+    # the dictionary changed then every cached file is rebuilt
+    if iid_file:
+        IID_Encoder.from_file(iid_file).save(cache_dir)
+
+    # only unique files are converted so that two processes never
+    # write to the same cache directory
+    unique_file_list: List[str] = list(dict.fromkeys(ibd_file_list))
+
+    func = partial(build_cache_file, cache_dir, ibd_program)
+
+    if int(threads) <= 1 or len(unique_file_list) <= 1:
+        return list(map(func, unique_file_list))
+
+    pool = mp.Pool(min(int(threads), len(unique_file_list)))
+
+    cache_path_list: List[str] = pool.map(func, unique_file_list)
+
+    pool.close()
+
+    pool.join()
+
+    return cache_path_list
@@ -1,3 +1,5 @@
 # __init__.py
 from .check_missing_variants import check_for_missing_var
 from .plink_formatter import Analysis_Checker
+from .plink_job_runner import Plink_Job, Plink_Job_Runner
+from .bed_reader import Bed_Reader, load_recode_file
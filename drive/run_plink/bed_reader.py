@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+from typing import List
+
+# the first three bytes of a plink 1 .bed file. The third byte is 1 when
+# the genotypes are stored one variant after the other
+BED_MAGIC_BYTES: bytes = bytes([0x6c, 0x1b, 0x01])
+
+# number of copies of the first .bim allele for each 2-bit code in the .bed
+# file. The code 01 is a missing genotype
+BED_CODE_COUNTS: np.ndarray = np.array([2, -1, 1, 0], dtype=np.int8)
+
+# the first six columns of the .fam file which are also the first six
+# columns of the .raw file
+FAM_COLUMNS: List[str] = ["FID", "IID", "PAT", "MAT", "SEX", "PHENOTYPE"]
+
+BIM_COLUMNS: List[str] = ["CHR", "SNP", "CM", "BP", "A1", "A2"]
+
+
+class Bed_Reader:
+    """class that reads the genotypes of a plink 1 binary fileset without
+    running plink. The .bed file is memory mapped so only the bytes of the
+    requested variants are read"""
+
+    def __init__(self, bfile_prefix: str) -> None:
+        """
+        Parameters
+        __________
+        bfile_prefix : str
+            filepath of the .bed, .bim, and .fam files without the suffix
+        """
+        self.fam_df: pd.DataFrame = pd.read_csv("".join([bfile_prefix, ".fam"]), sep=r"\s+", header=None, names=FAM_COLUMNS, dtype={"FID": str, "IID": str, "PAT": str, "MAT": str})
+
+        self.bim_df: pd.DataFrame = pd.read_csv("".join([bfile_prefix, ".bim"]), sep=r"\s+", header=None, names=BIM_COLUMNS, dtype={"CHR": str, "SNP": str, "A1": str, "A2": str})
+
+        self.bed: np.memmap = np.memmap("".join([bfile_prefix, ".bed"]), dtype=np.uint8, mode="r")
+
+        if bytes(self.bed[:3]) != BED_MAGIC_BYTES:
+            raise ValueError(f"The file {bfile_prefix}.bed is not a variant-major plink 1 .bed file")
+
+        # each byte has the genotypes of four samples
+        self.bytes_per_variant: int = (len(self.fam_df) + 3) // 4
+
+    def get_variant_index(self, variant_list: List[str] = None) -> np.ndarray:
+        """Method to find the position of the variants in the .bim file
+        Parameters
+        __________
+        variant_list : List[str]
+            list of the variant ids. If this value is None then every variant
+            is used
+
+        Returns
+        _______
+        np.ndarray
+            returns an array of the .bim rows of the variants in the order of
+            the variant_list. Variants that are not in the .bim file are
+            left out
+        """
+        if variant_list is None:
+            return np.arange(len(self.bim_df))
+
+        variant_index: np.ndarray = pd.Index(self.bim_df.SNP).get_indexer_for(pd.Index(variant_list))
+
+        return variant_index[variant_index >= 0]
+
+    def read_genotypes(self, variant_list: List[str] = None) -> np.ndarray:
+        """Method to decode the genotypes of the variants
+        Parameters
+        __________
+        variant_list : List[str]
+            list of the variant ids. If this value is None then every variant
+            is read
+
+        Returns
+        _______
+        np.ndarray
+            returns an int8 array with a row for each sample and a column for
+            each variant. The values are the number of copies of the A1
+            allele and -1 for missing genotypes
+        """
+        return self.decode_genotypes(self.get_variant_index(variant_list))
+
+    def decode_genotypes(self, variant_index: np.ndarray) -> np.ndarray:
+        """Method to decode the genotypes of the variants at the .bim rows
+        Parameters
+        __________
+        variant_index : np.ndarray
+            array of the .bim rows of the variants
+
+        Returns
+        _______
+        np.ndarray
+            returns an int8 array with a row for each sample and a column for
+            each variant
+        """
+        # getting the bytes of each variant as a row
+        byte_index: np.ndarray = 3 + variant_index[:, None] * self.bytes_per_variant + np.arange(self.bytes_per_variant)
+
+        variant_bytes: np.ndarray = np.asarray(self.bed[byte_index.ravel()]).reshape(len(variant_index), self.bytes_per_variant)
+
+        # the first sample is in the lowest two bits of each byte
+        code_array: np.ndarray = np.stack([(variant_bytes >> shift) & 3 for shift in (0, 2, 4, 6)], axis=2).reshape(len(variant_index), -1)[:, :len(self.fam_df)]
+
+        return BED_CODE_COUNTS[code_array].T
+
+    def get_raw_df(self, variant_list: List[str] = None) -> pd.DataFrame:
+        """Method to form a dataframe in the same format as the .raw file from
+        plink --recodeA
+        Parameters
+        __________
+        variant_list : List[str]
+            list of the variant ids. If this value is None then every variant
+            is used
+
+        Returns
+        _______
+        pd.DataFrame
+            returns a dataframe with the .fam columns and a column for each
+            variant named {variant}_{A1} that has the number of A1 alleles or
+            NaN if the genotype is missing
+        """
+        variant_index: np.ndarray = self.get_variant_index(variant_list)
+
+        genotype_array: np.ndarray = self.decode_genotypes(variant_index)
+
+        column_list: List[str] = ["_".join([snp, allele]) for snp, allele in zip(self.bim_df.SNP.to_numpy()[variant_index].tolist(), self.bim_df.A1.to_numpy()[variant_index].tolist())]
+
+        genotype_df: pd.DataFrame = pd.DataFrame(np.where(genotype_array < 0, np.nan, genotype_array), columns=column_list)
+
+        return pd.concat([self.fam_df.reset_index(drop=True), genotype_df], axis=1)
+
+
+def load_recode_file(recode_file: str) -> pd.DataFrame:
+    """Function to load a .raw file or a .bed file into the format of the .raw
+    file
+    Parameters
+    __________
+    recode_file : str
+        filepath to the .raw file or the .bed file
+
+    Returns
+    _______
+    pd.DataFrame
+        returns a dataframe with the .fam columns and a column for each variant
+    """
+    if recode_file.endswith(".bed"):
+        return Bed_Reader(recode_file[:-4]).get_raw_df()
+
+    return pd.read_csv(recode_file, sep=" ")
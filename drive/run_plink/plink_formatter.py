@@ -3,10 +3,10 @@ from os import path
 import logging
 import sys
 import glob
-import subprocess
 import pandas as pd
 
 from .check_missing_variants import check_for_missing_var
+from .plink_job_runner import Plink_Job, Plink_Job_Runner, PLINK_OUTPUT_SUFFIXES
 import utility_scripts
 
 
@@ -26,6 +26,15 @@ class Analysis_Checker:
         if "maf_filter" in name:
 
             self.maf = name["maf_filter"]
+
+        # number of threads and megabytes that are split between the plink jobs
+        self.threads: int = int(name.get("threads", 1))
+        self.plink_memory: int = name.get("plink_memory", None)
+
+        # if this value is True then the variants are extracted into a small
+        # .bed file once and every recode option reads that file
+        self.extract_once: bool = name.get("extract_once", False)
+
         self.check_if_path_exists()
 
     def check_if_path_exists(self):
@@ -44,6 +53,60 @@ class Analysis_Checker:
         """
         return logging.getLogger("__main__")
 
+    def get_recode_options(self) -> list:
+        """Function to get the recode options that are run for each output
+        prefix. The gene analysis reads the .ped and .map files when the
+        confirmed carriers are reformatted so the recode option is added if
+        the variants are extracted once and the user did not provide it
+
+        Returns
+        _______
+        list
+            returns a list of the recode options
+        """
+        recode_options: list = list(self.recode_flags or [])
+
+        if self.extract_once and self.analysis_type == "gene" and "recode" not in recode_options:
+
+            self.logger.info("Adding the recode option so that the .ped and .map files are made for the gene analysis")
+
+            recode_options.append("recode")
+
+        return recode_options
+
+    def add_recode_jobs(self, job_runner: Plink_Job_Runner, output_prefix: str, plink_args: list, input_files: list):
+        """Function to add the plink jobs for every recode option. If
+        extract_once is True then the variants are first extracted into a
+        .bed file with the output prefix and each recode option reads that
+        file instead of the full binary file
+        Parameters
+        __________
+        job_runner : Plink_Job_Runner
+            runner that the jobs are added to
+
+        output_prefix : str
+            prefix of the plink output files
+
+        plink_args : list
+            list of the plink arguments that read the binary file and select
+            the variants
+
+        input_files : list
+            list of the files that plink reads for these arguments
+        """
+        if self.extract_once:
+
+            job_runner.add_job(Plink_Job(output_prefix, "make-bed", plink_args, input_files))
+
+            plink_args = ["--bfile", output_prefix]
+
+            input_files = [output_prefix + suffix for suffix in PLINK_OUTPUT_SUFFIXES["make-bed"]]
+
+        # if there are no recode options then only the .bed file is made
+        for option in self.get_recode_options():
+
+            job_runner.add_job(Plink_Job(output_prefix, option, plink_args, input_files))
+
     @utility_scripts.class_readme_generator
     def check_analysis(self, **name):
         """Function to check the analysis type and then run the corresponding plink steps
@@ -106,42 +169,31 @@ class Analysis_Checker:
             self.END_RS, ".chr", CHR, "_list"
         ])
 
-        with open("".join([self.plink_dir, "plink_log.log"]),
-                  "a+") as plink_log:
-
-            for options in self.recode_flags:
-                if self.START_RS and self.END_RS:
-                    subprocess.run([
-                        "plink",
-                        "--bfile",
-                        self.binary_file,
-                        "--max-maf",
-                        self.maf,
-                        "--out",
-                        full_output_path,
-                        "--from",
-                        self.START_RS,
-                        "--to",
-                        self.END_RS,
-                        "".join(["--", options]),
-                    ],
-                                   check=False,
-                                   stdout=plink_log,
-                                   stderr=plink_log)
-                else:
-                    subprocess.run([
-                        "plink",
-                        "--bfile",
-                        self.binary_file,
-                        "--max_maf",
-                        self.maf,
-                        "--out",
-                        self.output,
-                        "".join(["--", options]),
-                    ],
-                                   check=False,
-                                   stdout=plink_log,
-                                   stderr=plink_log)
+        job_runner: Plink_Job_Runner = Plink_Job_Runner(self.threads, self.plink_memory)
+
+        # the plink binary files are inputs to every job
+        binary_file_list: list = ["".join([self.binary_file, suffix]) for suffix in [".bed", ".bim", ".fam"]]
+
+        if self.START_RS and self.END_RS:
+            self.add_recode_jobs(job_runner, full_output_path, [
+                "--bfile",
+                self.binary_file,
+                "--max-maf",
+                self.maf,
+                "--from",
+                self.START_RS,
+                "--to",
+                self.END_RS
+            ], binary_file_list)
+        else:
+            self.add_recode_jobs(job_runner, self.output, [
+                "--bfile",
+                self.binary_file,
+                "--max_maf",
+                self.maf
+            ], binary_file_list)
+
+        job_runner.run("".join([self.plink_dir, "plink_log.log"]))
 
         self.logger.info(f"PLINK output files written to: {self.plink_dir}")
 
@@ -159,32 +211,28 @@ class Analysis_Checker:
         Input_handler.split_input_file(self.plink_dir)
         variant_file_list: list = Input_handler.generate_file_list(
             self.plink_dir)
-        for variant_file in variant_file_list:
-            with open("".join([self.plink_dir, "plink_log.log"]),
-                      "a+") as plink_log:
-
-                for var_file in variant_file_list:
-
-                    for option in self.recode_flags:
-                        output_file_name = var_file[:-4]
-
-                        subprocess.run([
-                            "plink",
-                            "--bfile",
-                            self.binary_file,
-                            "--max-maf",
-                            self.maf,
-                            "--extract",
-                            var_file,
-                            "--out",
-                            output_file_name,
-                            "".join(["--", option]),
-                        ],
-                                       check=False,
-                                       stdout=plink_log,
-                                       stderr=plink_log)
-
-                plink_log.close()
+
+        job_runner: Plink_Job_Runner = Plink_Job_Runner(self.threads, self.plink_memory)
+
+        # the plink binary files are inputs to every job
+        binary_file_list: list = ["".join([self.binary_file, suffix]) for suffix in [".bed", ".bim", ".fam"]]
+
+        # adding one job for each chromosome list file and recode option
+        for var_file in variant_file_list:
+
+            self.add_recode_jobs(job_runner, var_file[:-4], [
+                "--bfile",
+                self.binary_file,
+                "--max-maf",
+                self.maf,
+                "--extract",
+                var_file
+            ], [var_file] + binary_file_list)
+
+        job_count: int = job_runner.run("".join([self.plink_dir, "plink_log.log"]))
+
+        self.logger.info(f"Ran {job_count} PLINK jobs")
+
         self.logger.info(f"PLINK output files written to: {self.plink_dir}")
 
 
@@ -269,25 +317,29 @@ class Input_Splitter:
         # Need to isolate the SNP column for the subset df
         variant_list = variant_df_subset.SNP.values.tolist()
 
-        # write the variant_list to a file
-        # Open a file at the out
-        MyFile = open(
-            "".join([
+        variant_file_path: str = "".join([
                 plink_dir,
                 "variants_of_interest",
                 ".chr",
                 chromosome,
                 "_list",
                 ".txt",
-            ]),
-            "w",
-        )
+            ])
+
+        variant_str: str = "".join(["".join([variant_id, "\n"]) for variant_id in variant_list])
 
-        for variant_id in variant_list:
-            # Write each SNP id to each line in the txt file
-            MyFile.write(variant_id)
-            MyFile.write("\n")
-        MyFile.close()
+        # the file is only rewritten if the variants changed so that plink
+        # does not rerun for chromosomes that already have outputs
+        if os.path.exists(variant_file_path):
+
+            with open(variant_file_path, "r") as variant_file:
+
+                if variant_file.read() == variant_str:
+                    return
+
+        # write the variant_list to a file
+        with open(variant_file_path, "w") as variant_file:
+            variant_file.write(variant_str)
 
     def generate_file_list(self, plink_dir: str) -> list:
         """This function will return a list of all the variant files that 
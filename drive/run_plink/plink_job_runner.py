@@ -0,0 +1,304 @@
+import os
+import logging
+import subprocess
+from dataclasses import dataclass, field
+from multiprocessing.pool import ThreadPool
+from typing import Dict, List, Tuple
+
+# files that plink writes for each recode option. Options that are not in
+# this dictionary are always run because their outputs are not known
+PLINK_OUTPUT_SUFFIXES: Dict[str, List[str]] = {
+    "recode": [".ped", ".map"],
+    "recodeA": [".raw"],
+    "recode A": [".raw"],
+    "make-bed": [".bed", ".bim", ".fam"]
+}
+
+
+@dataclass
+class Plink_Job:
+    """dataclass that has the information to run plink once
+
+    Parameters
+    __________
+    output_prefix : str
+        prefix of the plink output files that is passed to --out
+
+    option : str
+        recode option such as recode or recodeA
+
+    plink_args : List[str]
+        list of the plink arguments other than --out, --threads, --memory,
+        and the recode option
+
+    input_files : List[str]
+        list of the files that plink reads. The job is skipped if the outputs
+        are newer than all of these files and the arguments match the
+        arguments of the previous run
+    """
+
+    output_prefix: str
+    option: str
+    plink_args: List[str]
+    input_files: List[str] = field(default_factory=list)
+
+    def get_key(self) -> Tuple[str, str]:
+        """Method to get the key that identifies the job
+
+        Returns
+        _______
+        Tuple[str, str]
+            returns a tuple of the output prefix and the recode option
+        """
+        return self.output_prefix, self.option
+
+    def get_output_files(self) -> List[str]:
+        """Method to get the files that plink writes for the job
+
+        Returns
+        _______
+        List[str]
+            returns a list of the output files. The list is empty if the
+            outputs of the recode option are not known
+        """
+        return [self.output_prefix + suffix for suffix in PLINK_OUTPUT_SUFFIXES.get(self.option, [])]
+
+    def get_log_path(self) -> str:
+        """Method to get the file that plink's stdout stream is written to for
+        the job
+
+        Returns
+        _______
+        str
+            returns the filepath of the log file
+        """
+        return "".join([self.output_prefix, ".", self.option.replace(" ", "_"), ".plink_stdout.log"])
+
+    def get_command_path(self) -> str:
+        """Method to get the file that the arguments of the last successful
+        run of the job are written to
+
+        Returns
+        _______
+        str
+            returns the filepath of the .cmd file
+        """
+        return "".join([self.output_prefix, ".", self.option.replace(" ", "_"), ".cmd"])
+
+    def get_command_record(self) -> str:
+        """Method to get the arguments that decide the outputs of the job.
+        The threads and the memory are left out because they are split
+        between the jobs of each run and do not change the outputs
+
+        Returns
+        _______
+        str
+            returns a string of the plink arguments and the recode option
+        """
+        return " ".join(self.plink_args + ["--out", self.output_prefix, "".join(["--", self.option])])
+
+    def write_command_record(self) -> None:
+        """Method to write the arguments of the job to the .cmd file so the
+        next run can tell if the arguments changed"""
+        with open(self.get_command_path(), "w") as command_file:
+            command_file.write(self.get_command_record())
+
+    def is_up_to_date(self) -> bool:
+        """Method to check if every output of the job is newer than every
+        input and the job was last run with the same arguments
+
+        Returns
+        _______
+        bool
+            returns True if the job does not need to be run again
+        """
+        output_files: List[str] = self.get_output_files()
+
+        if not output_files or not all(os.path.exists(file) for file in output_files):
+            return False
+
+        # rerunning the job if the arguments such as --max-maf changed since
+        # the outputs were written
+        if not os.path.exists(self.get_command_path()):
+            return False
+
+        with open(self.get_command_path(), "r") as command_file:
+            if command_file.read() != self.get_command_record():
+                return False
+
+        input_times: List[float] = [os.path.getmtime(file) for file in self.input_files if os.path.exists(file)]
+
+        return min(os.path.getmtime(file) for file in output_files) >= max(input_times, default=0)
+
+    def get_command(self, threads: int, memory: int = None) -> List[str]:
+        """Method to get the plink command for the job
+        Parameters
+        __________
+        threads : int
+            number of threads that plink can use for the job
+
+        memory : int
+            number of megabytes that plink can use for the job. If this
+            value is None then plink uses its default
+
+        Returns
+        _______
+        List[str]
+            returns the list of the plink command arguments
+        """
+        command: List[str] = ["plink"] + self.plink_args + ["--out", self.output_prefix, "--threads", str(threads)]
+
+        if memory:
+            command.extend(["--memory", str(memory)])
+
+        # options such as "recode A" are split into the flag and its modifier
+        option_list: List[str] = self.option.split()
+
+        return command + ["".join(["--", option_list[0]])] + option_list[1:]
+
+
+def run_job_group(job_list: List[Plink_Job], threads: int, memory: int = None) -> List[str]:
+    """Function to run the jobs that share an output prefix one after the
+    other so that they do not write to the same plink log at the same time
+    Parameters
+    __________
+    job_list : List[Plink_Job]
+        list of the jobs that have the same output prefix
+
+    threads : int
+        number of threads that plink can use for each job
+
+    memory : int
+        number of megabytes that plink can use for each job
+
+    Returns
+    _______
+    List[str]
+        returns a list of the log files of the jobs
+    """
+    for job in job_list:
+
+        with open(job.get_log_path(), "w") as job_log:
+
+            completed_process: subprocess.CompletedProcess = subprocess.run(job.get_command(threads, memory),
+                                                                           check=False,
+                                                                           stdout=job_log,
+                                                                           stderr=job_log)
+
+        # only recording the arguments of jobs that finished so a failed job
+        # is run again
+        if completed_process.returncode == 0:
+            job.write_command_record()
+
+    return [job.get_log_path() for job in job_list]
+
+
+class Plink_Job_Runner:
+    """class that keeps a list of unique plink jobs and runs them at the same
+    time with the threads and memory split between the jobs"""
+
+    def __init__(self, threads: int, memory: int = None) -> None:
+        """
+        Parameters
+        __________
+        threads : int
+            number of cpu cores that can be used by all the plink jobs
+
+        memory : int
+            number of megabytes that can be used by all the plink jobs. If
+            this value is None then each plink job uses its default
+        """
+        self.logger: object = logging.getLogger("__main__")
+        self.threads: int = max(int(threads), 1)
+        self.memory: int = int(memory) if memory else None
+        self.job_dict: Dict[Tuple[str, str], Plink_Job] = {}
+
+    def add_job(self, job: Plink_Job) -> bool:
+        """Method to add a job if a job with the same output prefix and
+        recode option has not been added
+        Parameters
+        __________
+        job : Plink_Job
+            job to be run
+
+        Returns
+        _______
+        bool
+            returns True if the job was added
+        """
+        if job.get_key() in self.job_dict:
+            return False
+
+        self.job_dict[job.get_key()] = job
+
+        return True
+
+    def get_job_groups(self) -> List[List[Plink_Job]]:
+        """Method to group the jobs that need to run by their output prefix.
+        The jobs in a group run in the order they were added so a job can
+        read the files from an earlier job in the group. Once a job in a
+        group needs to run every later job in the group is also run
+
+        Returns
+        _______
+        List[List[Plink_Job]]
+            returns a list of the job lists for each output prefix
+        """
+        group_dict: Dict[str, List[Plink_Job]] = {}
+
+        for job in self.job_dict.values():
+
+            if job.output_prefix not in group_dict and job.is_up_to_date():
+
+                self.logger.info(f"Skipping plink for {job.output_prefix} with the option {job.option} because the output files are newer than the input files and the arguments have not changed")
+
+                continue
+
+            group_dict.setdefault(job.output_prefix, []).append(job)
+
+        return list(group_dict.values())
+
+    def run(self, log_file_path: str) -> int:
+        """Method to run the jobs and merge the log of each job into one log file
+        Parameters
+        __________
+        log_file_path : str
+            filepath of the log file that the job logs are appended to
+
+        Returns
+        _______
+        int
+            returns the number of jobs that were run
+        """
+        job_group_list: List[List[Plink_Job]] = self.get_job_groups()
+
+        if not job_group_list:
+            return 0
+
+        workers: int = min(self.threads, len(job_group_list))
+
+        # splitting the threads and the memory between the jobs that run at
+        # the same time
+        job_threads: int = max(self.threads // workers, 1)
+
+        job_memory: int = self.memory // workers if self.memory else None
+
+        pool = ThreadPool(workers)
+
+        log_path_list: List[List[str]] = pool.starmap(run_job_group, [(job_list, job_threads, job_memory) for job_list in job_group_list])
+
+        pool.close()
+
+        pool.join()
+
+        # merging the logs in the order that the jobs were added
+        with open(log_file_path, "a+") as plink_log:
+
+            for log_path in [log_path for job_log_list in log_path_list for log_path in job_log_list]:
+
+                with open(log_path, "r") as job_log:
+                    plink_log.write(job_log.read())
+
+                os.remove(log_path)
+
+        return sum(len(job_list) for job_list in job_group_list)
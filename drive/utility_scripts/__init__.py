@@ -5,7 +5,10 @@ from .readme_generators.generator_decorator import class_readme_generator, func_
 from .file_generator import Readme, LogFile
 from .user_input.initial_parameters import Input_Gather, get_dict_of_variables
 from .parallelize.listener import listener
+from .parallelize.result_channel import Result_Channel
 from .logger_formats import create_logger, record_user_arguments
-from .parallelize.run_parallel import Segment_Parallel_Runner, parallelize_test
+from .parallelize.worker_tables import Worker_Table, set_worker_tables, call_with_worker_tables
+from .parallelize.run_parallel import Task_Parallel_Runner
 from .get_files import get_file_list
+from .get_allpair_files import get_allpair_file_dict, fix_chr
 from .existance_checker.existance_check_generators import check_dir, check_file
@@ -0,0 +1,59 @@
+import os
+import re
+from typing import Dict, Tuple
+
+from .get_files import get_file_list
+
+# pattern of the allpair file names from combine_ibd_pairs which are
+# IBD_{identifier}.{chr_num}.{start}-{end}.allpair.txt with an optional .gz
+ALLPAIR_NAME_PATTERN: str = r"IBD_(?P<identifier>.+)\.(?P<chr_num>chr\d+)\.\d+-\d+\.allpair\.txt(\.gz)?$"
+
+
+def fix_chr(chr_num: str) -> str:
+    """Function to format the chromosome number as chrXX where X is a digit
+    Parameters
+    __________
+    chr_num : str
+        string of the chromosome number such as chr1 or chr01 with or
+        without a . on either side
+
+    Returns
+    _______
+    str
+        returns the chromosome number in the format chrXX
+    """
+    chr_num = chr_num.strip(".")
+
+    if len(chr_num) == 4:
+        chr_num = "".join([chr_num[:3], "0", chr_num[-1]])
+
+    return chr_num
+
+
+def get_allpair_file_dict(allpair_file_dir: str) -> Dict[Tuple[str, str], str]:
+    """Function to find every allpair file once and key it by the chromosome
+    number and the identifier in the file name
+    Parameters
+    __________
+    allpair_file_dir : str
+        string that list the path to the directory that has the allpair.txt files
+
+    Returns
+    _______
+    Dict[Tuple[str, str], str]
+        returns a dictionary where the keys are tuples of the chromosome number
+        in the format chrXX and the variant id or gene name and the values are
+        the filepaths to the allpair files
+    """
+    allpair_file_dict: Dict[Tuple[str, str], str] = {}
+
+    for allpair_file in get_file_list(allpair_file_dir, "*allpair.txt*"):
+
+        match = re.search(ALLPAIR_NAME_PATTERN, os.path.basename(allpair_file))
+
+        if match:
+            # keeping the first file like the list comprehensions that
+            # were used before
+            allpair_file_dict.setdefault((fix_chr(match.group("chr_num")), match.group("identifier")), allpair_file)
+
+    return allpair_file_dict
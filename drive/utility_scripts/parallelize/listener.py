@@ -1,7 +1,7 @@
 import os
 
 
-def listener(que_object, output: str, header: str):
+def listener(que_object, output: str, header: str, flush_messages: bool = True):
     """
        Parameters
        __________
@@ -16,6 +16,11 @@ def listener(que_object, output: str, header: str):
        header : str
            This parameter contains a string for the header row of the file
 
+       flush_messages : bool
+           if True then the file is flushed after every message. The
+           Result_Channel sets this to False since the file is closed once
+           all the workers are done
+
        """
 
     # opening the output file to write to
@@ -35,4 +40,6 @@ def listener(que_object, output: str, header: str):
                 break
 
             output_file.write(m)
-            output_file.flush()
+
+            if flush_messages:
+                output_file.flush()
@@ -0,0 +1,57 @@
+import multiprocessing as mp
+import threading
+
+from .listener import listener
+
+
+class Result_Channel:
+    """class that collects the messages from the worker processes and writes 
+    them to a file from a thread in the main process. This replaces the 
+    mp.Manager queue and the listener task so no pool worker is used for 
+    writing. The queue has to be given to the workers through the pool 
+    initializer because a plain mp.Queue can not be sent with a task"""
+
+    def __init__(self, output: str, header: str) -> None:
+        """
+        Parameters
+        __________
+        output : str
+            filepath that the messages are written to
+
+        header : str
+            string that will be the first row of the file if the file is empty
+        """
+        self.output: str = output
+        self.header: str = header
+        self.queue = mp.Queue()
+        self.writer: threading.Thread = threading.Thread(
+            target=listener, args=(self.queue, output, header, False), daemon=True)
+
+    def start(self):
+        """Method to start the writer thread
+
+        Returns
+        _______
+        Result_Channel
+            returns the channel so that it can be used in a with statement
+        """
+        self.writer.start()
+
+        return self
+
+    def close(self):
+        """Method to stop the writer thread once all of the workers have 
+        finished. The kill message is put in the queue after every message 
+        from the workers so the writer finishes writing them first"""
+
+        self.queue.put("kill")
+
+        self.writer.join()
+
+        self.queue.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
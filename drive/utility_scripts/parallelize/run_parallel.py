@@ -3,6 +3,8 @@ from functools import partial
 from dataclasses import dataclass
 from typing import List, Dict
 import utility_scripts
+from .worker_tables import Worker_Table, set_worker_tables, call_with_worker_tables
+from .result_channel import Result_Channel
 
 
 def parallelize_decorator(func):
@@ -18,27 +20,30 @@ def parallelize_decorator(func):
         file_name: str = args[0]
         header_str: str = args[2]
 
-        manager = mp.Manager()
+        # the messages are written by a thread in this process so every 
+        # worker in the pool is used for the computation
+        result_channel: Result_Channel = Result_Channel("".join([self.output, file_name]), header_str).start()
 
-        que = manager.Queue()
-        pool = mp.Pool(int(self.workers))
+        worker_tables: dict = self.get_worker_tables()
 
-        watcher = pool.apply_async(
-            utility_scripts.listener,
-            (que, "".join([self.output, file_name]), header_str))
+        worker_tables["result_queue"] = result_channel.queue
+
+        # the tables are loaded once in each worker process so the tasks 
+        # only have to pass a reference to them
+        pool = mp.Pool(int(self.workers), initializer=set_worker_tables, initargs=(worker_tables,))
 
         func(self,
              *args,
-             que_object=que,
+             que_object=Worker_Table("result_queue"),
              pool_object=pool,
-             manager_object=manager)
-
-        que.put("kill")
+             manager_object=None)
 
         pool.close()
 
         pool.join()
 
+        result_channel.close()
+
     return inner_func
 
 
@@ -58,10 +63,24 @@ class Parallel_Runner:
     workers: int
     output: str
 
+    def get_worker_tables(self) -> dict:
+        """Method to get the tables that are loaded into each worker process 
+        when the pool starts
+
+        Returns
+        _______
+        dict
+            returns a dictionary where the keys are the table names and the 
+            values are the tables. The parent class has no tables
+        """
+        return {}
+
 
 @dataclass
-class Segment_Parallel_Runner(Parallel_Runner):
-    """dataclass for the parallelization of the Shared_Segment_Formatter_CLI.py script
+class Task_Parallel_Runner(Parallel_Runner):
+    """dataclass for running a list of tasks from every chromosome in one 
+    pool. The tasks are handed out one at a time in the order of the 
+    task_list so the largest tasks should be first
 
     Parameters
     __________
@@ -71,27 +90,37 @@ class Segment_Parallel_Runner(Parallel_Runner):
     min_CM : str
         string that lists the minimum centimorgan threshold to be used throughout the computation
 
-    file_list_dict : dict    
-        dictionary of dictionaries where the outer key is the 
-        variant and the inner dictionary has two keys, base_pos and iid_list which have the variants base position and 
-        the list of grids that carry the variant according to the
-        mega array
+    task_list : list
+        list of tuples where the first value is the path to the segment file and the 
+        second value is the var_info_dict of the variants in the task. The task can be 
+        a single variant or every variant on a chromosome
 
-    segment_file : str
-        string that list the path to the segment file. This file should be the output from either hapibd or ilash and should be a .match.gz or a .ibd.gz
+    cache_dir : str
+        directory of the segment cache. If this value is None then the segment files are read directly
+
+    iid_encoder : object
+        IID_Encoder of the global iid dictionary that is passed to the parallel_func. If this 
+        value is None then it is not passed
     """
 
     ibd_format: str
     min_CM: str
-    file_list_dict: dict
-    segment_file: str
+    task_list: list
+    cache_dir: str = None
+    iid_encoder: object = None
+
+    def get_worker_tables(self) -> dict:
+        """Method to get the task_list and the iid_encoder so that they are 
+        loaded once in each worker and each task is only sent as its index"""
+
+        return {"task_list": self.task_list, "iid_encoder": self.iid_encoder}
 
     @parallelize_decorator
-    def run_segments_parallel(self,
-                              *args,
-                              que_object=None,
-                              pool_object=None,
-                              manager_object=None):
+    def run_tasks_parallel(self,
+                           *args,
+                           que_object=None,
+                           pool_object=None,
+                           manager_object=None):
         """function to run the computation in parallel
         Parameters
         __________
@@ -105,63 +134,34 @@ class Segment_Parallel_Runner(Parallel_Runner):
             string that will be the first row of the file at the file_name
 
         que_object : object
-            que created by manager.Queue that waits for a string to be passed 
-            to it and then passes that string to the listener function
+            reference to the queue of the Result_Channel that waits for a 
+            string to be passed to it and then writes that string to the file
 
         pool_object : object
             created by mp.Pool
 
         manager_object : object
-            que manager created by mp.Manager
+            this value is None since the Result_Channel does not need a 
+            manager
 
         """
-        # expanding the second argument of the arg list into the parallel_func
         parallel_func: object = args[1]
 
+        task_kwargs: dict = {"cache_dir": self.cache_dir}
 
-        # get all the variants from the file_list_dict
-        variant_list: list = self.file_list_dict.keys()
-
-        func = partial(parallel_func, self.segment_file, self.output,
-                       self.ibd_format, self.min_CM, self.file_list_dict, que_object)
-
-        pool_object.map(func, variant_list)
+        if self.iid_encoder is not None:
+            task_kwargs["iid_encoder"] = Worker_Table("iid_encoder")
 
-def parallelize_test(*args, combined_info_list: List,  output: str = None, que_object: bool = False):
+        func = partial(call_with_worker_tables, parallel_func, self.output, self.ibd_format,
+                       self.min_CM, que_object, **task_kwargs)
 
-        func: object = args[0]
+        # each task is sent as a reference to its position in the task_list
+        task_references: list = [Worker_Table("task_list", task_indx) for task_indx in range(len(self.task_list))]
 
-        pool = mp.Pool(int(args[1]))
-
-        if que_object:
-
-            file_name: str = args[1]
-            header_str: str = args[2]
-
-            manager = mp.Manager()
-
-            que = manager.Queue()
-        
-            watcher = pool.apply_async(
-                utility_scripts.listener,
-                (que, "".join([output, file_name]), header_str))
-
-            pool.map()
-            func(
-                *args,
-                que_object=que,
-                pool_object=pool,
-                manager_object=manager)
-        
-
-            que.put("kill")
-        else:
-            
-
-            pool.map(func, combined_info_list)
-        pool.close()
-
-        pool.join()
+        # using a chunksize of 1 so that each worker takes the next task 
+        # when it finishes instead of getting a fixed slice of the list
+        for _ in pool_object.imap_unordered(func, task_references, chunksize=1):
+            pass
 
 # @dataclass
 # class Haplotype_Parallel_Runner(Parallel_Runner):
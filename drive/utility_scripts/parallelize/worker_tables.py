@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from typing import Any
+
+# tables that are set once in each worker process by the pool initializer.
+# The tasks only pass Worker_Table references so the tables are not
+# pickled for every task
+WORKER_TABLES: dict = {}
+
+
+@dataclass(frozen=True)
+class Worker_Table:
+    """dataclass that refers to a table that was loaded into the worker
+    process when the pool started
+
+    Parameters
+    __________
+    name : str
+        name of the table in the WORKER_TABLES dictionary
+
+    key : Any
+        key or index of the value in the table. If this value is None then
+        the whole table is used
+    """
+
+    name: str
+    key: Any = None
+
+    def resolve(self) -> Any:
+        """Method to get the table or the value in the table from the worker
+        process
+
+        Returns
+        _______
+        Any
+            returns the table if the key is None or the value at the key
+        """
+        table: Any = WORKER_TABLES[self.name]
+
+        if self.key is None:
+            return table
+
+        return table[self.key]
+
+
+def set_worker_tables(table_dict: dict):
+    """Function that is used as the pool initializer to store the tables in
+    each worker process
+    Parameters
+    __________
+    table_dict : dict
+        dictionary where the keys are the table names and the values are the
+        tables such as the var_info_dict or the carrier list
+    """
+    WORKER_TABLES.clear()
+
+    WORKER_TABLES.update(table_dict)
+
+
+def call_with_worker_tables(parallel_func: object, *args, **kwargs) -> Any:
+    """Function that replaces any Worker_Table arguments with the table from
+    the worker process before calling the parallel_func
+    Parameters
+    __________
+    parallel_func : object
+        function that is run in the worker process
+
+    *args
+        positional arguments for the parallel_func
+
+    **kwargs
+        keyword arguments for the parallel_func
+
+    Returns
+    _______
+    Any
+        returns the output of the parallel_func
+    """
+    args = [arg.resolve() if isinstance(arg, Worker_Table) else arg for arg in args]
+
+    kwargs = {key: value.resolve() if isinstance(value, Worker_Table) else value for key, value in kwargs.items()}
+
+    return parallel_func(*args, **kwargs)
@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.append("../drive")
+
+import numpy as np
+from run_plink.bed_reader import Bed_Reader, load_recode_file
+
+def write_bfile(bfile_prefix: str, genotype_list: list, variant_list: list):
+    """helper function to write a plink 1 binary fileset where the genotypes are the number of A1 alleles and None is missing"""
+
+    code_dict: dict = {2: 0, None: 1, 1: 2, 0: 3}
+
+    with open(bfile_prefix + ".fam", "w") as fam_file:
+        for sample_num in range(len(genotype_list)):
+            fam_file.write(f"F{sample_num} R{sample_num} 0 0 1 -9\n")
+
+    with open(bfile_prefix + ".bim", "w") as bim_file:
+        for variant in variant_list:
+            bim_file.write(f"1\t{variant}\t0\t100\tA\tG\n")
+
+    bed_bytes: bytearray = bytearray([0x6c, 0x1b, 0x01])
+
+    for variant_num in range(len(variant_list)):
+
+        # padding the samples to a multiple of four
+        code_list: list = [code_dict[genotypes[variant_num]] for genotypes in genotype_list] + [0] * (-len(genotype_list) % 4)
+
+        for byte_start in range(0, len(code_list), 4):
+            bed_bytes.append(sum(code << (2 * shift) for shift, code in enumerate(code_list[byte_start:byte_start + 4])))
+
+    with open(bfile_prefix + ".bed", "wb") as bed_file:
+        bed_file.write(bytes(bed_bytes))
+
+def test_bed_reader(tmp_path):
+    """unit test to make sure the genotypes of only the requested variants are decoded from the .bed file"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    bfile_prefix: str = os.path.join(str(tmp_path), "variants_of_interest.chr01_list")
+
+    # five samples so the last byte of each variant is padded
+    genotype_list: list = [[0, 2, 1], [1, None, 0], [2, 0, 0], [None, 1, 2], [0, 0, 1]]
+
+    write_bfile(bfile_prefix, genotype_list, ["rs1", "rs2", "rs3"])
+
+    bed_reader: Bed_Reader = Bed_Reader(bfile_prefix)
+
+    genotype_array: np.ndarray = bed_reader.read_genotypes(["rs3", "rs1", "rs9"])
+
+    expected_array: np.ndarray = np.array([[1, 0], [0, 1], [0, 2], [2, -1], [1, 0]], dtype=np.int8)
+
+    if genotype_array.dtype != np.int8 or not np.array_equal(genotype_array, expected_array):
+        errors.append(f"Expected the genotypes of rs3 and rs1 to be {expected_array.tolist()}, instead found {genotype_array.tolist()}")
+
+    raw_df = load_recode_file(bfile_prefix + ".bed")
+
+    if raw_df.columns.tolist() != ["FID", "IID", "PAT", "MAT", "SEX", "PHENOTYPE", "rs1_A", "rs2_A", "rs3_A"]:
+        errors.append(f"Expected the columns of the .raw file, instead found {raw_df.columns.tolist()}")
+
+    if raw_df[raw_df.rs2_A.isin([1.0, 2.0])].IID.tolist() != ["R0", "R3"]:
+        errors.append(f"Expected the carriers of rs2 to be R0 and R3, instead found {raw_df[raw_df.rs2_A.isin([1.0, 2.0])].IID.tolist()}")
+
+    if not raw_df.rs2_A.isna().tolist() == [False, True, False, False, False]:
+        errors.append("Expected the missing genotype of R1 for rs2 to be NaN")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
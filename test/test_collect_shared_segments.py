@@ -1,9 +1,11 @@
 import sys
 import pandas as pd
+import os
+import gzip
 import numpy as np
 sys.path.append("../drive")
 
-from pre_shared_segments_analysis_scripts.shared_segment_detection.gathering_pairs.collect_shared_segments import generate_parameters, build_unique_id_dict, create_ibd_arrays, get_pair_string, build_ibddata_and_ibddict, filter_for_gene_site
+from pre_shared_segments_analysis_scripts.shared_segment_detection.gathering_pairs.collect_shared_segments import generate_parameters, build_unique_id_dict, create_ibd_arrays, get_pair_string, build_ibddata_and_ibddict, filter_for_gene_site, get_pair_strings, add_breakpoints, sweep_breakpoints, newPOS, stream_filtered_segments
 
 def test_generate_parameters():
     """unit test to test if the parameters are being properly generated"""
@@ -212,4 +214,107 @@ def test_filter_for_gene_site():
     if (filtered_df[2].values != ["12", "23", "10"]).all():
         errors.append(f"Expected the returned dataframe to have the values ['12', '23', '10'] for the start_indx column instead found the values {filtered_df[2].values}")
 
-    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
\ No newline at end of file
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_get_pair_strings():
+    """unit test to make sure the columnar get_pair_strings matches get_pair_string"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    uniqID: dict = {"R1": 0, "R2": 1, "R3": 2}
+
+    chunk: pd.DataFrame = pd.DataFrame([
+        ["R2", 0, "R1", 0, 10, 100, 200, 3.5],
+        ["R4", 0, "R3", 0, 10, 150, 250, 4.25],
+        ["R1", 0, "R5", 0, 10, 100, 300, 6.0]
+    ])
+
+    pair_strings: pd.Series = get_pair_strings(chunk, 0, 2, 7, uniqID)
+
+    expected_list: list = list(chunk.apply(lambda row: get_pair_string(row, 0, 2, 7, uniqID), axis=1).values)
+
+    if list(pair_strings.values) != expected_list:
+        errors.append(f"Expected the pair strings to be {expected_list}, instead found {list(pair_strings.values)}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_add_breakpoints():
+    """unit test to make sure that the add_breakpoints function groups pairs by position"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    IBD_data, IBD_index = create_ibd_arrays()
+
+    chunk: pd.DataFrame = pd.DataFrame([
+        ["R1", 0, "R2", 0, 10, 100, 200, 3.5],
+        ["R1", 0, "R3", 0, 10, 100, 300, 4.0],
+        ["R2", 0, "R3", 0, 10, 200, 300, 5.0]
+    ])
+
+    pair_strings: pd.Series = pd.Series(["3.5:R1-R2", "4.0:R1-R3", "5.0:R2-R3"])
+
+    chr_num: str = add_breakpoints(chunk, pair_strings, 5, 6, 4, IBD_data, IBD_index)
+
+    if chr_num != "10" or "10" not in IBD_data:
+        errors.append(f"Expected the chromosome to be 10, instead found {chr_num}")
+
+    if IBD_data["10"]["100"].add != ["3.5:R1-R2", "4.0:R1-R3"]:
+        errors.append(f"Expected two pairs to be added at position 100, instead found {IBD_data['10']['100'].add}")
+
+    if IBD_data["10"]["200"].add != ["5.0:R2-R3"] or IBD_data["10"]["200"].rem != ["3.5:R1-R2"]:
+        errors.append("Expected position 200 to have one pair added and one pair removed")
+
+    if sorted(IBD_index["10"]["allpos"]) != [100, 200, 300]:
+        errors.append(f"Expected the breakpoints to be 100, 200, and 300, instead found {IBD_index['10']['allpos']}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_sweep_breakpoints():
+    """unit test to make sure that sweep_breakpoints counts the segments and pairs at each breakpoint"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    chr_data: dict = {
+        "100": newPOS(["3.5:R1-R2", "4.0:R1-R2"], []),
+        "200": newPOS(["5.0:R2-R3"], ["3.5:R1-R2"]),
+        "300": newPOS([], ["4.0:R1-R2", "5.0:R2-R3"])
+    }
+
+    counts: list = [(pos, nseg, npair) for pos, nseg, npair, _, _ in sweep_breakpoints(chr_data, [300, 100, 200])]
+
+    # two segments for one pair, then one segment for each of two pairs, then nothing
+    if counts != [(100, 2, 1), (200, 2, 2), (300, 0, 0)]:
+        errors.append(f"Expected the counts to be [(100, 2, 1), (200, 2, 2), (300, 0, 0)], instead found {counts}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_stream_filtered_segments(tmp_path):
+    """unit test to make sure only the carrier rows above the min_cM threshold are streamed"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    ibd_file: str = os.path.join(str(tmp_path), "test_chr1.ibd.gz")
+
+    with gzip.open(ibd_file, "wt") as ibd:
+        ibd.write("R1\t1\tR2\t2\t1\t100\t200\t3.5\n")
+        ibd.write("R3\t1\tR4\t1\t1\t150\t250\t4.5\n")
+        ibd.write("R5\t2\tR1\t1\t1\t300\t400\t2.5\n")
+        ibd.write("R6\t2\tR1\t1\t1\t300\t500\t5.0\n")
+
+    # using a chunksize of 2 so that a chunk with no kept rows is skipped
+    chunk_list: list = list(stream_filtered_segments(ibd_file, generate_parameters("hapibd"), {"R1"}, 3, chunksize=2))
+
+    streamed_df: pd.DataFrame = pd.concat(chunk_list)
+
+    if list(streamed_df[0]) != ["R1", "R6"] or list(streamed_df[7]) != [3.5, 5.0]:
+        errors.append(f"Expected the rows for R1 that are at least 3 cM to be kept, instead found {streamed_df.values.tolist()}")
+
+    # the phase columns are not used to build the pairs so they are not parsed
+    if list(streamed_df.columns) != [0, 2, 4, 5, 6, 7]:
+        errors.append(f"Expected only the columns [0, 2, 4, 5, 6, 7] to be read, instead found {list(streamed_df.columns)}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
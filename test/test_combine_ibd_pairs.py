@@ -0,0 +1,177 @@
+import sys
+import os
+import gzip
+sys.path.append("../drive")
+
+import pandas as pd
+from pre_shared_segments_analysis_scripts.shared_segment_detection.combine_output.combine_ibd_pairs import Pair_Stream_Merger, get_concurrent_chromosomes, write_allpair_file
+from pre_shared_segments_analysis_scripts.shared_segment_detection.combine_output.pair_functions import Pair_Info_Class, Pairs, ALLPAIR_COLUMNS
+from pre_shared_segments_analysis_scripts.shared_segment_detection.combine_output.get_haplotype_info import hapibd_info_finder, get_pairs_len_info
+
+def write_small_file(file_path: str, row_list: list):
+    """helper function to write a small .small.txt.gz file"""
+
+    with gzip.open(file_path, "wt") as small_file:
+        small_file.write("chr\tpos\tsegments\tpairs\tadd\tdel\n")
+        for row in row_list:
+            small_file.write("\t".join(map(str, row)) + "\n")
+
+def test_pair_stream_merger(tmp_path):
+    """unit test to make sure the merged pairs at each position match the union of the pairs from each file"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    hapibd_file: str = os.path.join(str(tmp_path), "hapibd_var1.chr1.small.txt.gz")
+    ilash_file: str = os.path.join(str(tmp_path), "ilash_var1.chr1.small.txt.gz")
+
+    # the pair R1-R2 has two hapibd segments so it is only removed once 
+    # both segments end
+    write_small_file(hapibd_file, [
+        [1, 100, 2, 1, "3.5:R1-R2 4.0:R1-R2", "NA"],
+        [1, 300, 3, 2, "5.0:R3-R4", "3.5:R1-R2"],
+        [1, 500, 0, 0, "NA", "4.0:R1-R2 5.0:R3-R4"]
+    ])
+
+    write_small_file(ilash_file, [
+        [1, 200, 1, 1, "3.2:R1-R2", "NA"],
+        [1, 300, 0, 0, "NA", "3.2:R1-R2"]
+    ])
+
+    pair_merger: Pair_Stream_Merger = Pair_Stream_Merger({"hapibd": hapibd_file, "ilash": ilash_file})
+
+    position_list: list = []
+
+    pair_str_list: list = []
+
+    previous_str_list: list = []
+
+    for _, pos in pair_merger:
+        position_list.append(pos)
+        pair_str_list.append(pair_merger.get_pair_str())
+        previous_str_list.append(pair_merger.get_pair_str(previous=True))
+
+    if position_list != [100, 200, 300, 500]:
+        errors.append(f"Expected the positions to be [100, 200, 300, 500], instead found {position_list}")
+
+    if [set(pair_str.split(" ")) for pair_str in pair_str_list] != [{"hapibd:R1-R2"}, {"hapibd,ilash:R1-R2"}, {"hapibd:R1-R2", "hapibd:R3-R4"}, {"NA"}]:
+        errors.append(f"Expected the pairs at each position to be the union of the files, instead found {pair_str_list}")
+
+    # the previous pairs are formed by undoing the changes from the last 
+    # position. The order of the pairs is not fixed so the pairs are 
+    # compared as sets
+    if [set(pair_str.split(" ")) for pair_str in previous_str_list[1:]] != [set(pair_str.split(" ")) for pair_str in pair_str_list[:-1]]:
+        errors.append(f"Expected the previous pairs to match the pairs at the previous position, instead found {previous_str_list}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_get_pairs_len_info():
+    """unit test to make sure the joined segment information for all the pairs matches the information from get_len_info for each pair"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    # R2-R1 has segments in both orders so only the first order is used
+    ibd_df: pd.DataFrame = pd.DataFrame([
+        ["R1", 1, "R2", 2, 1, 100, 200, 3.5],
+        ["R2", 2, "R1", 1, 1, 150, 600, 5.5],
+        ["R3", 2, "R4", 1, 1, 150, 300, 4.0],
+        ["R3", 1, "R4", 2, 1, 250, 400, 4.5],
+        ["R4", 1, "R5", 2, 1, 100, 900, 7.5]
+    ])
+
+    pair_1_list: list = ["R1", "R2", "R4", "R5", "R1", "R9"]
+    pair_2_list: list = ["R2", "R1", "R3", "R4", "R5", "R1"]
+
+    for position_kwargs in [{"var_position": 175}, {"var_position": 500}, {"gene_start": 260, "gene_end": 280}]:
+
+        pairs_info_list: list = get_pairs_len_info(ibd_df, pair_1_list, pair_2_list, "hapibd", **position_kwargs)
+
+        for pair_1, pair_2, pair_info_dict in zip(pair_1_list, pair_2_list, pairs_info_list):
+
+            expected_dict: dict = hapibd_info_finder(ibd_df, pair_1, pair_2, "hapibd").get_len_info(**position_kwargs)
+
+            if pair_info_dict != expected_dict:
+                errors.append(f"Expected the pair {pair_1}-{pair_2} to have the information {expected_dict} for {position_kwargs}, instead found {pair_info_dict}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_check_for_missed_carriers():
+    """unit test to make sure the connected carriers are only counted for exact iid matches"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    pair_info_object: Pair_Info_Class = Pair_Info_Class("1\t100\tNA\t4\thapibd:C1-R1 ilash:R1-C2 hapibd:C3-R10 hapibd:R2-C1\n", "var1", "chr1.", "var1.allpair.txt", "gene")
+
+    pair_info_object.iid_list = ["C1", "C2", "C3"]
+
+    pair_info_object.build_adjacency_dict()
+
+    # R1 should not be connected to C3 through R10
+    for pair_str, expected_count in [("hapibd:C1-R1", 2), ("hapibd:C3-R10", 1), ("hapibd:R2-C1", 0), ("hapibd:C1-R9", 0)]:
+
+        connected_carriers: int = pair_info_object.check_for_missed_carriers(Pairs(pair_str))
+
+        if connected_carriers != expected_count:
+            errors.append(f"Expected {expected_count} connected carriers for the pair {pair_str}, instead found {connected_carriers}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_get_concurrent_chromosomes():
+    """unit test to make sure the number of chromosomes that run at the same time fits in the memory budget"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    gigabyte: int = 1024 ** 3
+
+    memory_list: list = [3 * gigabyte, 1 * gigabyte, 2 * gigabyte, 1 * gigabyte]
+
+    # the largest chromosomes are used to check the budget and there is 
+    # always at least one chromosome
+    for threads, memory_budget, expected_count in [(8, None, 4), (2, None, 2), (8, 5, 2), (8, 6.5, 3), (8, 1, 1), (2, 100, 2)]:
+
+        concurrent_chromosomes: int = get_concurrent_chromosomes(memory_list, threads, memory_budget)
+
+        if concurrent_chromosomes != expected_count:
+            errors.append(f"Expected {expected_count} chromosomes to run at the same time with {threads} threads and a budget of {memory_budget}GB, instead found {concurrent_chromosomes}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_write_allpair_file(tmp_path):
+    """unit test to make sure the allpair file is written with the header and can be read back with only the needed columns in both formats"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    pairs_df: pd.DataFrame = pd.DataFrame([
+        ["hapibd", "R1", "R2", "01", "var1", "N/A", 1, 0, "N/A", 1, 2, "N/A", "N/A", 100, 200, 3.5, "N/A", "N/A", "N/A"],
+        ["hapibd,ilash", "R1", "R3", "01", "var1", "N/A", 0, 1, 2, 2, 1, "0", "1", 150, 300, 4.0, 120, 310, 4.2]
+    ], columns=ALLPAIR_COLUMNS)
+
+    for file_name in ["IBD_var1.chr01.100-300.allpair.txt", "IBD_var1.chr01.100-300.allpair.txt.gz"]:
+
+        allpair_file: str = os.path.join(str(tmp_path), file_name)
+
+        write_allpair_file(allpair_file, pairs_df)
+
+        if file_name.endswith(".gz"):
+            with gzip.open(allpair_file, "rt") as allpair:
+                line_list: list = allpair.readlines()
+        else:
+            with open(allpair_file, "r") as allpair:
+                line_list: list = allpair.readlines()
+
+        if line_list[0] != "\t".join(ALLPAIR_COLUMNS) + "\n":
+            errors.append(f"Expected the header to be the ALLPAIR_COLUMNS for the file {file_name}, instead found {line_list[0]}")
+
+        if line_list[1] != "hapibd\tR1\tR2\t01\tvar1\tN/A\t1\t0\tN/A\t1\t2\tN/A\tN/A\t100\t200\t3.5\tN/A\tN/A\tN/A\n":
+            errors.append(f"Expected the first row to match the pairs_df for the file {file_name}, instead found {line_list[1]}")
+
+        carrier_df: pd.DataFrame = pd.read_csv(allpair_file, sep="\t", usecols=["pair_1", "pair_2", "carrier_status"])
+
+        if carrier_df.carrier_status.tolist() != [1, 0]:
+            errors.append(f"Expected the carrier status to be [1, 0] for the file {file_name}, instead found {carrier_df.carrier_status.tolist()}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append("../drive")
+
+import pandas as pd
+from create_network_scripts.create_networks import create_networks
+
+def test_create_networks(tmp_path):
+    """unit test to make sure every variant gets its networks written once even when the variants are on the same chromosome"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    pair_dir: str = os.path.join(str(tmp_path), "pairs/")
+
+    network_dir: str = os.path.join(str(tmp_path), "networks")
+
+    os.mkdir(pair_dir)
+
+    os.mkdir(network_dir)
+
+    # var1 and var10 are on the same chromosome and var3 has no pairs of 
+    # carriers
+    pd.DataFrame([
+        ["R1", "var1", "AG", 1, 1], ["R2", "var1", "AG", 1, 1], ["R3", "var1", "AG", 1, 1], ["R4", "var1", "AG", 1, 1],
+        ["R5", "var10", "AG", 1, 1], ["R6", "var10", "AG", 1, 1],
+        ["R7", "var3", "AG", 1, 3]
+    ], columns=["IID", "variant_id", "genotype", "confirmed_status", "chr"]).to_csv(os.path.join(str(tmp_path), "confirmed_carriers.txt"), sep="\t", index=False)
+
+    for file_name, pair_list in [
+        ("IBD_var1.chr01.100-200.allpair.txt", [["R3", "R4", 1], ["R1", "R2", 1], ["R2", "R9", 0]]),
+        ("IBD_var10.chr01.100-200.allpair.txt", [["R5", "R6", 1]]),
+        ("IBD_var3.chr03.100-200.allpair.txt", [["R7", "R8", 0]])
+    ]:
+        pd.DataFrame(pair_list, columns=["pair_1", "pair_2", "carrier_status"]).to_csv(os.path.join(pair_dir, file_name), sep="\t", index=False)
+
+    create_networks(pair_dir, network_dir, "gene", os.path.join(str(tmp_path), "confirmed_carriers.txt"), 2)
+
+    network_df: pd.DataFrame = pd.read_csv(os.path.join(network_dir, "network_groups.txt"), sep="\t", dtype=str)
+
+    network_dict: dict = dict(zip(network_df.IID, network_df["Network ID"].fillna("NA")))
+
+    if network_dict != {"R1": "2", "R2": "2", "R3": "1", "R4": "1", "R5": "1", "R6": "1", "R7": "NA"}:
+        errors.append(f"Expected the networks to be numbered for each variant, instead found {network_dict}")
+
+    percent_df: pd.DataFrame = pd.read_csv(os.path.join(network_dir, "percent_confirmed_carriers.csv"))
+
+    if sorted(percent_df.variant_id.tolist()) != ["var1", "var10", "var3"]:
+        errors.append(f"Expected a row for each variant in the percent_confirmed_carriers.csv file, instead found {percent_df.variant_id.tolist()}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
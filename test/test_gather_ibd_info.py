@@ -2,9 +2,13 @@ import sys
 import os
 import pandas as pd
 import collections
+import gzip
+import queue
+import random
 sys.path.append("../drive")
 
-from pre_shared_segments_analysis_scripts.shared_segment_detection.gathering_pairs.gather_ibd_info import create_iid_dict, create_dict_with_var_pos, create_no_carriers_file, create_var_info_dict, filter_no_carriers
+from pre_shared_segments_analysis_scripts.shared_segment_detection.segment_cache.iid_encoder import IID_Encoder
+from pre_shared_segments_analysis_scripts.shared_segment_detection.gathering_pairs.gather_ibd_info import create_iid_dict, create_dict_with_var_pos, create_no_carriers_file, create_var_info_dict, filter_no_carriers, schedule_tasks, gather_variant_segments, gather_chromosome_segments
 
 
 def test_create_iid_dict():
@@ -120,3 +124,114 @@ def test_filter_no_carriers():
     assert not errors, "errors occured: \n{}".format('\n'.join(errors))
 
 
+
+def test_schedule_tasks(tmp_path):
+    """unit test to make sure the tasks are ordered from the largest file size times carrier count to the smallest"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    small_file: str = os.path.join(str(tmp_path), "small_chr2.ibd.gz")
+    large_file: str = os.path.join(str(tmp_path), "large_chr1.ibd.gz")
+
+    with open(small_file, "w") as small:
+        small.write("a" * 100)
+
+    with open(large_file, "w") as large:
+        large.write("a" * 1000)
+
+    task_list: list = [
+        (small_file, {"var1": {"base_pos": 1, "iid_list": ["R1", "R2"]}}),
+        (large_file, {"var2": {"base_pos": 1, "iid_list": ["R1"]}}),
+        (small_file, {"var3": {"base_pos": 1, "iid_list": ["R1"] * 20}}),
+        (large_file, {"var4": {"base_pos": 1, "iid_list": ["R1", "R2", "R3"]}})
+    ]
+
+    scheduled_variants: list = [list(task[1].keys())[0] for task in schedule_tasks(task_list)]
+
+    if scheduled_variants != ["var4", "var3", "var2", "var1"]:
+        errors.append(f"Expected the tasks to be in the order ['var4', 'var3', 'var2', 'var1'], instead found {scheduled_variants}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+
+def test_single_pass_matches_per_variant(tmp_path):
+    """integration test to make sure that reading the segment file once for every variant on the chromosome, with and without the segment cache or the global iid dictionary, writes the same .small.txt.gz files as reading the file once for each variant"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    random.seed(10)
+
+    segment_file: str = os.path.join(str(tmp_path), "test_chr1.ibd.gz")
+
+    iid_list: list = ["R{}".format(number) for number in range(12)]
+
+    # writing a small hapibd file with the columns id1, hap1, id2, hap2, chr, start, end, cM
+    with gzip.open(segment_file, "wt") as segment_output:
+
+        for _ in range(60):
+
+            id1, id2 = random.sample(iid_list, 2)
+
+            start: int = random.randint(1, 9000)
+
+            end: int = start + random.randint(100, 3000)
+
+            segment_output.write("\t".join([id1, "1", id2, "2", "1", str(start), str(end), str(round(random.uniform(1, 10), 3))]) + "\n")
+
+    var_info_dict: dict = {
+        "var1": {"base_pos": 2500, "iid_list": iid_list[:4]},
+        "var2": {"base_pos": 5000, "iid_list": iid_list[2:9]},
+        "var3": {"base_pos": 8000, "iid_list": iid_list[5:11]}
+    }
+
+    per_variant_dir: str = os.path.join(str(tmp_path), "per_variant")
+
+    single_pass_dir: str = os.path.join(str(tmp_path), "single_pass")
+
+    cached_dir: str = os.path.join(str(tmp_path), "cached")
+
+    encoded_dir: str = os.path.join(str(tmp_path), "encoded")
+
+    for output_dir in [per_variant_dir, single_pass_dir, cached_dir, encoded_dir]:
+        os.mkdir(output_dir)
+
+    que_object = queue.Queue()
+
+    for variant, variant_info in var_info_dict.items():
+        gather_variant_segments(per_variant_dir, "hapibd", 3, que_object, (segment_file, {variant: variant_info}))
+
+    gather_chromosome_segments(single_pass_dir, "hapibd", 3, que_object, (segment_file, var_info_dict))
+
+    gather_chromosome_segments(cached_dir, "hapibd", 3, que_object, (segment_file, var_info_dict), os.path.join(str(tmp_path), "cache"))
+
+    # the global dictionary is missing most of the ids in the file so the 
+    # missing carriers are added and R11, which is not a carrier, is coded
+    # as -1
+    gather_chromosome_segments(encoded_dir, "hapibd", 3, que_object, (segment_file, var_info_dict), iid_encoder=IID_Encoder(["R3", "X1"]))
+
+    per_variant_files: list = sorted(os.listdir(os.path.join(per_variant_dir, "collected_pairs")))
+
+    if not per_variant_files:
+        errors.append("Expected the per variant scan to write .small.txt.gz files")
+
+    for output_dir in [single_pass_dir, cached_dir, encoded_dir]:
+
+        single_pass_files: list = sorted(os.listdir(os.path.join(output_dir, "collected_pairs")))
+
+        if per_variant_files != single_pass_files:
+            errors.append(f"Expected the same output files, instead found {per_variant_files} and {single_pass_files}")
+
+        for file_name in set(per_variant_files) & set(single_pass_files):
+
+            with gzip.open(os.path.join(per_variant_dir, "collected_pairs", file_name), "rt") as per_variant_file:
+                per_variant_text: str = per_variant_file.read()
+
+            with gzip.open(os.path.join(output_dir, "collected_pairs", file_name), "rt") as single_pass_file:
+                single_pass_text: str = single_pass_file.read()
+
+            if per_variant_text != single_pass_text:
+                errors.append(f"Expected the file {file_name} in {os.path.basename(output_dir)} to be the same as the per variant scan")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.append("../drive")
+
+from pre_shared_segments_analysis_scripts.shared_segment_detection.combine_output.genotype_matrix import Genotype_Matrix
+
+def write_plink_files(tmp_path, ped_rows: list) -> tuple:
+    """helper function to write a small map and ped file"""
+
+    map_file: str = os.path.join(str(tmp_path), "test_chr1_list.map")
+    ped_file: str = os.path.join(str(tmp_path), "test_chr1_list.ped")
+
+    with open(map_file, "w") as map_output:
+        map_output.write("1\tvar1\t0\t100\n1\tvar2\t0\t200\n")
+
+    with open(ped_file, "w") as ped_output:
+        for row in ped_rows:
+            ped_output.write(" ".join(row) + "\n")
+
+    return map_file, ped_file
+
+def test_genotype_matrix(tmp_path):
+    """unit test to make sure the genotypes of the carriers are found in the order of the ped file"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    # the second set of rows has an allele that is longer than one character
+    for ped_rows, expected_dtype in [
+        ([["R1", "R1", "0", "0", "1", "-9", "A", "G", "C", "C"], ["R2", "R2", "0", "0", "2", "-9", "G", "G", "0", "0"], ["R3", "R3", "0", "0", "1", "-9", "A", "A", "T", "C"]], "uint8"),
+        ([["R1", "R1", "0", "0", "1", "-9", "A", "G", "C", "C"], ["R2", "R2", "0", "0", "2", "-9", "G", "G", "0", "0"], ["R3", "R3", "0", "0", "1", "-9", "A", "A", "TA", "C"]], "uint16")
+    ]:
+
+        map_file, ped_file = write_plink_files(tmp_path, ped_rows)
+
+        genotype_matrix: Genotype_Matrix = Genotype_Matrix.from_plink(map_file, ped_file)
+
+        if genotype_matrix.allele_codes.dtype.name != expected_dtype:
+            errors.append(f"Expected the allele codes to be {expected_dtype}, instead found {genotype_matrix.allele_codes.dtype.name}")
+
+        if genotype_matrix.get_genotypes(["R3", "R1", "R9"], "var1") != ["AG", "AA"]:
+            errors.append(f"Expected the genotypes of R1 and R3 for var1 to be ['AG', 'AA'], instead found {genotype_matrix.get_genotypes(['R3', 'R1', 'R9'], 'var1')}")
+
+        expected_var2: list = ["00", "".join([ped_rows[2][8], ped_rows[2][9]])]
+
+        if genotype_matrix.get_genotypes(["R2", "R3"], "var2") != expected_var2:
+            errors.append(f"Expected the genotypes of R2 and R3 for var2 to be {expected_var2}, instead found {genotype_matrix.get_genotypes(['R2', 'R3'], 'var2')}")
+
+        if genotype_matrix.get_genotypes(["R1"], "var3") != []:
+            errors.append("Expected no genotypes for a variant that is not in the map file")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
@@ -0,0 +1,78 @@
+import sys
+import os
+import gzip
+import numpy as np
+sys.path.append("../drive")
+
+from pre_shared_segments_analysis_scripts.shared_segment_detection.segment_cache.iid_encoder import IID_Encoder
+from pre_shared_segments_analysis_scripts.shared_segment_detection.segment_cache.segment_cache import Segment_Cache, convert_segment_files
+
+def test_encode_and_extend():
+    """unit test to make sure the iids are encoded and extended without changing the existing codes"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    iid_encoder: IID_Encoder = IID_Encoder(["R1", "R2", "R3", "R2"])
+
+    if len(iid_encoder) != 3:
+        errors.append(f"Expected the duplicate iid to be dropped, instead found {len(iid_encoder)} iids")
+
+    if list(iid_encoder.encode(["R3", "R1", "R9"])) != [2, 0, -1]:
+        errors.append(f"Expected the codes to be [2, 0, -1], instead found {list(iid_encoder.encode(['R3', 'R1', 'R9']))}")
+
+    extended_encoder: IID_Encoder = iid_encoder.extend(["R9", "R1", "R8", "R9"])
+
+    if list(extended_encoder.encode(["R1", "R9", "R8"])) != [0, 3, 4]:
+        errors.append("Expected the new iids to be added to the end of the dictionary")
+
+    if list(extended_encoder.decode(np.array([4, 0]))) != ["R8", "R1"]:
+        errors.append("Expected the codes to decode back into the iids")
+
+    if list(extended_encoder.carrier_mask(["R2", "R8", "R7"])) != [False, True, False, False, True]:
+        errors.append(f"Expected the carrier mask to be True at the codes for R2 and R8, instead found {list(extended_encoder.carrier_mask(['R2', 'R8', 'R7']))}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_segment_cache_with_iid_dictionary(tmp_path):
+    """unit test to make sure the segment cache stores int32 codes and is rebuilt when the iid dictionary changes"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    cache_dir: str = os.path.join(str(tmp_path), "cache")
+
+    fam_file: str = os.path.join(str(tmp_path), "cohort.fam")
+
+    with open(fam_file, "w") as fam:
+        fam.write("F1 R1 0 0 1 -9\nF2 R2 0 0 2 -9\n")
+
+    ibd_file: str = os.path.join(str(tmp_path), "test_chr1.ibd.gz")
+
+    with gzip.open(ibd_file, "wt") as ibd:
+        ibd.write("R1\t1\tR2\t2\t1\t100\t200\t3.5\n")
+        ibd.write("R5\t1\tR2\t1\t1\t150\t250\t4.5\n")
+
+    convert_segment_files([ibd_file], cache_dir, "hapibd", 1, fam_file)
+
+    segment_cache: Segment_Cache = Segment_Cache(cache_dir, "hapibd")
+
+    id_codes: np.ndarray = segment_cache.load_columns(ibd_file, ["id1"])[0]
+
+    # R1 is in the cohort and R5 is an extra iid for this file
+    if id_codes.dtype != np.int32 or list(id_codes) != [0, 2]:
+        errors.append(f"Expected the id1 column to be the int32 codes [0, 2], instead found {list(id_codes)}")
+
+    if list(segment_cache.load_segments(ibd_file, ["id1", "id2"])[0]) != ["R1", "R5"]:
+        errors.append("Expected the id codes to be decoded back into the iids")
+
+    # adding an iid to the cohort changes the dictionary so the cache is out of date
+    with open(fam_file, "a") as fam:
+        fam.write("F3 R3 0 0 1 -9\n")
+
+    IID_Encoder.from_file(fam_file).save(cache_dir)
+
+    if Segment_Cache(cache_dir, "hapibd").is_valid(ibd_file):
+        errors.append("Expected the cache to be invalid after the iid dictionary changed")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
@@ -0,0 +1,62 @@
+import sys
+import pandas as pd
+import numpy as np
+sys.path.append("../drive")
+
+from pre_shared_segments_analysis_scripts.shared_segment_detection.segment_cache.interval_index import Interval_Index
+from pre_shared_segments_analysis_scripts.shared_segment_detection.gathering_pairs.filtering_functions import filter_for_correct_base_pair, filter_for_gene_site
+
+def make_segment_df() -> pd.DataFrame:
+    """helper function to make a dataframe of random segments with the start in column 5 and the end in column 6"""
+
+    random_generator = np.random.RandomState(12)
+
+    start: np.ndarray = random_generator.randint(0, 100000, size=2000)
+
+    end: np.ndarray = start + random_generator.randint(1, 20000, size=2000)
+
+    return pd.DataFrame({5: start, 6: end})
+
+def test_covering():
+    """unit test to make sure the covering method returns the same rows as filter_for_correct_base_pair"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    segment_df: pd.DataFrame = make_segment_df()
+
+    # using a small block size so that multiple blocks are checked
+    interval_index: Interval_Index = Interval_Index(segment_df[5].values, segment_df[6].values, block_size=16)
+
+    for position in [0, 500, 25000, int(segment_df[5].iloc[10]), 99999, 130000]:
+
+        expected_rows: list = list(filter_for_correct_base_pair(segment_df, 5, 6, position).index)
+
+        if list(interval_index.covering(position)) != expected_rows:
+            errors.append(f"The covering rows for position {position} did not match filter_for_correct_base_pair")
+
+        inclusive_rows: list = list(segment_df[(segment_df[5] <= position) & (segment_df[6] >= position)].index)
+
+        if list(interval_index.covering(position, inclusive=True)) != inclusive_rows:
+            errors.append(f"The inclusive covering rows for position {position} did not match")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_overlapping():
+    """unit test to make sure the overlapping method returns the same rows as filter_for_gene_site"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    segment_df: pd.DataFrame = make_segment_df()
+
+    interval_index: Interval_Index = Interval_Index(segment_df[5].values, segment_df[6].values, block_size=16)
+
+    for gene_start, gene_end in [(0, 10), (40000, 40500), (50000, 90000), (125000, 130000)]:
+
+        expected_rows: list = list(filter_for_gene_site(segment_df, 5, 6, gene_start, gene_end).index)
+
+        if list(interval_index.overlapping(gene_start, gene_end)) != expected_rows:
+            errors.append(f"The overlapping rows for the window {gene_start}-{gene_end} did not match filter_for_gene_site")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
@@ -0,0 +1,51 @@
+import sys
+import os
+import gzip
+import pandas as pd
+sys.path.append("../drive")
+
+from pre_shared_segments_analysis_scripts.shared_segment_detection.segment_cache.segment_cache import load_pair_index
+from pre_shared_segments_analysis_scripts.shared_segment_detection.combine_output.get_haplotype_info import hapibd_info_finder
+
+def write_hapibd_file(file_path: str) -> pd.DataFrame:
+    """helper function to write a small hapibd file and return it as a dataframe"""
+
+    row_list: list = [
+        ["R1", 1, "R2", 2, 1, 100, 200, 3.5],
+        ["R3", 2, "R4", 1, 1, 150, 300, 4.0],
+        ["R2", 2, "R1", 1, 1, 400, 600, 5.5],
+        ["R1", 1, "R2", 1, 1, 700, 900, 6.0],
+        ["R4", 1, "R5", 2, 1, 100, 900, 7.5]
+    ]
+
+    with gzip.open(file_path, "wt") as ibd_file:
+        for row in row_list:
+            ibd_file.write("\t".join(map(str, row)) + "\n")
+
+    return pd.read_csv(file_path, sep="\t", header=None)
+
+def test_pair_index_matches_dataframe(tmp_path):
+    """unit test to make sure the pair index finds the same segment information as filtering the whole dataframe"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    ibd_file: str = os.path.join(str(tmp_path), "test_chr1.ibd.gz")
+
+    ibd_df: pd.DataFrame = write_hapibd_file(ibd_file)
+
+    # checking the index built from the text file and the index from the segment cache
+    for cache_dir in [None, os.path.join(str(tmp_path), "cache")]:
+
+        pair_index = load_pair_index(ibd_file, "hapibd", cache_dir)
+
+        for pair_1, pair_2, var_position in [("R1", "R2", 750), ("R2", "R1", 450), ("R2", "R1", 750), ("R5", "R4", 500), ("R1", "R4", 120), ("R9", "R1", 120)]:
+
+            expected_dict: dict = hapibd_info_finder(ibd_df, pair_1, pair_2, "hapibd").get_len_info(var_position=var_position)
+
+            index_dict: dict = hapibd_info_finder(pair_index, pair_1, pair_2, "hapibd").get_len_info(var_position=var_position)
+
+            if {key: str(value) for key, value in expected_dict.items()} != {key: str(value) for key, value in index_dict.items()}:
+                errors.append(f"Expected the pair {pair_1}-{pair_2} at {var_position} to be {expected_dict} with the cache_dir {cache_dir}, instead found {index_dict}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
@@ -0,0 +1,177 @@
+import sys
+import os
+import stat
+sys.path.append("../drive")
+
+from run_plink.plink_job_runner import Plink_Job, Plink_Job_Runner
+from run_plink.plink_formatter import Analysis_Checker
+
+def write_fake_plink(bin_dir: str):
+    """helper function to write a plink script that creates the output files for the --out prefix"""
+
+    plink_path: str = os.path.join(bin_dir, "plink")
+
+    with open(plink_path, "w") as plink_file:
+        plink_file.write("#!/bin/sh\nwhile [ \"$1\" != \"--out\" ]; do shift; done\ntouch \"$2.ped\" \"$2.map\" \"$2.raw\" \"$2.bed\" \"$2.bim\" \"$2.fam\"\necho \"ran $2\"\n")
+
+    os.chmod(plink_path, os.stat(plink_path).st_mode | stat.S_IEXEC)
+
+def test_get_command():
+    """unit test to make sure the plink command has the threads, the memory, and the split recode option"""
+
+    job: Plink_Job = Plink_Job("out/chr01_list", "recode A", ["--bfile", "data", "--extract", "chr01_list.txt"])
+
+    command: list = job.get_command(2, 1000)
+
+    assert command == ["plink", "--bfile", "data", "--extract", "chr01_list.txt", "--out", "out/chr01_list", "--threads", "2", "--memory", "1000", "--recode", "A"], f"the plink command was not formed correctly: {command}"
+
+def test_plink_job_runner(tmp_path, monkeypatch):
+    """unit test to make sure each job runs once, the logs are merged, and jobs with newer outputs are skipped"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    write_fake_plink(str(tmp_path))
+
+    monkeypatch.setenv("PATH", os.pathsep.join([str(tmp_path), os.environ["PATH"]]))
+
+    var_file_list: list = []
+
+    for chr_num in ["01", "02"]:
+
+        var_file: str = os.path.join(str(tmp_path), f"variants_of_interest.chr{chr_num}_list.txt")
+
+        with open(var_file, "w") as variant_file:
+            variant_file.write("rs1\n")
+
+        var_file_list.append(var_file)
+
+    log_file: str = os.path.join(str(tmp_path), "plink_log.log")
+
+    for run_number, expected_count in [(1, 2), (2, 0)]:
+
+        job_runner: Plink_Job_Runner = Plink_Job_Runner(4, 2000)
+
+        # adding every job twice to make sure that it is only run once
+        for var_file in var_file_list + var_file_list:
+            job_runner.add_job(Plink_Job(var_file[:-4], "recode", ["--extract", var_file], [var_file]))
+
+        job_count: int = job_runner.run(log_file)
+
+        if job_count != expected_count:
+            errors.append(f"Expected {expected_count} plink jobs to run for run {run_number}, instead found {job_count}")
+
+    with open(log_file, "r") as plink_log:
+        log_line_list: list = plink_log.readlines()
+
+    if log_line_list != [f"ran {var_file[:-4]}\n" for var_file in var_file_list]:
+        errors.append(f"Expected the log of each job in the order that the jobs were added, instead found {log_line_list}")
+
+    if any(file.endswith(".plink_stdout.log") for file in os.listdir(str(tmp_path))):
+        errors.append("Expected the job logs to be removed after they were merged")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_plink_job_rerun_on_changed_args(tmp_path, monkeypatch):
+    """unit test to make sure that changing the --max-maf value reruns a job even though its outputs are newer than its inputs"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    write_fake_plink(str(tmp_path))
+
+    monkeypatch.setenv("PATH", os.pathsep.join([str(tmp_path), os.environ["PATH"]]))
+
+    var_file: str = os.path.join(str(tmp_path), "variants_of_interest.chr01_list.txt")
+
+    with open(var_file, "w") as variant_file:
+        variant_file.write("rs1\n")
+
+    for run_number, maf, expected_count in [(1, "0.05", 1), (2, "0.05", 0), (3, "0.01", 1), (4, "0.01", 0)]:
+
+        job_runner: Plink_Job_Runner = Plink_Job_Runner(2)
+
+        job_runner.add_job(Plink_Job(var_file[:-4], "recodeA", ["--bfile", "data", "--extract", var_file, "--max-maf", maf], [var_file]))
+
+        job_count: int = job_runner.run(os.path.join(str(tmp_path), "plink_log.log"))
+
+        if job_count != expected_count:
+            errors.append(f"Expected {expected_count} plink jobs to run for run {run_number} with --max-maf {maf}, instead found {job_count}")
+
+    with open(var_file[:-4] + ".recodeA.cmd", "r") as command_file:
+        command_record: str = command_file.read()
+
+    if "--max-maf 0.01" not in command_record:
+        errors.append(f"Expected the .cmd file to have the arguments of the last run, instead found {command_record}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_extract_once(tmp_path, monkeypatch):
+    """unit test to make sure the variants are extracted into a .bed file once and every recode option reads that file and reruns when it changes"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    write_fake_plink(str(tmp_path))
+
+    monkeypatch.setenv("PATH", os.pathsep.join([str(tmp_path), os.environ["PATH"]]))
+
+    plink_dir: str = os.path.join(str(tmp_path), "plink_output_files/")
+
+    analysis_checker: Analysis_Checker = Analysis_Checker("gene", ["recode", "recodeA"], "data", str(tmp_path), plink_dir, maf_filter="0.05", extract_once=True)
+
+    var_file: str = os.path.join(plink_dir, "variants_of_interest.chr01_list.txt")
+
+    with open(var_file, "w") as variant_file:
+        variant_file.write("rs1\n")
+
+    output_prefix: str = var_file[:-4]
+
+    for run_number, expected_count in [(1, 3), (2, 0), (3, 3)]:
+
+        # changing the variant list so that the .bed file is made again
+        if run_number == 3:
+            os.utime(var_file, (os.path.getmtime(output_prefix + ".raw") + 10, os.path.getmtime(output_prefix + ".raw") + 10))
+
+        job_runner: Plink_Job_Runner = Plink_Job_Runner(2)
+
+        analysis_checker.add_recode_jobs(job_runner, output_prefix, ["--bfile", "data", "--extract", var_file], [var_file])
+
+        job_list: list = list(job_runner.job_dict.values())
+
+        if [(job.option, job.plink_args) for job in job_list] != [("make-bed", ["--bfile", "data", "--extract", var_file]), ("recode", ["--bfile", output_prefix]), ("recodeA", ["--bfile", output_prefix])]:
+            errors.append(f"Expected a make-bed job and then recode jobs that read its output, instead found {job_list}")
+
+        job_count: int = job_runner.run(os.path.join(plink_dir, "plink_log.log"))
+
+        if job_count != expected_count:
+            errors.append(f"Expected {expected_count} plink jobs to run for run {run_number}, instead found {job_count}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_extract_once_without_recode_options(tmp_path):
+    """unit test to make sure the gene analysis still makes the .ped and .map files when the variants are extracted once without any recode options"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    plink_dir: str = os.path.join(str(tmp_path), "plink_output_files/")
+
+    var_file: str = os.path.join(plink_dir, "variants_of_interest.chr01_list.txt")
+
+    output_prefix: str = var_file[:-4]
+
+    for analysis_type, expected_options in [("gene", ["make-bed", "recode"]), ("maf", ["make-bed"])]:
+
+        analysis_checker: Analysis_Checker = Analysis_Checker(analysis_type, None, "data", str(tmp_path), plink_dir, maf_filter="0.05", extract_once=True)
+
+        job_runner: Plink_Job_Runner = Plink_Job_Runner(2)
+
+        analysis_checker.add_recode_jobs(job_runner, output_prefix, ["--bfile", "data", "--extract", var_file], [var_file])
+
+        option_list: list = [job.option for job in job_runner.job_dict.values()]
+
+        if option_list != expected_options:
+            errors.append(f"Expected the jobs {expected_options} for the {analysis_type} analysis, instead found {option_list}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
@@ -0,0 +1,71 @@
+import sys
+import os
+import pandas as pd
+sys.path.append("../drive")
+import utility_scripts
+
+from pre_shared_segments_analysis_scripts.shared_segment_detection.combine_output.reformat import Pheno_Reformatter
+
+def write_allpair_file(file_path: str, pair_list: list):
+    """helper function to write an allpair file with only the pair columns"""
+
+    pd.DataFrame(pair_list, columns=["IBD_programs", "pair_1", "pair_2"]).to_csv(file_path, sep="\t", index=False)
+
+def test_get_allpair_file_dict(tmp_path):
+    """unit test to make sure the allpair files are keyed by the chromosome number and the identifier"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    allpair_dir: str = "".join([str(tmp_path), "/"])
+
+    for file_name in ["IBD_var1_A.chr01.100-200.allpair.txt", "IBD_var10_A.chr01.100-200.allpair.txt.gz", "IBD_GENE1.chr12.300-400.allpair.txt", "no_match.txt"]:
+        write_allpair_file(os.path.join(allpair_dir, file_name), [["hapibd", "R1", "R2"]])
+
+    allpair_file_dict: dict = utility_scripts.get_allpair_file_dict(allpair_dir)
+
+    expected_dict: dict = {
+        ("chr01", "var1_A"): os.path.join(allpair_dir, "IBD_var1_A.chr01.100-200.allpair.txt"),
+        ("chr01", "var10_A"): os.path.join(allpair_dir, "IBD_var10_A.chr01.100-200.allpair.txt.gz"),
+        ("chr12", "GENE1"): os.path.join(allpair_dir, "IBD_GENE1.chr12.300-400.allpair.txt")
+    }
+
+    if allpair_file_dict != expected_dict:
+        errors.append(f"Expected the allpair file dictionary to be {expected_dict}, instead found {allpair_file_dict}")
+
+    if utility_scripts.fix_chr("chr1") != "chr01":
+        errors.append(f"Expected the chromosome chr1 to be formatted as chr01, instead found {utility_scripts.fix_chr('chr1')}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_pheno_reformat(tmp_path):
+    """unit test to make sure the confirmed status of each carrier is found from the allpair file of the gene"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    allpair_dir: str = "".join([str(tmp_path), "/"])
+
+    write_allpair_file(os.path.join(allpair_dir, "IBD_GENE1.chr01.100-200.allpair.txt"), [["hapibd", "R1", "R2"], ["ilash", "R1", "R5"]])
+    write_allpair_file(os.path.join(allpair_dir, "IBD_GENE2.chr12.300-400.allpair.txt"), [["hapibd", "R3", "R4"]])
+
+    pheno_gmap: pd.DataFrame = pd.DataFrame([["GENE1", "chr1", 100, 200], ["GENE2", "chr12", 300, 400]])
+
+    pheno_carrier: pd.DataFrame = pd.DataFrame({"IID": ["R1", "R2", "R6", "R3"], "gene": ["GENE1", "GENE1", "GENE1", "GENE2"]})
+
+    Pheno_Reformatter(str(tmp_path), pheno_gmap, pheno_carrier, allpair_dir).reformat()
+
+    confirmed_df: pd.DataFrame = pd.read_csv(os.path.join(str(tmp_path), "confirmed_carriers.txt"), sep="\t", dtype=str)
+
+    # R3 is not confirmed because R4 is not a carrier for GENE2
+    expected_df: pd.DataFrame = pd.DataFrame({
+        "IID": ["R1", "R2", "R6", "R3"],
+        "gene_name": ["GENE1", "GENE1", "GENE1", "GENE2"],
+        "confirmed_status": ["1", "1", "0", "0"],
+        "chr": ["01", "01", "01", "12"]
+    })
+
+    if not confirmed_df[["IID", "gene_name", "confirmed_status", "chr"]].equals(expected_df):
+        errors.append(f"Expected the confirmed carriers to be \n{expected_df}\n instead found \n{confirmed_df}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
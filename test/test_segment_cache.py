@@ -0,0 +1,182 @@
+import sys
+import os
+import gzip
+import pandas as pd
+import numpy as np
+sys.path.append("../drive")
+
+from pre_shared_segments_analysis_scripts.shared_segment_detection.segment_cache.segment_cache import Segment_Cache, get_cache_layout, estimate_ibd_rows, estimate_pair_index_memory, TEXT_INDEX_BYTES_PER_ROW
+from pre_shared_segments_analysis_scripts.shared_segment_detection.segment_cache.iid_encoder import IID_Encoder
+
+def write_hapibd_file(file_path: str, row_list: list):
+    """helper function to write a small hapibd file"""
+
+    with gzip.open(file_path, "wt") as ibd_file:
+        for row in row_list:
+            ibd_file.write("\t".join(map(str, row)) + "\n")
+
+def test_get_cache_layout():
+    """unit test to make sure the cache layout uses the hapibd and ilash indices"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    hapibd_layout: dict = get_cache_layout("hapibd")
+    ilash_layout: dict = get_cache_layout("ilash")
+
+    if hapibd_layout["cM"] != 7 or ilash_layout["cM"] != 9:
+        errors.append(f"Expected the cM column to be 7 for hapibd and 9 for ilash, instead found {hapibd_layout['cM']} and {ilash_layout['cM']}")
+
+    if hapibd_layout["phase1"] != 1 or hapibd_layout["phase2"] != 3:
+        errors.append("Expected the phase columns to be 1 and 3")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_segment_cache_load_segments(tmp_path):
+    """unit test to make sure that the cached columns match the ibd file"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    ibd_file: str = os.path.join(str(tmp_path), "test_chr1.ibd.gz")
+
+    write_hapibd_file(ibd_file, [
+        ["R1", 1, "R2", 2, 1, 100, 200, 3.5],
+        ["R3", 2, "R4", 1, 1, 150, 300, 2.25],
+        ["R1", 1, "R4", 1, 1, 250, 400, 6.0]
+    ])
+
+    segment_cache: Segment_Cache = Segment_Cache(os.path.join(str(tmp_path), "cache"), "hapibd")
+
+    cached_df: pd.DataFrame = segment_cache.load_segments(ibd_file, ["id1", "id2", "start", "end", "cM"])
+
+    raw_df: pd.DataFrame = pd.read_csv(ibd_file, sep="\t", header=None)
+
+    if not segment_cache.is_valid(ibd_file):
+        errors.append("Expected the cache to be valid after it was built")
+
+    if list(cached_df.columns) != [0, 2, 5, 6, 7]:
+        errors.append(f"Expected the columns to be the raw indices [0, 2, 5, 6, 7], instead found {list(cached_df.columns)}")
+
+    for column in cached_df.columns:
+        if list(cached_df[column]) != list(raw_df[column]):
+            errors.append(f"Expected the cached column {column} to match the ibd file")
+
+    # only rows with a carrier that are at least 3 cM should be returned
+    chunk_list: list = list(segment_cache.iter_segments(ibd_file, ["id1", "id2", "cM"], carriers={"R1"}, min_cM=3))
+
+    if len(chunk_list) != 1 or list(chunk_list[0][2]) != ["R2", "R4"]:
+        errors.append("Expected the filtered segments to be the two rows where R1 has a segment of at least 3 cM")
+
+    # the persisted interval index should find the two segments covering 175
+    if list(segment_cache.query_rows(ibd_file, positions=[175])) != [0, 1]:
+        errors.append(f"Expected rows 0 and 1 to cover position 175, instead found {list(segment_cache.query_rows(ibd_file, positions=[175]))}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_segment_cache_invalidation(tmp_path):
+    """unit test to make sure that the cache is rebuilt when the ibd file changes"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    ibd_file: str = os.path.join(str(tmp_path), "test_chr1.ibd.gz")
+
+    write_hapibd_file(ibd_file, [["R1", 1, "R2", 2, 1, 100, 200, 3.5]])
+
+    segment_cache: Segment_Cache = Segment_Cache(os.path.join(str(tmp_path), "cache"), "hapibd")
+
+    segment_cache.build_if_needed(ibd_file)
+
+    # rewriting the file with an extra row so the size changes
+    write_hapibd_file(ibd_file, [["R1", 1, "R2", 2, 1, 100, 200, 3.5], ["R3", 1, "R4", 2, 1, 100, 200, 4.5]])
+
+    if segment_cache.is_valid(ibd_file):
+        errors.append("Expected the cache to be invalid after the ibd file changed")
+
+    cached_df: pd.DataFrame = segment_cache.load_segments(ibd_file, ["id1"])
+
+    if len(cached_df) != 2:
+        errors.append(f"Expected the rebuilt cache to have 2 rows, instead found {len(cached_df)}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_segment_cache_chunked_build(tmp_path):
+    """unit test to make sure that a cache built one chunk at a time matches the ibd file and only keeps the columns in the layout"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    cache_dir: str = os.path.join(str(tmp_path), "cache")
+
+    # F1 and F2 are in the cohort so the other ids are extra iids for the file
+    IID_Encoder(["F1", "F2"]).save(cache_dir)
+
+    ibd_file: str = os.path.join(str(tmp_path), "test_chr1.match.gz")
+
+    # the ilash columns 7 and 8 are not in the layout
+    write_hapibd_file(ibd_file, [
+        ["F1", "R1_0", "F3", "R3_1", 1, 100, 200, "rs1", "rs2", 3.5],
+        ["F4", "R4_0", "F2", "R2_0", 1, 150, 300, "rs3", "rs4", 2.25],
+        ["F1", "R1_1", "F4", "R4_1", 1, 250, 400, "rs5", "rs6", 6.0],
+        ["F5", "R5_0", "F3", "R3_0", 1, 50, 500, "rs7", "rs8", 8.0],
+        ["F2", "R2_1", "F1", "R1_0", 1, 120, 220, "rs9", "rs10", 1.5]
+    ])
+
+    segment_cache: Segment_Cache = Segment_Cache(cache_dir, "ilash")
+
+    cache_path: str = segment_cache.build(ibd_file, chunksize=2)
+
+    cached_df: pd.DataFrame = segment_cache.load_segments(ibd_file)
+
+    raw_df: pd.DataFrame = pd.read_csv(ibd_file, sep="\t", header=None, dtype={1: str, 3: str})
+
+    if list(cached_df.columns) != [0, 1, 2, 3, 4, 5, 6, 9]:
+        errors.append(f"Expected only the layout columns to be cached, instead found {list(cached_df.columns)}")
+
+    for column in cached_df.columns:
+        if list(cached_df[column]) != list(raw_df[column]):
+            errors.append(f"Expected the cached column {column} to match the ibd file")
+
+    if any(".part" in file_name for file_name in os.listdir(cache_path)):
+        errors.append("Expected the chunk files to be removed after they were merged")
+
+    extra_iids: list = np.load(os.path.join(cache_path, "extra_iids.npy")).tolist()
+
+    if extra_iids != ["F4", "F3", "F5"]:
+        errors.append(f"Expected the extra iids to be ['F4', 'F3', 'F5'] in the order they were found, instead found {extra_iids}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_estimate_pair_index_memory(tmp_path):
+    """unit test to make sure the pair index memory is estimated from the number of rows or from the cached index arrays"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    ibd_file: str = os.path.join(str(tmp_path), "test_chr1.ibd.gz")
+
+    write_hapibd_file(ibd_file, [["R{}".format(row), 1, "R{}".format(row + 1), 2, 1, 100 + row, 200 + row, 3.5] for row in range(500)])
+
+    # the whole file is in the sample so the row count is exact
+    if estimate_ibd_rows(ibd_file) != 500:
+        errors.append(f"Expected 500 rows, instead found {estimate_ibd_rows(ibd_file)}")
+
+    if estimate_pair_index_memory(ibd_file, "hapibd") != 500 * TEXT_INDEX_BYTES_PER_ROW:
+        errors.append("Expected the memory of the text index to be the rows times TEXT_INDEX_BYTES_PER_ROW")
+
+    cache_dir: str = os.path.join(str(tmp_path), "cache")
+
+    segment_cache: Segment_Cache = Segment_Cache(cache_dir, "hapibd")
+
+    cache_path: str = segment_cache.build(ibd_file)
+
+    # the pair index uses the id columns, the phase, start, end, and cM columns, and the pair order and keys
+    index_files: list = ["0.npy", "2.npy", "1.npy", "3.npy", "5.npy", "6.npy", "7.npy", "pair_order.npy", "pair_keys.npy"]
+
+    expected_bytes: int = sum(os.path.getsize(os.path.join(cache_path, file_name)) for file_name in index_files)
+
+    if estimate_pair_index_memory(ibd_file, "hapibd", cache_dir) != expected_bytes:
+        errors.append(f"Expected the memory of the cached index to be {expected_bytes} bytes, instead found {estimate_pair_index_memory(ibd_file, 'hapibd', cache_dir)}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
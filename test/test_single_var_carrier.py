@@ -20,3 +20,76 @@
 #         file for file in output_file_list if file[-4:] == ".raw"]
 
 #     assert len(checked_list) == len(output_file_list)
+
+import sys
+sys.path.append("../drive")
+
+import os
+import numpy as np
+import pandas as pd
+from carrier_analysis_scripts.identify_single_var_carrier import get_carrier_df, get_allele_frequency_df, single_variant_analysis
+
+def test_get_carrier_df():
+    """unit test to make sure the carriers are listed by variant and then by raw file order with N/A for variants without carriers"""
+
+    raw_df: pd.DataFrame = pd.DataFrame({
+        "FID": ["F1", "F2", "F3"], "IID": ["R1", "R2", "R3"], "PAT": 0, "MAT": 0, "SEX": 1, "PHENOTYPE": -9,
+        "rs1_A": [2.0, 0.0, 1.0], "rs2_A": [0.0, np.nan, 0.0], "rs3_A": [np.nan, 1.0, 0.0]
+    })
+
+    carrier_df: pd.DataFrame = get_carrier_df(raw_df)
+
+    assert carrier_df.values.tolist() == [["R1", "rs1_A"], ["R3", "rs1_A"], ["N/A", "rs2_A"], ["R2", "rs3_A"]], f"the carriers were not found correctly: {carrier_df.values.tolist()}"
+
+def test_get_allele_frequency_df():
+    """unit test to make sure the allele frequency is the number of carriers divided by the number of alleles for each variant"""
+
+    raw_df: pd.DataFrame = pd.DataFrame({
+        "FID": ["F1", "F2", "F3", "F4"], "IID": ["R1", "R2", "R3", "R4"], "PAT": 0, "MAT": 0, "SEX": 1, "PHENOTYPE": -9,
+        "rs1_A": [2.0, 0.0, 1.0, 0.0], "rs2_A": [0.0, np.nan, 0.0, 0.0]
+    })
+
+    allele_frequency_df: pd.DataFrame = get_allele_frequency_df(raw_df)
+
+    assert allele_frequency_df.values.tolist() == [["rs1_A", 0.25], ["rs2_A", 0.0]], f"the allele frequencies were not found correctly: {allele_frequency_df.values.tolist()}"
+
+def test_single_variant_analysis(tmp_path):
+    """unit test to make sure the carriers and the allele frequencies are written for the individuals in the population from each raw file"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    output_dir: str = "".join([str(tmp_path), "/"])
+
+    recode_dir: str = os.path.join(output_dir, "plink_output_files/")
+
+    os.mkdir(recode_dir)
+
+    pd.DataFrame({
+        "FID": ["F1", "F2", "F3", "F4"], "IID": ["R1", "R2", "R3", "R4"], "PAT": 0, "MAT": 0, "SEX": 1, "PHENOTYPE": -9,
+        "rs1_A": [2, 0, 1, 1], "rs2_A": [0, 0, 0, 2]
+    }).to_csv(os.path.join(recode_dir, "variants_of_interest.chr01_list.raw"), sep=" ", index=False, na_rep="NA")
+
+    pop_info: str = os.path.join(output_dir, "pop_info.txt")
+
+    # R4 is the only carrier of rs2_A and is filtered out by the population
+    pd.DataFrame({"grid": ["R1", "R2", "R3", "R4"], "Pop": ["EUR", "EUR", "EUR", "AFR"]}).to_csv(pop_info, sep="\t", index=False)
+
+    single_variant_analysis({
+        "recode_filepath": recode_dir,
+        "output": output_dir,
+        "pop_info": pop_info,
+        "pop_code": "EUR"
+    })
+
+    carrier_df: pd.DataFrame = pd.read_csv(os.path.join(output_dir, "carrier_analysis_output/chr01.single_variant_carrier.csv"), keep_default_na=False)
+
+    if carrier_df.values.tolist() != [["R1", "rs1_A"], ["R3", "rs1_A"], ["N/A", "rs2_A"]]:
+        errors.append(f"Expected the carriers R1 and R3 for rs1_A and no carriers for rs2_A, instead found {carrier_df.values.tolist()}")
+
+    allele_frequency_df: pd.DataFrame = pd.read_csv(os.path.join(output_dir, "carrier_analysis_output/allele_frequencies.txt"), sep="\t", keep_default_na=False)
+
+    if allele_frequency_df.values.tolist() != [["chr01", "rs1_A", 2 / 6], ["chr01", "rs2_A", 0.0]]:
+        errors.append(f"Expected the allele frequencies of the three EUR individuals, instead found {allele_frequency_df.values.tolist()}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
@@ -0,0 +1,48 @@
+import sys
+sys.path.append("../drive")
+
+from create_network_scripts.union_find import Union_Find, assign_network_ids
+
+def test_union_find():
+    """unit test to make sure nodes are only in the same set after a path of unions connects them"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    union_find: Union_Find = Union_Find(6)
+
+    for node_1, node_2 in [(0, 1), (2, 3), (1, 3), (4, 4)]:
+        union_find.union(node_1, node_2)
+
+    roots: list = union_find.get_roots().tolist()
+
+    if len(set(roots[:4])) != 1:
+        errors.append(f"Expected the nodes 0 to 3 to have the same root, instead found {roots}")
+
+    if len(set(roots)) != 3:
+        errors.append(f"Expected three sets of nodes, instead found the roots {roots}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_assign_network_ids():
+    """unit test to make sure the networks are the connected iids and are numbered in the order they are found in the pair_1 column"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    # R5 is only connected to the first network through R4 in the pair_2 
+    # column and the long chain would have needed many steps of the old 
+    # recursive search
+    pair_1_list: list = ["R7", "R1", "R2", "R5", "R9"] + [f"C{i}" for i in range(2000)]
+    pair_2_list: list = ["R8", "R2", "R4", "R4", "R7"] + [f"C{i + 1}" for i in range(2000)]
+
+    network_id_dict: dict = assign_network_ids(pair_1_list, pair_2_list)
+
+    expected_dict: dict = {"R7": 1, "R8": 1, "R9": 1, "R1": 2, "R2": 2, "R4": 2, "R5": 2}
+
+    expected_dict.update({f"C{i}": 3 for i in range(2001)})
+
+    if network_id_dict != expected_dict:
+        errors.append(f"Expected the network ids {expected_dict}, instead found {network_id_dict}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
@@ -0,0 +1,74 @@
+import sys
+import os
+import multiprocessing as mp
+from functools import partial
+sys.path.append("../drive")
+
+from utility_scripts.parallelize.worker_tables import Worker_Table, set_worker_tables, call_with_worker_tables
+from utility_scripts.parallelize.result_channel import Result_Channel
+
+def count_carriers(var_info_dict: dict, variant: str, multiplier: int = 1) -> int:
+    """helper function that is run in the worker processes"""
+
+    return len(var_info_dict[variant]["iid_list"]) * multiplier
+
+def write_variant(que_object, variant: str):
+    """helper function that writes the variant to the result channel from the worker process"""
+
+    que_object.put(f"{variant}\n")
+
+def test_call_with_worker_tables():
+    """unit test to make sure the Worker_Table references are replaced by the tables in the worker process"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    var_info_dict: dict = {
+        "var1": {"base_pos": 10, "iid_list": ["R1", "R2"]},
+        "var2": {"base_pos": 20, "iid_list": ["R1", "R2", "R3"]}
+    }
+
+    variant_list: list = ["var1", "var2"]
+
+    func = partial(call_with_worker_tables, count_carriers, Worker_Table("var_info_dict"), multiplier=2)
+
+    pool = mp.Pool(2, initializer=set_worker_tables, initargs=({"var_info_dict": var_info_dict, "variant_list": variant_list},))
+
+    carrier_counts: list = pool.map(func, [Worker_Table("variant_list", 0), Worker_Table("variant_list", 1)])
+
+    pool.close()
+
+    pool.join()
+
+    if carrier_counts != [4, 6]:
+        errors.append(f"Expected the carrier counts to be [4, 6], instead found {carrier_counts}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))
+
+def test_result_channel(tmp_path):
+    """unit test to make sure the messages from every worker are written to the file without a manager"""
+
+    # creating a list to keep track of errors
+    errors: list = []
+
+    output_file: str = os.path.join(str(tmp_path), "nopairs-identified.txt")
+
+    result_channel: Result_Channel = Result_Channel(output_file, "variant_id\n").start()
+
+    pool = mp.Pool(2, initializer=set_worker_tables, initargs=({"result_queue": result_channel.queue},))
+
+    pool.map(partial(call_with_worker_tables, write_variant, Worker_Table("result_queue")), [f"var{i}" for i in range(20)])
+
+    pool.close()
+
+    pool.join()
+
+    result_channel.close()
+
+    with open(output_file, "r") as output:
+        line_list: list = output.read().splitlines()
+
+    if line_list[0] != "variant_id" or sorted(line_list[1:]) != sorted([f"var{i}" for i in range(20)]):
+        errors.append(f"Expected the header and all 20 variants to be written, instead found {line_list}")
+
+    assert not errors, "errors occured: \n{}".format('\n'.join(errors))